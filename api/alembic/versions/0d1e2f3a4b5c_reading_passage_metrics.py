@@ -0,0 +1,25 @@
+"""reading passage language metrics
+
+Revision ID: 0d1e2f3a4b5c
+Revises: 9c0d1e2f3a4b
+Create Date: 2026-02-08 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0d1e2f3a4b5c"
+down_revision = "9c0d1e2f3a4b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("reading_passages", sa.Column("lang_purity", sa.Float(), nullable=True))
+    op.add_column("reading_passages", sa.Column("letter_ratio", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("reading_passages", "letter_ratio")
+    op.drop_column("reading_passages", "lang_purity")
@@ -0,0 +1,38 @@
+"""reading recommendation cache
+
+Revision ID: 1e2f3a4b5c6d
+Revises: 0d1e2f3a4b5c
+Create Date: 2026-02-09 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "1e2f3a4b5c6d"
+down_revision = "0d1e2f3a4b5c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reading_recommendation_cache",
+        sa.Column("profile_id", sa.UUID(), nullable=False),
+        sa.Column("target_words", sa.Integer(), nullable=False),
+        sa.Column("days", sa.Integer(), nullable=False),
+        sa.Column("words_version", sa.String(length=40), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["profile_id"], ["learning_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("profile_id", "target_words", "days"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reading_recommendation_cache")
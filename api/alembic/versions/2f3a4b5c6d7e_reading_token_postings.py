@@ -0,0 +1,58 @@
+"""reading token dictionary and passage token id arrays
+
+Revision ID: 2f3a4b5c6d7e
+Revises: 1e2f3a4b5c6d
+Create Date: 2026-02-10 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "2f3a4b5c6d7e"
+down_revision = "1e2f3a4b5c6d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reading_tokens",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.UniqueConstraint("token", name="uq_reading_tokens_token"),
+    )
+    op.add_column("reading_passages", sa.Column("token_ids", sa.ARRAY(sa.Integer()), nullable=True))
+
+    op.execute(
+        """
+        INSERT INTO reading_tokens (token)
+        SELECT DISTINCT token FROM reading_passage_tokens ORDER BY token
+        """
+    )
+    op.execute(
+        """
+        UPDATE reading_passages AS p
+        SET token_ids = postings.token_ids
+        FROM (
+            SELECT rpt.passage_id, array_agg(t.id ORDER BY t.id) AS token_ids
+            FROM reading_passage_tokens AS rpt
+            JOIN reading_tokens AS t ON t.token = rpt.token
+            GROUP BY rpt.passage_id
+        ) AS postings
+        WHERE postings.passage_id = p.id
+        """
+    )
+    op.execute("UPDATE reading_passages SET token_ids = '{}' WHERE token_ids IS NULL")
+    op.create_index(
+        "ix_reading_passages_token_ids",
+        "reading_passages",
+        ["token_ids"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reading_passages_token_ids", table_name="reading_passages")
+    op.drop_column("reading_passages", "token_ids")
+    op.drop_table("reading_tokens")
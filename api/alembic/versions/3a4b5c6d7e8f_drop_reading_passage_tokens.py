@@ -0,0 +1,46 @@
+"""drop reading passage tokens
+
+Revision ID: 3a4b5c6d7e8f
+Revises: 2f3a4b5c6d7e
+Create Date: 2026-02-11 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "3a4b5c6d7e8f"
+down_revision = "2f3a4b5c6d7e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_reading_passage_tokens_token", table_name="reading_passage_tokens")
+    op.drop_table("reading_passage_tokens")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "reading_passage_tokens",
+        sa.Column("passage_id", sa.BigInteger(), nullable=False),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="1"),
+        sa.ForeignKeyConstraint(["passage_id"], ["reading_passages.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("passage_id", "token"),
+    )
+    # Per-passage occurrence counts are not kept in the arrays, so restored rows carry count = 1.
+    op.execute(
+        """
+        INSERT INTO reading_passage_tokens (passage_id, token, count)
+        SELECT p.id, t.token, 1
+        FROM reading_passages AS p
+        CROSS JOIN LATERAL unnest(p.token_ids) AS u(token_id)
+        JOIN reading_tokens AS t ON t.id = u.token_id
+        """
+    )
+    op.create_index(
+        "ix_reading_passage_tokens_token",
+        "reading_passage_tokens",
+        ["token"],
+    )
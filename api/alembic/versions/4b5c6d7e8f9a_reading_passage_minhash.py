@@ -0,0 +1,32 @@
+"""reading passage minhash signatures
+
+Revision ID: 4b5c6d7e8f9a
+Revises: 3a4b5c6d7e8f
+Create Date: 2026-02-12 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "4b5c6d7e8f9a"
+down_revision = "3a4b5c6d7e8f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("reading_passages", sa.Column("minhash", sa.ARRAY(sa.Integer()), nullable=True))
+    op.add_column("reading_passages", sa.Column("lsh_bands", sa.ARRAY(sa.BigInteger()), nullable=True))
+    op.create_index(
+        "ix_reading_passages_lsh_bands",
+        "reading_passages",
+        ["lsh_bands"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reading_passages_lsh_bands", table_name="reading_passages")
+    op.drop_column("reading_passages", "lsh_bands")
+    op.drop_column("reading_passages", "minhash")
@@ -0,0 +1,139 @@
+"""challenge progress counters
+
+Revision ID: 4d5e6f7a8b9c
+Revises: 3c4d5e6f7a8b
+Create Date: 2026-02-02 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "4d5e6f7a8b9c"
+down_revision = "3c4d5e6f7a8b"
+branch_labels = None
+depends_on = None
+
+
+LEARN_KEYS = "('learn_100_30')"
+STREAK_KEYS = "('streak_7', 'streak_21')"
+
+
+def upgrade() -> None:
+    for table_name in ("user_challenges", "group_challenge_members"):
+        op.add_column(
+            table_name,
+            sa.Column("progress", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        )
+        op.add_column(table_name, sa.Column("last_activity_on", sa.Date(), nullable=True))
+
+    op.create_index("ix_user_challenges_status_ends", "user_challenges", ["status", "ends_at"])
+    op.create_index("ix_group_challenges_status_ends", "group_challenges", ["status", "ends_at"])
+    op.create_index("ix_group_challenge_members_profile", "group_challenge_members", ["profile_id"])
+
+    op.execute(
+        f"""
+        UPDATE user_challenges uc
+        SET progress = counts.progress
+        FROM (
+            SELECT c.id, count(uw.word_id) AS progress
+            FROM user_challenges c
+            JOIN user_words uw
+              ON uw.profile_id = c.profile_id
+             AND uw.learned_at >= c.started_at
+             AND uw.learned_at <= LEAST(c.ends_at, now())
+            WHERE c.challenge_key IN {LEARN_KEYS}
+            GROUP BY c.id
+        ) counts
+        WHERE uc.id = counts.id
+        """
+    )
+    op.execute(
+        f"""
+        WITH days AS (
+            SELECT c.id, s.started_at::date AS day
+            FROM user_challenges c
+            JOIN study_sessions s
+              ON s.profile_id = c.profile_id
+             AND s.started_at >= c.started_at
+             AND s.started_at <= LEAST(c.ends_at, now())
+            WHERE c.challenge_key IN {STREAK_KEYS}
+            GROUP BY c.id, day
+        ),
+        islands AS (
+            SELECT id, day, day - (row_number() OVER (PARTITION BY id ORDER BY day))::int AS island
+            FROM days
+        ),
+        runs AS (
+            SELECT DISTINCT ON (id) id, count(*) AS progress, max(day) AS last_day
+            FROM islands
+            GROUP BY id, island
+            ORDER BY id, max(day) DESC
+        )
+        UPDATE user_challenges uc
+        SET progress = runs.progress, last_activity_on = runs.last_day
+        FROM runs
+        WHERE uc.id = runs.id
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE group_challenge_members gm
+        SET progress = counts.progress
+        FROM (
+            SELECT m.group_id, m.user_id, count(uw.word_id) AS progress
+            FROM group_challenge_members m
+            JOIN group_challenges g ON g.id = m.group_id
+            JOIN user_words uw
+              ON uw.profile_id = m.profile_id
+             AND uw.learned_at >= g.started_at
+             AND uw.learned_at <= LEAST(g.ends_at, now())
+            WHERE g.challenge_key IN {LEARN_KEYS}
+            GROUP BY m.group_id, m.user_id
+        ) counts
+        WHERE gm.group_id = counts.group_id AND gm.user_id = counts.user_id
+        """
+    )
+    op.execute(
+        f"""
+        WITH days AS (
+            SELECT m.group_id, m.user_id, s.started_at::date AS day
+            FROM group_challenge_members m
+            JOIN group_challenges g ON g.id = m.group_id
+            JOIN study_sessions s
+              ON s.profile_id = m.profile_id
+             AND s.started_at >= g.started_at
+             AND s.started_at <= LEAST(g.ends_at, now())
+            WHERE g.challenge_key IN {STREAK_KEYS}
+            GROUP BY m.group_id, m.user_id, day
+        ),
+        islands AS (
+            SELECT
+                group_id,
+                user_id,
+                day,
+                day - (row_number() OVER (PARTITION BY group_id, user_id ORDER BY day))::int AS island
+            FROM days
+        ),
+        runs AS (
+            SELECT DISTINCT ON (group_id, user_id)
+                group_id, user_id, count(*) AS progress, max(day) AS last_day
+            FROM islands
+            GROUP BY group_id, user_id, island
+            ORDER BY group_id, user_id, max(day) DESC
+        )
+        UPDATE group_challenge_members gm
+        SET progress = runs.progress, last_activity_on = runs.last_day
+        FROM runs
+        WHERE gm.group_id = runs.group_id AND gm.user_id = runs.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_challenge_members_profile", table_name="group_challenge_members")
+    op.drop_index("ix_group_challenges_status_ends", table_name="group_challenges")
+    op.drop_index("ix_user_challenges_status_ends", table_name="user_challenges")
+    for table_name in ("group_challenge_members", "user_challenges"):
+        op.drop_column(table_name, "last_activity_on")
+        op.drop_column(table_name, "progress")
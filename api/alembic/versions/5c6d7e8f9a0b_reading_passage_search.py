@@ -0,0 +1,61 @@
+"""reading passage full-text search
+
+Revision ID: 5c6d7e8f9a0b
+Revises: 4b5c6d7e8f9a
+Create Date: 2026-02-13 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "5c6d7e8f9a0b"
+down_revision = "4b5c6d7e8f9a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reading_passages",
+        sa.Column(
+            "search_config",
+            postgresql.REGCONFIG(),
+            server_default=sa.text("'simple'"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE reading_passages AS p
+        SET search_config = CASE s.lang
+            WHEN 'en' THEN 'english'::regconfig
+            WHEN 'ru' THEN 'russian'::regconfig
+            ELSE 'simple'::regconfig
+        END
+        FROM reading_sources AS s
+        WHERE s.id = p.source_id
+        """
+    )
+    op.add_column(
+        "reading_passages",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector(search_config, text)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_reading_passages_search_vector",
+        "reading_passages",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reading_passages_search_vector", table_name="reading_passages")
+    op.drop_column("reading_passages", "search_vector")
+    op.drop_column("reading_passages", "search_config")
@@ -0,0 +1,39 @@
+"""trigram indexes for profile search
+
+Revision ID: 5e6f7a8b9c0d
+Revises: 4d5e6f7a8b9c
+Create Date: 2026-02-03 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "5e6f7a8b9c0d"
+down_revision = "4d5e6f7a8b9c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_public_profiles_handle_trgm
+            ON user_public_profiles USING gin (handle gin_trgm_ops)
+            WHERE is_public
+            """
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_public_profiles_display_name_trgm
+            ON user_public_profiles USING gin (lower(display_name) gin_trgm_ops)
+            WHERE is_public
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_public_profiles_display_name_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_public_profiles_handle_trgm")
@@ -0,0 +1,48 @@
+"""corpus entry versions
+
+Revision ID: 6d7e8f9a0b1c
+Revises: 5c6d7e8f9a0b
+Create Date: 2026-02-14 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "6d7e8f9a0b1c"
+down_revision = "5c6d7e8f9a0b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "corpora",
+        sa.Column("active_version", sa.BigInteger(), server_default=sa.text("1"), nullable=False),
+    )
+    op.add_column(
+        "corpus_entries",
+        sa.Column("version", sa.BigInteger(), server_default=sa.text("1"), nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_corpus_entries_corpus_version "
+            "ON corpus_entries (corpus_id, version)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_corpus_entries_corpus")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_corpus_entries_corpus ON corpus_entries (corpus_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_corpus_entries_corpus_version")
+    # Staged or retired rows would show up as live ones without the version filter.
+    op.execute(
+        """
+        DELETE FROM corpus_entries AS e
+        USING corpora AS c
+        WHERE c.id = e.corpus_id AND e.version <> c.active_version
+        """
+    )
+    op.drop_column("corpus_entries", "version")
+    op.drop_column("corpora", "active_version")
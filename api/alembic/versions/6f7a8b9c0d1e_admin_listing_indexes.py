@@ -0,0 +1,38 @@
+"""admin listing indexes
+
+Revision ID: 6f7a8b9c0d1e
+Revises: 5e6f7a8b9c0d
+Create Date: 2026-02-04 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "6f7a8b9c0d1e"
+down_revision = "5e6f7a8b9c0d"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_audit_logs_created": "audit_logs (created_at, id)",
+    "ix_users_created": "users (created_at, id)",
+    "ix_users_email_trgm": "users USING gin (email gin_trgm_ops)",
+    "ix_words_lemma_id": "words (lemma, id)",
+    "ix_words_lemma_trgm": "words USING gin (lemma gin_trgm_ops)",
+    "ix_user_words_word": "user_words (word_id)",
+    "ix_user_custom_words_word": "user_custom_words (word_id)",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
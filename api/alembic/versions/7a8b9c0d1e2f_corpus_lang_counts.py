@@ -0,0 +1,50 @@
+"""corpus per-direction entry counts
+
+Revision ID: 7a8b9c0d1e2f
+Revises: 6f7a8b9c0d1e
+Create Date: 2026-02-05 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "7a8b9c0d1e2f"
+down_revision = "6f7a8b9c0d1e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "corpus_lang_counts",
+        sa.Column(
+            "corpus_id",
+            sa.BigInteger(),
+            sa.ForeignKey("corpora.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("source_lang", sa.String(length=2), primary_key=True),
+        sa.Column("target_lang", sa.String(length=2), primary_key=True),
+        sa.Column("words_total", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO corpus_lang_counts (corpus_id, source_lang, target_lang, words_total)
+        SELECT e.corpus_id, s.lang, t.lang, count(DISTINCT e.id)
+        FROM corpus_entries e
+        JOIN corpus_entry_terms s ON s.entry_id = e.id AND s.is_primary
+        JOIN corpus_entry_terms t ON t.entry_id = e.id AND t.lang <> s.lang
+        GROUP BY e.corpus_id, s.lang, t.lang
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("corpus_lang_counts")
@@ -0,0 +1,31 @@
+"""words normalized lemma index
+
+Revision ID: 7e8f9a0b1c2d
+Revises: 6d7e8f9a0b1c
+Create Date: 2026-02-15 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "7e8f9a0b1c2d"
+down_revision = "6d7e8f9a0b1c"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_words_lang_lemma_key": "words (lang, lower(btrim(regexp_replace(lemma, '\\s+', ' ', 'g'))))",
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
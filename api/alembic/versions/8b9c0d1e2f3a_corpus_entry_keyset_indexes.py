@@ -0,0 +1,32 @@
+"""corpus entry keyset indexes
+
+Revision ID: 8b9c0d1e2f3a
+Revises: 7a8b9c0d1e2f
+Create Date: 2026-02-06 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "8b9c0d1e2f3a"
+down_revision = "7a8b9c0d1e2f"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_corpus_entries_corpus_rank": "corpus_entries (corpus_id, coalesce(rank, 2147483647), id)",
+    "ix_corpus_entries_corpus_count": "corpus_entries (corpus_id, count, id)",
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
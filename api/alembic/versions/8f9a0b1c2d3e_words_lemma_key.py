@@ -0,0 +1,42 @@
+"""words lemma_key column
+
+Revision ID: 8f9a0b1c2d3e
+Revises: 7e8f9a0b1c2d
+Create Date: 2026-02-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8f9a0b1c2d3e"
+down_revision = "7e8f9a0b1c2d"
+branch_labels = None
+depends_on = None
+
+
+LEMMA_KEY_SQL = "lower(btrim(regexp_replace(lemma, '\\s+', ' ', 'g')))"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "words",
+        sa.Column(
+            "lemma_key",
+            sa.String(length=255),
+            sa.Computed(LEMMA_KEY_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    # The expression index from 7e8f9a0b1c2d is replaced by one on the stored column.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_words_lang_lemma_key")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_words_lang_lemma_key ON words (lang, lemma_key)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_words_lang_lemma_key")
+    op.drop_column("words", "lemma_key")
+    with op.get_context().autocommit_block():
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_words_lang_lemma_key ON words (lang, {LEMMA_KEY_SQL})")
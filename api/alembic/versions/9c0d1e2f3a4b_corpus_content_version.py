@@ -0,0 +1,26 @@
+"""corpus content version
+
+Revision ID: 9c0d1e2f3a4b
+Revises: 8b9c0d1e2f3a
+Create Date: 2026-02-07 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "9c0d1e2f3a4b"
+down_revision = "8b9c0d1e2f3a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "corpora",
+        sa.Column("content_version", sa.BigInteger(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("corpora", "content_version")
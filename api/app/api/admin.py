@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import get_current_user
 from app.core.audit import log_audit_event
 from app.core.config import ADMIN_EMAILS
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
 from app.db.session import get_db
 from app.models import (
     AuditLog,
@@ -23,10 +24,12 @@ from app.models import (
     UserProfile,
 )
 from app.schemas.admin import (
+    AdminAuditListOut,
     AdminAuditOut,
     AdminBroadcastOut,
     AdminBroadcastRequest,
     AdminSummaryOut,
+    AdminUserListOut,
     AdminUserOut,
     AdminUserUpdate,
 )
@@ -52,6 +55,20 @@ def ensure_lang(value: str | None) -> str | None:
     return normalized
 
 
+def parse_cursor_datetime(value) -> datetime:
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def parse_cursor_uuid(value) -> uuid.UUID:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 def ensure_theme(value: str | None) -> str | None:
     if value is None:
         return None
@@ -115,32 +132,42 @@ async def get_admin_summary(
     )
 
 
-@router.get("/users", response_model=list[AdminUserOut])
+@router.get("/users", response_model=AdminUserListOut)
 async def list_users(
     query: str | None = None,
     limit: int = 50,
-    offset: int = 0,
+    cursor: str | None = None,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[AdminUserOut]:
+) -> AdminUserListOut:
     ensure_admin(user)
     if limit < 1 or limit > 200:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
-    if offset < 0:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid offset")
+    after = decode_cursor(cursor, 2)
 
     stmt = (
         select(User, UserProfile)
         .join(UserProfile, UserProfile.user_id == User.id, isouter=True)
-        .order_by(User.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(limit + 1)
     )
-    if query:
-        stmt = stmt.where(User.email.ilike(f"%{query.strip()}%"))
+    if query and query.strip():
+        stmt = stmt.where(User.email.icontains(query.strip(), autoescape=True))
+    if after is not None:
+        stmt = stmt.where(
+            keyset_filter(
+                [(User.created_at, True), (User.id, True)],
+                [parse_cursor_datetime(after[0]), parse_cursor_uuid(after[1])],
+            )
+        )
 
     result = await db.execute(stmt)
     rows = result.fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_user = rows[-1][0]
+        next_cursor = encode_cursor([last_user.created_at.isoformat(), str(last_user.id)])
 
     items: list[AdminUserOut] = []
     for user_row, profile in rows:
@@ -159,7 +186,7 @@ async def list_users(
                 target_lang=profile.target_lang if profile else None,
             )
         )
-    return items
+    return AdminUserListOut(items=items, next_cursor=next_cursor)
 
 
 @router.patch("/users/{user_id}", response_model=AdminUserOut)
@@ -236,37 +263,55 @@ async def update_user(
     )
 
 
-@router.get("/audit", response_model=list[AdminAuditOut])
+@router.get("/audit", response_model=AdminAuditListOut)
 async def list_audit_logs(
     limit: int = 100,
+    cursor: str | None = None,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[AdminAuditOut]:
+) -> AdminAuditListOut:
     ensure_admin(user)
     if limit < 1 or limit > 500:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
+    after = decode_cursor(cursor, 2)
 
-    result = await db.execute(
+    stmt = (
         select(AuditLog, User.email)
         .join(User, User.id == AuditLog.user_id, isouter=True)
-        .order_by(AuditLog.created_at.desc())
-        .limit(limit)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .limit(limit + 1)
     )
-
-    return [
-        AdminAuditOut(
-            id=log.id,
-            user_id=str(log.user_id) if log.user_id else None,
-            user_email=email,
-            action=log.action,
-            status=log.status,
-            meta=log.meta,
-            ip=log.ip,
-            user_agent=log.user_agent,
-            created_at=log.created_at,
+    if after is not None:
+        stmt = stmt.where(
+            keyset_filter(
+                [(AuditLog.created_at, True), (AuditLog.id, True)],
+                [parse_cursor_datetime(after[0]), int(after[1])],
+            )
         )
-        for log, email in result.fetchall()
-    ]
+    rows = (await db.execute(stmt)).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_log = rows[-1][0]
+        next_cursor = encode_cursor([last_log.created_at.isoformat(), last_log.id])
+
+    return AdminAuditListOut(
+        items=[
+            AdminAuditOut(
+                id=log.id,
+                user_id=str(log.user_id) if log.user_id else None,
+                user_email=email,
+                action=log.action,
+                status=log.status,
+                meta=log.meta,
+                ip=log.ip,
+                user_agent=log.user_agent,
+                created_at=log.created_at,
+            )
+            for log, email in rows
+        ],
+        next_cursor=next_cursor,
+    )
 
 
 @router.post("/notifications/broadcast", response_model=AdminBroadcastOut)
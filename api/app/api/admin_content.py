@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 import re
-from sqlalchemy import delete, exists, func, or_, select, update
+from sqlalchemy import delete, exists, func, literal_column, or_, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,9 +11,23 @@ from sqlalchemy.orm import aliased
 from app.api.auth import get_current_user
 from app.core.audit import log_audit_event
 from app.core.config import ADMIN_EMAILS
+from app.core.corpus_catalog import (
+    cached_response,
+    catalog_etag,
+    corpus_content_version,
+    corpus_etag,
+    load_corpus_catalog,
+    store_response,
+    sync_corpus_catalog,
+    word_corpus_ids,
+)
+from app.core.corpus_versions import active_entries
+from app.core.etag import etag_matches, not_modified, set_etag
+from app.core.pagination import capped_count, decode_cursor, encode_cursor, estimate_count, keyset_filter
+from app.core.word_merge import merge_word_batches, merge_word_pairs, move_corpus_data, normalize_merge_pairs
+from app.core.words import LOOKUP_BATCH, lemma_key_sql
 from app.db.session import get_db
 from app.models import (
-    ContentReport,
     Corpus,
     CorpusEntry,
     CorpusEntryTerm,
@@ -36,6 +50,8 @@ from app.schemas.admin_content import (
     AdminWordDistributionOut,
     AdminWordListItem,
     AdminWordListOut,
+    AdminWordMergeOut,
+    AdminWordMergeRequest,
     AdminWordOut,
     AdminWordUpdate,
 )
@@ -48,6 +64,8 @@ from app.schemas.admin_corpora import (
 
 router = APIRouter(prefix="/admin/content", tags=["admin"])
 SLUG_RE = re.compile(r"_(ru|en)_(ru|en)$", re.IGNORECASE)
+UNRANKED_LAST = 2147483647
+MAX_MERGE_PAIRS = 10000
 
 
 def ensure_admin(user: User) -> None:
@@ -77,6 +95,8 @@ def resolve_corpus_name(corpus: Corpus, ui_lang: str | None) -> str:
 
 @router.get("/corpora", response_model=list[AdminCorpusOut])
 async def list_corpora(
+    request: Request,
+    response: Response,
     source_lang: str | None = None,
     ui_lang: str | None = None,
     user: User = Depends(get_current_user),
@@ -85,38 +105,30 @@ async def list_corpora(
     ensure_admin(user)
     source_lang = normalize_lang(source_lang) if source_lang else None
     ui_lang = normalize_lang(ui_lang) if ui_lang else None
-    stmt = (
-        select(
-            Corpus.id,
-            Corpus.slug,
-            Corpus.name,
-            Corpus.name_ru,
-            Corpus.name_en,
-            func.count(CorpusEntry.id).label("words_total"),
-        )
-        .select_from(Corpus)
-        .join(CorpusEntry, CorpusEntry.corpus_id == Corpus.id, isouter=True)
-        .group_by(Corpus.id, Corpus.slug, Corpus.name, Corpus.name_ru, Corpus.name_en)
-        .order_by(Corpus.name)
-    )
-    result = await db.execute(stmt)
+    catalog = await load_corpus_catalog(db)
+    etag = catalog_etag(catalog)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return [
         AdminCorpusOut(
-            id=row.id,
-            slug=row.slug,
-            name=resolve_corpus_name(row, ui_lang),
-            words_total=row.words_total,
+            id=item.id,
+            slug=item.slug,
+            name=resolve_corpus_name(item, ui_lang),
+            words_total=item.words_total(source_lang, None),
         )
-        for row in result.fetchall()
+        for item in catalog
     ]
 
 
 @router.get("/corpora/{corpus_id}/words", response_model=AdminCorpusEntriesOut)
 async def list_corpus_words(
     corpus_id: int,
+    request: Request,
+    response: Response,
     query: str | None = None,
     limit: int = 50,
-    offset: int = 0,
+    cursor: str | None = None,
     sort: str = "rank",
     order: str | None = None,
     source_lang: str | None = None,
@@ -127,90 +139,117 @@ async def list_corpus_words(
     ensure_admin(user)
     if limit < 1 or limit > 200:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
-    if offset < 0:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid offset")
+    after = decode_cursor(cursor, 2)
 
     source_lang = normalize_lang(source_lang) if source_lang else None
     if not source_lang:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Language required")
     target_lang = normalize_lang(target_lang) if target_lang else None
 
-    corpus_result = await db.execute(select(Corpus.id).where(Corpus.id == corpus_id))
-    corpus = corpus_result.first()
-    if not corpus:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Corpus not found")
-
-    source_term = aliased(CorpusEntryTerm)
-    source_word = aliased(Word)
-    stmt = (
-        select(
-            CorpusEntry.id.label("entry_id"),
-            CorpusEntry.count,
-            CorpusEntry.rank,
-        )
-        .select_from(CorpusEntry)
-        .where(CorpusEntry.corpus_id == corpus_id)
-    )
-
-    if query and query.strip():
-        like = f"%{query.strip()}%"
-        term_alias = aliased(CorpusEntryTerm)
-        word_alias = aliased(Word)
-        term_match = exists(
-            select(1)
-            .select_from(term_alias)
-            .join(word_alias, word_alias.id == term_alias.word_id)
-            .where(term_alias.entry_id == CorpusEntry.id, word_alias.lemma.ilike(like))
-        )
-        stmt = stmt.where(term_match)
-
     if sort not in {"rank", "count", "lemma"}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sort")
     order_dir = (order or ("desc" if sort == "count" else "asc")).lower()
     if order_dir not in {"asc", "desc"}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid order")
+    descending = order_dir == "desc"
+
+    content_version = await corpus_content_version(db, corpus_id)
+    if content_version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Corpus not found")
+
+    etag = corpus_etag("entries", corpus_id, content_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    query = query.strip() if query else ""
+    cache_key = (
+        "entries",
+        corpus_id,
+        content_version,
+        query,
+        limit,
+        cursor,
+        sort,
+        order_dir,
+        source_lang,
+        target_lang,
+    )
+    cached = cached_response(cache_key)
+    if cached is not None:
+        return cached
+
+    stmt = select(CorpusEntry.id.label("entry_id"), CorpusEntry.count, CorpusEntry.rank).where(
+        CorpusEntry.corpus_id == corpus_id,
+        active_entries(),
+    )
+
+    if query:
+        matched_entries = (
+            select(CorpusEntryTerm.entry_id)
+            .join(Word, Word.id == CorpusEntryTerm.word_id)
+            .where(Word.lemma.icontains(query, autoescape=True))
+        )
+        stmt = stmt.where(CorpusEntry.id.in_(matched_entries))
 
     if sort == "count":
-        sort_col = CorpusEntry.count
+        sort_key = CorpusEntry.count
     elif sort == "lemma":
+        source_term = aliased(CorpusEntryTerm)
+        source_word = aliased(Word)
         stmt = stmt.join(
             source_term,
             (source_term.entry_id == CorpusEntry.id)
             & (source_term.lang == source_lang)
             & (source_term.is_primary.is_(True)),
-            isouter=True,
-        ).join(source_word, source_word.id == source_term.word_id, isouter=True)
-        sort_col = source_word.lemma
+        ).join(source_word, source_word.id == source_term.word_id)
+        sort_key = source_word.lemma
     else:
-        sort_col = CorpusEntry.rank
-
-    order_expr = sort_col.desc() if order_dir == "desc" else sort_col.asc()
-    if sort in {"rank", "lemma"}:
-        order_expr = order_expr.nulls_last()
-
-    stmt = stmt.order_by(order_expr, CorpusEntry.count.desc(), CorpusEntry.id.asc())
-
-    count_stmt = select(func.count()).select_from(CorpusEntry).where(CorpusEntry.corpus_id == corpus_id)
-    if query and query.strip():
-        like = f"%{query.strip()}%"
-        term_alias = aliased(CorpusEntryTerm)
-        word_alias = aliased(Word)
-        count_stmt = count_stmt.where(
-            exists(
-                select(1)
-                .select_from(term_alias)
-                .join(word_alias, word_alias.id == term_alias.word_id)
-                .where(term_alias.entry_id == CorpusEntry.id, word_alias.lemma.ilike(like))
-            )
-        )
-    total_result = await db.execute(count_stmt)
-    total_count = int(total_result.scalar_one() or 0)
-
-    rows = await db.execute(stmt.limit(limit).offset(offset))
-    items = rows.fetchall()
+        # Exactly the ix_corpus_entries_corpus_rank expression, so both directions walk the index;
+        # unranked entries sort as UNRANKED_LAST.
+        sort_key = func.coalesce(CorpusEntry.rank, literal_column(str(UNRANKED_LAST)))
+
+    total_count, total_exact = await capped_count(db, stmt)
+    stmt = stmt.add_columns(sort_key.label("sort_key"))
+
+    if after is not None:
+        key_type = str if sort == "lemma" else int
+        if not isinstance(after[0], key_type) or not isinstance(after[1], int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    if sort == "rank" and descending:
+        # A backward index walk would list unranked entries first, so pages read the ranked
+        # segment backwards and then continue into the unranked one by id; the cursor's
+        # sort key tells which segment it points into.
+        items = []
+        if after is None or after[0] != UNRANKED_LAST:
+            ranked = stmt.where(sort_key < UNRANKED_LAST)
+            if after is not None:
+                ranked = ranked.where(keyset_filter([(sort_key, True), (CorpusEntry.id, True)], after))
+            ranked = ranked.order_by(sort_key.desc(), CorpusEntry.id.desc()).limit(limit + 1)
+            items = (await db.execute(ranked)).fetchall()
+        if len(items) <= limit:
+            unranked = stmt.where(sort_key == UNRANKED_LAST)
+            if after is not None and after[0] == UNRANKED_LAST:
+                unranked = unranked.where(CorpusEntry.id < after[1])
+            unranked = unranked.order_by(CorpusEntry.id.desc()).limit(limit + 1 - len(items))
+            items += (await db.execute(unranked)).fetchall()
+    else:
+        if after is not None:
+            stmt = stmt.where(keyset_filter([(sort_key, descending), (CorpusEntry.id, descending)], after))
+        if descending:
+            stmt = stmt.order_by(sort_key.desc(), CorpusEntry.id.desc())
+        else:
+            stmt = stmt.order_by(sort_key.asc(), CorpusEntry.id.asc())
+        items = (await db.execute(stmt.limit(limit + 1))).fetchall()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([items[-1].sort_key, items[-1].entry_id])
     entry_ids = [row.entry_id for row in items]
     if not entry_ids:
-        return AdminCorpusEntriesOut(total=total_count, items=[])
+        page = AdminCorpusEntriesOut(total=total_count, total_exact=total_exact, items=[])
+        store_response(cache_key, page)
+        return page
 
     terms_result = await db.execute(
         select(
@@ -252,7 +291,14 @@ async def list_corpus_words(
         )
         for row in items
     ]
-    return AdminCorpusEntriesOut(total=total_count, items=payload)
+    page = AdminCorpusEntriesOut(
+        total=total_count,
+        total_exact=total_exact,
+        items=payload,
+        next_cursor=next_cursor,
+    )
+    store_response(cache_key, page)
+    return page
 
 
 @router.get("/words", response_model=AdminWordListOut)
@@ -260,7 +306,7 @@ async def list_words(
     query: str | None = None,
     lang: str | None = None,
     limit: int = 50,
-    offset: int = 0,
+    cursor: str | None = None,
     orphan_only: bool = False,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -268,11 +314,10 @@ async def list_words(
     ensure_admin(user)
     if limit < 1 or limit > 200:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
-    if offset < 0:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid offset")
+    after = decode_cursor(cursor, 2)
 
     lang = normalize_lang(lang) if lang else None
-    like = f"%{query.strip()}%" if query and query.strip() else None
+    query = query.strip() if query else ""
 
     corpus_exists = exists(
         select(1).select_from(CorpusEntryTerm).where(CorpusEntryTerm.word_id == Word.id)
@@ -282,35 +327,45 @@ async def list_words(
     )
     user_exists = exists(select(1).select_from(UserWord).where(UserWord.word_id == Word.id))
 
-    stmt = select(
-        Word.id,
-        Word.lemma,
-        Word.lang,
-        corpus_exists.label("in_corpus"),
-        custom_exists.label("in_custom"),
-        user_exists.label("in_user_words"),
-    )
+    stmt = select(Word.id, Word.lemma, Word.lang)
     if lang:
         stmt = stmt.where(Word.lang == lang)
-    if like:
-        stmt = stmt.where(Word.lemma.ilike(like))
+    if query:
+        stmt = stmt.where(Word.lemma.icontains(query, autoescape=True))
     if orphan_only:
         stmt = stmt.where(user_exists, ~corpus_exists, ~custom_exists)
 
-    count_stmt = select(func.count()).select_from(Word)
-    if lang:
-        count_stmt = count_stmt.where(Word.lang == lang)
-    if like:
-        count_stmt = count_stmt.where(Word.lemma.ilike(like))
-    if orphan_only:
-        count_stmt = count_stmt.where(user_exists, ~corpus_exists, ~custom_exists)
+    if lang or query or orphan_only:
+        total_count, total_exact = await capped_count(db, stmt)
+    else:
+        estimate = await estimate_count(db, Word.__tablename__)
+        if estimate is None:
+            total_count, total_exact = await capped_count(db, stmt)
+        else:
+            total_count, total_exact = estimate, False
 
-    total_result = await db.execute(count_stmt)
-    total_count = int(total_result.scalar_one() or 0)
+    if after is not None:
+        stmt = stmt.where(keyset_filter([(Word.lemma, False), (Word.id, False)], after))
+    page = stmt.order_by(Word.lemma.asc(), Word.id.asc()).limit(limit + 1).subquery()
 
-    rows = await db.execute(
-        stmt.order_by(Word.lemma.asc(), Word.id.asc()).limit(limit).offset(offset)
-    )
+    # Source flags are resolved for the page rows only.
+    rows = (
+        await db.execute(
+            select(
+                page.c.id,
+                page.c.lemma,
+                page.c.lang,
+                exists(select(1).where(CorpusEntryTerm.word_id == page.c.id)).label("in_corpus"),
+                exists(select(1).where(UserCustomWord.word_id == page.c.id)).label("in_custom"),
+                exists(select(1).where(UserWord.word_id == page.c.id)).label("in_user_words"),
+            ).order_by(page.c.lemma.asc(), page.c.id.asc())
+        )
+    ).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].lemma, rows[-1].id])
     items = [
         AdminWordListItem(
             id=row.id,
@@ -320,9 +375,14 @@ async def list_words(
             in_custom=bool(row.in_custom),
             in_user_words=bool(row.in_user_words),
         )
-        for row in rows.fetchall()
+        for row in rows
     ]
-    return AdminWordListOut(total=total_count, items=items)
+    return AdminWordListOut(
+        total=total_count,
+        total_exact=total_exact,
+        items=items,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/words/{word_id}/distribution", response_model=AdminWordDistributionOut)
@@ -350,7 +410,10 @@ async def word_distribution(
         )
         .select_from(CorpusEntryTerm)
         .join(CorpusEntry, CorpusEntry.id == CorpusEntryTerm.entry_id)
-        .join(Corpus, Corpus.id == CorpusEntry.corpus_id)
+        .join(
+            Corpus,
+            (Corpus.id == CorpusEntry.corpus_id) & (Corpus.active_version == CorpusEntry.version),
+        )
         .where(
             CorpusEntryTerm.word_id == word_id,
             CorpusEntryTerm.is_primary.is_(True),
@@ -395,38 +458,6 @@ async def word_distribution(
     return AdminWordDistributionOut(total=total, items=items)
 
 
-STATUS_PRIORITY = {"known": 3, "learned": 2, "new": 1}
-
-
-def status_rank(value: str | None) -> int:
-    if not value:
-        return 1
-    return STATUS_PRIORITY.get(value, 1)
-
-
-def is_better_progress(source: UserWord, target: UserWord) -> bool:
-    if status_rank(source.status) != status_rank(target.status):
-        return status_rank(source.status) > status_rank(target.status)
-    if (source.repetitions or 0) != (target.repetitions or 0):
-        return (source.repetitions or 0) > (target.repetitions or 0)
-    if (source.stage or 0) != (target.stage or 0):
-        return (source.stage or 0) > (target.stage or 0)
-    return False
-
-
-def copy_progress(target: UserWord, source: UserWord) -> None:
-    target.status = source.status
-    target.stage = source.stage
-    target.repetitions = source.repetitions
-    target.interval_days = source.interval_days
-    target.ease_factor = source.ease_factor
-    target.learned_at = source.learned_at
-    target.last_review_at = source.last_review_at
-    target.next_review_at = source.next_review_at
-    target.correct_streak = source.correct_streak
-    target.wrong_streak = source.wrong_streak
-
-
 async def word_has_user_data(db: AsyncSession, word_id: int) -> bool:
     stmt = select(
         or_(
@@ -518,7 +549,9 @@ async def purge_word_everywhere(db: AsyncSession, word_id: int) -> dict[str, int
 
     entry_ids = await db.execute(
         select(CorpusEntry.id).where(
-            ~exists(select(1).where(CorpusEntryTerm.entry_id == CorpusEntry.id))
+            # Entries of a version still being imported may not have their terms yet.
+            active_entries(),
+            ~exists(select(1).where(CorpusEntryTerm.entry_id == CorpusEntry.id)),
         )
     )
     ids = [row[0] for row in entry_ids.fetchall()]
@@ -558,237 +591,6 @@ async def copy_translations(db: AsyncSession, source_id: int, target_id: int) ->
     await db.execute(stmt)
 
 
-async def move_corpus_stats(db: AsyncSession, source_id: int, target_id: int) -> None:
-    stat_target = aliased(CorpusWordStat)
-    await db.execute(
-        update(CorpusWordStat)
-        .where(CorpusWordStat.word_id == source_id)
-        .where(
-            ~exists(
-                select(1).where(
-                    (stat_target.corpus_id == CorpusWordStat.corpus_id)
-                    & (stat_target.word_id == target_id)
-                )
-            )
-        )
-        .values(word_id=target_id)
-    )
-    stat_source = aliased(CorpusWordStat)
-    stat_target = aliased(CorpusWordStat)
-    stat_rows = await db.execute(
-        select(stat_source, stat_target)
-        .join(
-            stat_target,
-            (stat_target.word_id == target_id)
-            & (stat_target.corpus_id == stat_source.corpus_id),
-        )
-        .where(stat_source.word_id == source_id)
-    )
-    for source_row, target_row in stat_rows.all():
-        target_row.count = max(target_row.count or 0, source_row.count or 0)
-        if source_row.rank is not None:
-            if target_row.rank is None or source_row.rank < target_row.rank:
-                target_row.rank = source_row.rank
-        await db.delete(source_row)
-
-    await move_entry_terms(db, source_id, target_id)
-
-
-async def move_entry_terms(db: AsyncSession, source_id: int, target_id: int) -> None:
-    term_target = aliased(CorpusEntryTerm)
-    await db.execute(
-        update(CorpusEntryTerm)
-        .where(CorpusEntryTerm.word_id == source_id)
-        .where(
-            ~exists(
-                select(1).where(
-                    (term_target.entry_id == CorpusEntryTerm.entry_id)
-                    & (term_target.word_id == target_id)
-                )
-            )
-        )
-        .values(word_id=target_id)
-    )
-    term_target = aliased(CorpusEntryTerm)
-    dup_rows = await db.execute(
-        select(CorpusEntryTerm, term_target)
-        .join(
-            term_target,
-            (term_target.entry_id == CorpusEntryTerm.entry_id)
-            & (term_target.word_id == target_id),
-        )
-        .where(CorpusEntryTerm.word_id == source_id)
-    )
-    for source_row, target_row in dup_rows.all():
-        if source_row.is_primary and not target_row.is_primary:
-            target_row.is_primary = True
-        await db.delete(source_row)
-
-
-async def merge_words(db: AsyncSession, source_id: int, target_id: int) -> None:
-    if source_id == target_id:
-        return
-
-    t_src = aliased(Translation)
-    t_tgt = aliased(Translation)
-    dup_result = await db.execute(
-        select(t_src.id, t_tgt.id).join(
-            t_tgt,
-            (t_src.translation == t_tgt.translation)
-            & (t_src.target_lang == t_tgt.target_lang)
-            & (t_tgt.word_id == target_id),
-        ).where(t_src.word_id == source_id)
-    )
-    dup_pairs = dup_result.all()
-    if dup_pairs:
-        for source_translation_id, target_translation_id in dup_pairs:
-            await db.execute(
-                update(ContentReport)
-                .where(ContentReport.translation_id == source_translation_id)
-                .values(translation_id=target_translation_id)
-            )
-        await db.execute(
-            delete(Translation).where(Translation.id.in_([row[0] for row in dup_pairs]))
-        )
-    await db.execute(
-        update(Translation).where(Translation.word_id == source_id).values(word_id=target_id)
-    )
-
-    stat_target = aliased(CorpusWordStat)
-    await db.execute(
-        update(CorpusWordStat)
-        .where(CorpusWordStat.word_id == source_id)
-        .where(
-            ~exists(
-                select(1).where(
-                    (stat_target.corpus_id == CorpusWordStat.corpus_id)
-                    & (stat_target.word_id == target_id)
-                )
-            )
-        )
-        .values(word_id=target_id)
-    )
-    stat_source = aliased(CorpusWordStat)
-    stat_target = aliased(CorpusWordStat)
-    stat_rows = await db.execute(
-        select(stat_source, stat_target)
-        .join(
-            stat_target,
-            (stat_target.word_id == target_id)
-            & (stat_target.corpus_id == stat_source.corpus_id),
-        )
-        .where(stat_source.word_id == source_id)
-    )
-    for source_row, target_row in stat_rows.all():
-        target_row.count = max(target_row.count or 0, source_row.count or 0)
-        if source_row.rank is not None:
-            if target_row.rank is None or source_row.rank < target_row.rank:
-                target_row.rank = source_row.rank
-        await db.delete(source_row)
-
-    custom_target = aliased(UserCustomWord)
-    await db.execute(
-        update(UserCustomWord)
-        .where(UserCustomWord.word_id == source_id)
-        .where(
-            ~exists(
-                select(1).where(
-                    (custom_target.profile_id == UserCustomWord.profile_id)
-                    & (custom_target.word_id == target_id)
-                    & (custom_target.target_lang == UserCustomWord.target_lang)
-                )
-            )
-        )
-        .values(word_id=target_id)
-    )
-    custom_source = aliased(UserCustomWord)
-    custom_target = aliased(UserCustomWord)
-    custom_rows = await db.execute(
-        select(custom_source)
-        .join(
-            custom_target,
-            (custom_target.word_id == target_id)
-            & (custom_target.profile_id == custom_source.profile_id)
-            & (custom_target.target_lang == custom_source.target_lang),
-        )
-        .where(custom_source.word_id == source_id)
-    )
-    for row in custom_rows.scalars().all():
-        await db.delete(row)
-
-    trans_target = aliased(UserWordTranslation)
-    await db.execute(
-        update(UserWordTranslation)
-        .where(UserWordTranslation.word_id == source_id)
-        .where(
-            ~exists(
-                select(1).where(
-                    (trans_target.profile_id == UserWordTranslation.profile_id)
-                    & (trans_target.word_id == target_id)
-                    & (trans_target.target_lang == UserWordTranslation.target_lang)
-                    & (trans_target.translation == UserWordTranslation.translation)
-                )
-            )
-        )
-        .values(word_id=target_id)
-    )
-    trans_source = aliased(UserWordTranslation)
-    trans_target = aliased(UserWordTranslation)
-    trans_rows = await db.execute(
-        select(trans_source)
-        .join(
-            trans_target,
-            (trans_target.word_id == target_id)
-            & (trans_target.profile_id == trans_source.profile_id)
-            & (trans_target.target_lang == trans_source.target_lang)
-            & (trans_target.translation == trans_source.translation),
-        )
-        .where(trans_source.word_id == source_id)
-    )
-    for row in trans_rows.scalars().all():
-        await db.delete(row)
-
-    user_target = aliased(UserWord)
-    await db.execute(
-        update(UserWord)
-        .where(UserWord.word_id == source_id)
-        .where(
-            ~exists(
-                select(1).where(
-                    (user_target.profile_id == UserWord.profile_id)
-                    & (user_target.word_id == target_id)
-                )
-            )
-        )
-        .values(word_id=target_id)
-    )
-    user_source = aliased(UserWord)
-    user_target = aliased(UserWord)
-    user_rows = await db.execute(
-        select(user_source, user_target)
-        .join(
-            user_target,
-            (user_target.profile_id == user_source.profile_id) & (user_target.word_id == target_id),
-        )
-        .where(user_source.word_id == source_id)
-    )
-    for source_row, target_row in user_rows.all():
-        if is_better_progress(source_row, target_row):
-            copy_progress(target_row, source_row)
-        await db.delete(source_row)
-
-    await db.execute(
-        update(ReviewEvent).where(ReviewEvent.word_id == source_id).values(word_id=target_id)
-    )
-    await db.execute(
-        update(ContentReport).where(ContentReport.word_id == source_id).values(word_id=target_id)
-    )
-
-    source_word = await db.get(Word, source_id)
-    if source_word:
-        await db.delete(source_word)
-
-
 @router.patch("/words/{word_id}", response_model=AdminWordOut)
 async def update_word(
     word_id: int,
@@ -809,21 +611,26 @@ async def update_word(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
 
     existing = await db.execute(
-        select(Word).where(
-            Word.lemma == lemma,
+        select(Word)
+        .where(
+            Word.lemma_key == lemma_key_sql(lemma),
             Word.lang == word.lang,
             Word.id != word.id,
         )
+        .order_by(Word.id)
+        .limit(1)
     )
     existing_word = existing.scalar_one_or_none()
     in_use = await word_has_user_data(db, word.id)
+    corpus_ids = await word_corpus_ids(db, word.id)
 
     if existing_word:
+        corpus_ids.extend(await word_corpus_ids(db, existing_word.id))
         if in_use:
             await copy_translations(db, word.id, existing_word.id)
-            await move_corpus_stats(db, word.id, existing_word.id)
-            await move_entry_terms(db, word.id, existing_word.id)
+            await move_corpus_data(db, {word.id: existing_word.id})
             await db.commit()
+            await sync_corpus_catalog(db, corpus_ids)
             await log_audit_event(
                 "admin.word.corpus_reassign",
                 user_id=user.id,
@@ -834,12 +641,13 @@ async def update_word(
             return AdminWordOut(
                 id=existing_word.id, lemma=existing_word.lemma, lang=existing_word.lang
             )
-        await merge_words(db, word.id, existing_word.id)
+        await merge_word_pairs(db, {word_id: existing_word.id})
         await db.commit()
+        await sync_corpus_catalog(db, corpus_ids)
         await log_audit_event(
             "admin.word.merge",
             user_id=user.id,
-            meta={"source_word_id": word.id, "target_word_id": existing_word.id},
+            meta={"source_word_id": word_id, "target_word_id": existing_word.id},
             request=request,
             db=db,
         )
@@ -855,9 +663,9 @@ async def update_word(
         db.add(new_word)
         await db.flush()
         await copy_translations(db, word.id, new_word.id)
-        await move_corpus_stats(db, word.id, new_word.id)
-        await move_entry_terms(db, word.id, new_word.id)
+        await move_corpus_data(db, {word.id: new_word.id})
         await db.commit()
+        await sync_corpus_catalog(db, corpus_ids)
         await log_audit_event(
             "admin.word.clone",
             user_id=user.id,
@@ -876,6 +684,7 @@ async def update_word(
     except DataError as exc:
         await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid lemma") from exc
+    await sync_corpus_catalog(db, corpus_ids, counts=False)
 
     await log_audit_event(
         "admin.word.update",
@@ -887,6 +696,46 @@ async def update_word(
     return AdminWordOut(id=word.id, lemma=word.lemma, lang=word.lang)
 
 
+@router.post("/words/merge", response_model=AdminWordMergeOut)
+async def merge_words_batch(
+    data: AdminWordMergeRequest,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AdminWordMergeOut:
+    ensure_admin(user)
+    if len(data.pairs) > MAX_MERGE_PAIRS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many pairs")
+    try:
+        pairs = normalize_merge_pairs((pair.source_id, pair.target_id) for pair in data.pairs)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    word_ids = sorted(set(pairs) | set(pairs.values()))
+    langs: dict[int, str] = {}
+    for start in range(0, len(word_ids), LOOKUP_BATCH):
+        result = await db.execute(
+            select(Word.id, Word.lang).where(Word.id.in_(word_ids[start : start + LOOKUP_BATCH]))
+        )
+        langs.update(result.tuples().all())
+    if len(langs) < len(word_ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
+    if any(langs[source_id] != langs[target_id] for source_id, target_id in pairs.items()):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Merged words must share a language")
+
+    # Each batch commits on its own; a failure keeps the batches merged before it.
+    report = await merge_word_batches(db, pairs.items())
+    await sync_corpus_catalog(db, report.corpus_ids)
+    await log_audit_event(
+        "admin.word.merge_batch",
+        user_id=user.id,
+        meta={"pairs": len(pairs), "words": report.words, "moved": report.moved, "folded": report.folded},
+        request=request,
+        db=db,
+    )
+    return AdminWordMergeOut(words=report.words, moved=report.moved, folded=report.folded)
+
+
 @router.post("/entries/{entry_id}/terms", response_model=AdminCorpusEntryTermOut)
 async def create_entry_term(
     entry_id: int,
@@ -908,7 +757,9 @@ async def create_entry_term(
     if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entry not found")
 
-    word_result = await db.execute(select(Word).where(Word.lemma == lemma, Word.lang == lang))
+    word_result = await db.execute(
+        select(Word).where(Word.lemma_key == lemma_key_sql(lemma), Word.lang == lang).order_by(Word.id).limit(1)
+    )
     word = word_result.scalar_one_or_none()
     if word is None:
         word = Word(lemma=lemma, lang=lang)
@@ -959,6 +810,7 @@ async def create_entry_term(
 
     await db.commit()
     await db.refresh(term)
+    await sync_corpus_catalog(db, [entry.corpus_id])
 
     await log_audit_event(
         "admin.entry_term.create",
@@ -994,6 +846,7 @@ async def update_entry_term(
     word = await db.get(Word, term.word_id)
     if word is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
+    corpus_ids = await word_corpus_ids(db, term.word_id)
 
     if data.lemma is not None:
         lemma = data.lemma.strip()
@@ -1002,13 +855,19 @@ async def update_entry_term(
         if len(lemma) > 255:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Lemma too long")
 
-        existing = await db.execute(select(Word).where(Word.lemma == lemma, Word.lang == term.lang))
+        existing = await db.execute(
+            select(Word)
+            .where(Word.lemma_key == lemma_key_sql(lemma), Word.lang == term.lang, Word.id != term.word_id)
+            .order_by(Word.id)
+            .limit(1)
+        )
         next_word = existing.scalar_one_or_none()
         if next_word is None:
             word.lemma = lemma
             await db.commit()
         elif next_word.id != term.word_id:
-            await merge_words(db, term.word_id, next_word.id)
+            corpus_ids.extend(await word_corpus_ids(db, next_word.id))
+            await merge_word_pairs(db, {term.word_id: next_word.id})
             await db.commit()
             term = await db.get(CorpusEntryTerm, term_id)
             if term is None:
@@ -1068,6 +927,8 @@ async def update_entry_term(
                 term = fallback
                 word = await db.get(Word, term.word_id)
 
+    await sync_corpus_catalog(db, corpus_ids)
+
     await log_audit_event(
         "admin.entry_term.update",
         user_id=user.id,
@@ -1098,6 +959,7 @@ async def delete_entry_term(
     if term is None or term.entry_id != entry_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Term not found")
 
+    corpus_id = await db.scalar(select(CorpusEntry.corpus_id).where(CorpusEntry.id == entry_id))
     was_primary = term.is_primary
     lang = term.lang
     await db.delete(term)
@@ -1123,6 +985,7 @@ async def delete_entry_term(
             await db.delete(entry)
 
     await db.commit()
+    await sync_corpus_catalog(db, [corpus_id])
 
     await log_audit_event(
         "admin.entry_term.delete",
@@ -1174,6 +1037,7 @@ async def update_translation(
     except IntegrityError as exc:
         await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Translation already exists") from exc
+    await sync_corpus_catalog(db, await word_corpus_ids(db, translation.word_id), counts=False)
 
     await log_audit_event(
         "admin.translation.update",
@@ -1230,6 +1094,7 @@ async def create_translation(
         await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Translation already exists") from exc
     await db.refresh(translation)
+    await sync_corpus_catalog(db, await word_corpus_ids(db, translation.word_id), counts=False)
 
     await log_audit_event(
         "admin.translation.create",
@@ -1258,9 +1123,11 @@ async def delete_word(
     if word is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
 
+    corpus_ids = await word_corpus_ids(db, word_id)
     if await word_has_user_data(db, word_id):
         removed = await detach_word_from_corpora(db, word_id)
         await db.commit()
+        await sync_corpus_catalog(db, corpus_ids)
         await log_audit_event(
             "admin.word.detach",
             user_id=user.id,
@@ -1272,6 +1139,7 @@ async def delete_word(
 
     await db.delete(word)
     await db.commit()
+    await sync_corpus_catalog(db, corpus_ids)
 
     await log_audit_event(
         "admin.word.delete",
@@ -1295,10 +1163,12 @@ async def purge_word(
     if word is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found")
 
+    corpus_ids = await word_corpus_ids(db, word_id)
     removed = await purge_word_everywhere(db, word_id)
     await db.flush()
     await db.delete(word)
     await db.commit()
+    await sync_corpus_catalog(db, corpus_ids)
 
     await log_audit_event(
         "admin.word.purge",
@@ -1328,8 +1198,10 @@ async def delete_translation(
             detail="Translation is used by learners without snapshots.",
         )
 
+    word_id = translation.word_id
     await db.delete(translation)
     await db.commit()
+    await sync_corpus_catalog(db, await word_corpus_ids(db, word_id), counts=False)
 
     await log_audit_event(
         "admin.translation.delete",
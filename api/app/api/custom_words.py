@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-import re
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import delete, func, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_active_learning_profile, get_current_user
 from app.api.study import REVIEW_INTERVALS_DAYS
+from app.api.tech import enqueue_job
+from app.core.lang import detect_lang, detect_langs
+from app.core.word_imports import (
+    ImportLine,
+    ImportReport,
+    ProgressCallback,
+    chunked,
+    parse_import_lines,
+    read_upload,
+    should_queue,
+)
+from app.core.words import ensure_word_ids, lemma_key
 from app.db.session import get_db
 from app.models import Translation, User, UserCustomWord, UserWord, UserWordTranslation, Word
 from app.schemas.custom_words import (
@@ -27,65 +38,36 @@ def normalize_text(value: str) -> str:
     return " ".join(value.strip().split()).lower()
 
 
-LATIN_RE = re.compile(r"[A-Za-z]")
-CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
-
-
-def detect_lang(value: str) -> str | None:
-    if not value:
-        return None
-    latin = len(LATIN_RE.findall(value))
-    cyrillic = len(CYRILLIC_RE.findall(value))
-    total = latin + cyrillic
-    if total == 0:
-        return None
-    latin_ratio = latin / total
-    cyrillic_ratio = cyrillic / total
-    if latin_ratio >= 0.8 and cyrillic_ratio <= 0.2:
-        return "en"
-    if cyrillic_ratio >= 0.8 and latin_ratio <= 0.2:
-        return "ru"
-    return None
+def should_swap(word_lang: str | None, translation_lang: str | None, native_lang: str, target_lang: str) -> bool:
+    if native_lang == target_lang:
+        return False
+    if native_lang not in {"ru", "en"} or target_lang not in {"ru", "en"}:
+        return False
+    return word_lang == native_lang and translation_lang == target_lang
 
 
 def maybe_swap(word: str, translation: str, native_lang: str, target_lang: str) -> tuple[str, str]:
     if not word or not translation:
         return word, translation
-    if native_lang == target_lang:
-        return word, translation
-    if native_lang not in {"ru", "en"} or target_lang not in {"ru", "en"}:
-        return word, translation
-    word_lang = detect_lang(word)
-    translation_lang = detect_lang(translation)
-    if word_lang == native_lang and translation_lang == target_lang:
+    if should_swap(detect_lang(word), detect_lang(translation), native_lang, target_lang):
         return translation, word
     return word, translation
 
 
-def chunked(items: list[str], size: int) -> list[list[str]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
+def swap_pairs(pairs: list[tuple[str, str]], native_lang: str, target_lang: str) -> list[tuple[str, str]]:
+    # maybe_swap over a whole import: both columns go through one batch detector call.
+    if native_lang == target_lang or {native_lang, target_lang} - {"ru", "en"}:
+        return pairs
+    langs = detect_langs([text for pair in pairs for text in pair])
+    return [
+        (translation, word) if should_swap(langs[2 * idx], langs[2 * idx + 1], native_lang, target_lang)
+        else (word, translation)
+        for idx, (word, translation) in enumerate(pairs)
+    ]
 
 
-def parse_import(text: str) -> tuple[list[tuple[str, str]], int, int]:
-    total_lines = 0
-    invalid_lines = 0
-    entries: list[tuple[str, str]] = []
-    for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        total_lines += 1
-        if "-" not in line:
-            invalid_lines += 1
-            continue
-        left, right = line.split("-", 1)
-        word = normalize_text(left)
-        translation = normalize_text(right)
-        if not word or not translation:
-            invalid_lines += 1
-            continue
-        entries.append((word, translation))
-    return entries, total_lines, invalid_lines
+def parse_import(text: str) -> tuple[list[ImportLine], ImportReport]:
+    return parse_import_lines(text, normalize_text)
 
 
 async def load_profile(user_id, db: AsyncSession):
@@ -164,15 +146,8 @@ async def add_custom_word(
     if len(word) > 255:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Word too long")
 
-    await db.execute(
-        insert(Word)
-        .values(lemma=word, lang=profile.target_lang)
-        .on_conflict_do_nothing(index_elements=["lemma", "lang"])
-    )
-    word_result = await db.execute(
-        select(Word.id).where(Word.lemma == word, Word.lang == profile.target_lang)
-    )
-    word_id = word_result.scalar_one()
+    word_ids = await ensure_word_ids(db, profile.target_lang, [word])
+    word_id = word_ids[lemma_key(word)]
 
     learned_result = await db.execute(
         select(UserWord.word_id).where(
@@ -247,7 +222,7 @@ async def update_custom_word(
     custom_word = row[0]
     current_lemma = row[1]
 
-    if current_lemma != word:
+    if lemma_key(current_lemma) != lemma_key(word):
         learned_result = await db.execute(
             select(UserWord.word_id).where(
                 UserWord.profile_id == profile.id,
@@ -260,15 +235,8 @@ async def update_custom_word(
                 detail="Word already learned. Delete and add a new one.",
             )
 
-        await db.execute(
-            insert(Word)
-            .values(lemma=word, lang=profile.target_lang)
-            .on_conflict_do_nothing(index_elements=["lemma", "lang"])
-        )
-        new_word_result = await db.execute(
-            select(Word.id).where(Word.lemma == word, Word.lang == profile.target_lang)
-        )
-        new_word_id = new_word_result.scalar_one()
+        new_word_ids = await ensure_word_ids(db, profile.target_lang, [word])
+        new_word_id = new_word_ids[lemma_key(word)]
 
         learned_new = await db.execute(
             select(UserWord.word_id).where(
@@ -442,6 +410,83 @@ async def mark_custom_word_known(
     return {"marked": True}
 
 
+async def ingest_custom_words(
+    db: AsyncSession,
+    profile,
+    user_id,
+    lines: list[ImportLine],
+    report: ImportReport,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
+    # Later lines win for the same word; every batch is upserted and committed on its own.
+    entries: dict[str, ImportLine] = {}
+    swapped = swap_pairs([(item.word, item.translation) for item in lines], profile.native_lang, profile.target_lang)
+    for item, (word, translation) in zip(lines, swapped):
+        key = lemma_key(word)
+        if not key or not translation:
+            continue
+        entries[key] = ImportLine(line=item.line, word=word, translation=translation)
+    report.total_words = len(entries)
+
+    for chunk in chunked(list(entries.values())):
+        word_id_map = await ensure_word_ids(db, profile.target_lang, [item.word for item in chunk])
+        existing_result = await db.execute(
+            select(UserCustomWord.word_id, UserCustomWord.translation).where(
+                UserCustomWord.profile_id == profile.id,
+                UserCustomWord.target_lang == profile.native_lang,
+                UserCustomWord.word_id.in_(word_id_map.values()),
+            )
+        )
+        existing_map = {row.word_id: row.translation for row in existing_result.fetchall()}
+
+        rows = []
+        for item in chunk:
+            word_id = word_id_map.get(lemma_key(item.word))
+            if not word_id:
+                report.add_error(item.line, "word could not be stored")
+                continue
+            existing_translation = existing_map.get(word_id)
+            if existing_translation is None:
+                report.inserted += 1
+            elif existing_translation == item.translation:
+                report.skipped += 1
+            else:
+                report.updated += 1
+            rows.append(
+                {
+                    "profile_id": profile.id,
+                    "user_id": user_id,
+                    "word_id": word_id,
+                    "target_lang": profile.native_lang,
+                    "translation": item.translation,
+                }
+            )
+
+        if rows:
+            stmt = insert(UserCustomWord).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["profile_id", "word_id", "target_lang"],
+                set_={"translation": stmt.excluded.translation},
+            )
+            await db.execute(stmt)
+        await db.commit()
+        report.processed_words += len(chunk)
+        if progress:
+            await progress(report.as_dict())
+    return report
+
+
+async def run_custom_import(text: str, profile, user: User, db: AsyncSession) -> CustomWordsImportOut:
+    lines, report = parse_import(text)
+    if not lines:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No valid lines found")
+    if should_queue(report):
+        job = await enqueue_job("import_custom_words", user.id, profile.id, {"text": text}, db)
+        return CustomWordsImportOut(status="queued", job_id=job.id, **report.as_dict())
+    await ingest_custom_words(db, profile, user.id, lines, report)
+    return CustomWordsImportOut(**report.as_dict())
+
+
 @router.post("/custom-words/import", response_model=CustomWordsImportOut)
 async def import_custom_words(
     data: CustomWordsImportRequest,
@@ -449,83 +494,16 @@ async def import_custom_words(
     db: AsyncSession = Depends(get_db),
 ) -> CustomWordsImportOut:
     profile = await load_profile(user.id, db)
-    entries, total_lines, invalid_lines = parse_import(data.text or "")
-    if not entries:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No valid lines found")
-
-    entries_map = {}
-    for word, translation in entries:
-        fixed_word, fixed_translation = maybe_swap(
-            word, translation, profile.native_lang, profile.target_lang
-        )
-        if not fixed_word or not fixed_translation:
-            continue
-        entries_map[fixed_word] = fixed_translation
-
-    lemmas = list(entries_map.keys())
-    for batch in chunked(lemmas, 1000):
-        rows = [{"lemma": lemma, "lang": profile.target_lang} for lemma in batch]
-        stmt = insert(Word).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["lemma", "lang"])
-        await db.execute(stmt)
+    return await run_custom_import(data.text or "", profile, user, db)
 
-    word_id_map: dict[str, int] = {}
-    for batch in chunked(lemmas, 1000):
-        result = await db.execute(
-            select(Word.id, Word.lemma).where(Word.lang == profile.target_lang, Word.lemma.in_(batch))
-        )
-        for word_id, lemma in result.fetchall():
-            word_id_map[lemma] = word_id
 
-    existing_result = await db.execute(
-        select(UserCustomWord.word_id, UserCustomWord.translation).where(
-            UserCustomWord.profile_id == profile.id,
-            UserCustomWord.target_lang == profile.native_lang,
-            UserCustomWord.word_id.in_(word_id_map.values()),
-        )
-    )
-    existing_map = {row.word_id: row.translation for row in existing_result.fetchall()}
-
-    rows = []
-    inserted = 0
-    updated = 0
-    skipped = 0
-    for lemma, translation in entries_map.items():
-        word_id = word_id_map.get(lemma)
-        if not word_id:
-            continue
-        existing_translation = existing_map.get(word_id)
-        if existing_translation is None:
-            inserted += 1
-        elif existing_translation == translation:
-            skipped += 1
-        else:
-            updated += 1
-        rows.append(
-            {
-                "profile_id": profile.id,
-                "user_id": user.id,
-                "word_id": word_id,
-                "target_lang": profile.native_lang,
-                "translation": translation,
-            }
-        )
-
-    if rows:
-        stmt = insert(UserCustomWord).values(rows)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["profile_id", "word_id", "target_lang"],
-            set_={"translation": stmt.excluded.translation},
-        )
-        await db.execute(stmt)
-
-    await db.commit()
-
-    return CustomWordsImportOut(
-        total_lines=total_lines,
-        parsed_lines=len(entries),
-        invalid_lines=invalid_lines,
-        inserted=inserted,
-        updated=updated,
-        skipped=skipped,
-    )
+@router.post("/custom-words/import/upload", response_model=CustomWordsImportOut)
+async def upload_custom_words(
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> CustomWordsImportOut:
+    # Same format as /custom-words/import, sent as a plain-text body instead of JSON.
+    profile = await load_profile(user.id, db)
+    text = await read_upload(request)
+    return await run_custom_import(text, profile, user, db)
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
 from app.api.auth import get_active_learning_profile, get_current_user
+from app.core.corpus_versions import active_entries
 from app.db.session import get_db
 from app.models import (
     CorpusEntry,
@@ -88,7 +89,7 @@ async def count_available_new_words(
             UserWord,
             and_(UserWord.profile_id == profile_id, UserWord.word_id == source_term.word_id),
         )
-        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True))
+        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True), active_entries())
         .where(
             exists(
                 select(1).where(
@@ -215,6 +216,7 @@ async def get_dashboard(
             source_term.word_id.in_(select(due_words_subq.c.word_id)),
             UserCorpus.profile_id == learning_profile.id,
             UserCorpus.enabled.is_(True),
+            active_entries(),
         )
     )
     user_translation_subq = (
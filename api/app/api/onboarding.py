@@ -3,14 +3,35 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, exists, func, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, exists, select
 from sqlalchemy.orm import aliased
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_active_learning_profile, get_current_user
 from app.api.study import REVIEW_INTERVALS_DAYS
+from app.api.tech import enqueue_job
+from app.core.corpus_catalog import (
+    cached_response,
+    catalog_etag,
+    corpus_content_version,
+    corpus_etag,
+    load_corpus_catalog,
+    store_response,
+)
+from app.core.corpus_versions import active_entries
+from app.core.etag import etag_matches, not_modified, set_etag
+from app.core.word_imports import (
+    ImportLine,
+    ImportReport,
+    ProgressCallback,
+    chunked,
+    parse_import_lines,
+    read_upload,
+    should_queue,
+)
+from app.core.words import find_word_ids, lemma_key
 from app.db.session import get_db
 from app.models import (
     Corpus,
@@ -58,30 +79,8 @@ def resolve_corpus_name(corpus: Corpus, ui_lang: str | None) -> str:
     return corpus.name
 
 
-def chunked(items: list[str], size: int) -> list[list[str]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
-
-
-def parse_known_words(text: str) -> tuple[list[tuple[str, str]], int, int]:
-    total_lines = 0
-    invalid_lines = 0
-    entries: list[tuple[str, str]] = []
-    for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        total_lines += 1
-        if "-" not in line:
-            invalid_lines += 1
-            continue
-        left, right = line.split("-", 1)
-        source = left.strip().lower()
-        translation = right.strip().lower()
-        if not source or not translation:
-            invalid_lines += 1
-            continue
-        entries.append((source, translation))
-    return entries, total_lines, invalid_lines
+def parse_known_words(text: str) -> tuple[list[ImportLine], ImportReport]:
+    return parse_import_lines(text, lambda value: value.strip().lower())
 
 
 @router.get("/onboarding", response_model=OnboardingStateOut)
@@ -123,6 +122,8 @@ async def get_onboarding_state(
 @router.get("/corpora/{corpus_id}/preview", response_model=CorpusPreviewOut)
 async def preview_corpus(
     corpus_id: int,
+    request: Request,
+    response: Response,
     limit: int = 20,
     source_lang: str | None = None,
     target_lang: str | None = None,
@@ -137,11 +138,19 @@ async def preview_corpus(
     if not source_lang or not target_lang:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Language required")
 
-    corpus_result = await db.execute(select(Corpus.id).where(Corpus.id == corpus_id))
-    corpus = corpus_result.first()
-    if not corpus:
+    content_version = await corpus_content_version(db, corpus_id)
+    if content_version is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Corpus not found")
 
+    etag = corpus_etag("preview", corpus_id, content_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    cache_key = ("preview", corpus_id, content_version, limit, source_lang, target_lang)
+    cached = cached_response(cache_key)
+    if cached is not None:
+        return cached
+
     target_term = aliased(CorpusEntryTerm)
     stats_result = await db.execute(
         select(
@@ -159,7 +168,7 @@ async def preview_corpus(
             & (CorpusEntryTerm.is_primary.is_(True)),
         )
         .join(Word, Word.id == CorpusEntryTerm.word_id)
-        .where(CorpusEntry.corpus_id == corpus_id)
+        .where(CorpusEntry.corpus_id == corpus_id, active_entries())
         .where(
             exists(
                 select(1)
@@ -176,7 +185,9 @@ async def preview_corpus(
     stats_rows = stats_result.fetchall()
     entry_ids = [row.entry_id for row in stats_rows]
     if not entry_ids:
-        return CorpusPreviewOut(corpus_id=corpus_id, words=[])
+        preview = CorpusPreviewOut(corpus_id=corpus_id, words=[])
+        store_response(cache_key, preview)
+        return preview
 
     translation_result = await db.execute(
         select(
@@ -210,44 +221,37 @@ async def preview_corpus(
         for row in stats_rows
     ]
 
-    return CorpusPreviewOut(corpus_id=corpus_id, words=words)
+    preview = CorpusPreviewOut(corpus_id=corpus_id, words=words)
+    store_response(cache_key, preview)
+    return preview
 
 
 @router.get("/corpora", response_model=list[CorpusOut])
 async def list_corpora(
+    request: Request,
+    response: Response,
     source_lang: str | None = None,
     target_lang: str | None = None,
     ui_lang: str | None = None,
     db: AsyncSession = Depends(get_db),
 ) -> list[CorpusOut]:
     source_lang = normalize_lang(source_lang) if source_lang else None
-    _ = normalize_lang(target_lang) if target_lang else None
+    target_lang = normalize_lang(target_lang) if target_lang else None
     ui_lang = normalize_lang(ui_lang) if ui_lang else None
 
-    stmt = (
-        select(
-            Corpus.id,
-            Corpus.slug,
-            Corpus.name,
-            Corpus.name_ru,
-            Corpus.name_en,
-            func.count(CorpusEntry.id).label("words_total"),
-        )
-        .select_from(Corpus)
-        .join(CorpusEntry, CorpusEntry.corpus_id == Corpus.id, isouter=True)
-        .group_by(Corpus.id, Corpus.slug, Corpus.name, Corpus.name_ru, Corpus.name_en)
-        .order_by(Corpus.name)
-    )
-
-    result = await db.execute(stmt)
+    catalog = await load_corpus_catalog(db)
+    etag = catalog_etag(catalog)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return [
         CorpusOut(
-            id=row.id,
-            slug=row.slug,
-            name=resolve_corpus_name(row, ui_lang),
-            words_total=row.words_total,
+            id=item.id,
+            slug=item.slug,
+            name=resolve_corpus_name(item, ui_lang),
+            words_total=item.words_total(source_lang, target_lang),
         )
-        for row in result.fetchall()
+        for item in catalog
     ]
 
 
@@ -338,66 +342,100 @@ async def apply_onboarding(
     return OnboardingOut()
 
 
-@router.post("/onboarding/known-words", response_model=KnownWordsImportOut)
-async def import_known_words(
-    data: KnownWordsImportRequest,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> KnownWordsImportOut:
-    profile = await get_active_learning_profile(user.id, db, require_onboarding=True)
-
-    entries, total_lines, invalid_lines = parse_known_words(data.text)
-    if not entries:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No valid lines found")
-
-    unique_lemmas = sorted({entry[0] for entry in entries})
-    word_id_map: dict[str, int] = {}
-    for batch in chunked(unique_lemmas, 1000):
-        result = await db.execute(
-            select(Word.id, Word.lemma).where(Word.lang == profile.target_lang, Word.lemma.in_(batch))
-        )
-        for word_id, lemma in result.fetchall():
-            word_id_map[lemma] = word_id
+async def ingest_known_words(
+    db: AsyncSession,
+    profile,
+    user_id,
+    lines: list[ImportLine],
+    report: ImportReport,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
+    # Known words must already exist; each unique word is reported against the first line naming it.
+    first_lines: dict[str, int] = {}
+    for item in lines:
+        key = lemma_key(item.word)
+        if key:
+            first_lines.setdefault(key, item.line)
+    report.total_words = len(first_lines)
 
     now = datetime.now(timezone.utc)
     first_interval = REVIEW_INTERVALS_DAYS[0]
     next_review_at = now + timedelta(days=first_interval)
-    rows = [
-        {
-            "profile_id": profile.id,
-            "user_id": user.id,
-            "word_id": word_id,
-            "status": "known",
-            "stage": 0,
-            "repetitions": 0,
-            "interval_days": first_interval,
-            "ease_factor": 2.5,
-            "learned_at": now,
-            "last_review_at": now,
-            "next_review_at": next_review_at,
-            "correct_streak": 0,
-            "wrong_streak": 0,
-        }
-        for word_id in word_id_map.values()
-    ]
-    inserted = 0
-    if rows:
-        stmt = insert(UserWord).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["profile_id", "word_id"])
-        result = await db.execute(stmt)
-        inserted = result.rowcount or 0
+    for chunk in chunked(list(first_lines)):
+        word_id_map = await find_word_ids(db, profile.target_lang, chunk)
+        for key in chunk:
+            if key not in word_id_map:
+                report.words_missing += 1
+                report.add_error(first_lines[key], "word not found")
+        rows = [
+            {
+                "profile_id": profile.id,
+                "user_id": user_id,
+                "word_id": word_id,
+                "status": "known",
+                "stage": 0,
+                "repetitions": 0,
+                "interval_days": first_interval,
+                "ease_factor": 2.5,
+                "learned_at": now,
+                "last_review_at": now,
+                "next_review_at": next_review_at,
+                "correct_streak": 0,
+                "wrong_streak": 0,
+            }
+            for word_id in word_id_map.values()
+        ]
+        if rows:
+            stmt = insert(UserWord).values(rows)
+            stmt = stmt.on_conflict_do_nothing(index_elements=["profile_id", "word_id"])
+            result = await db.execute(stmt)
+            inserted = result.rowcount or 0
+            report.inserted += inserted
+            report.skipped += max(len(rows) - inserted, 0)
         await db.commit()
+        report.processed_words += len(chunk)
+        if progress:
+            await progress(report.as_dict())
+    return report
 
-    words_found = len(word_id_map)
-    words_missing = len(unique_lemmas) - words_found
-    skipped_existing = max(words_found - inserted, 0)
 
+def known_words_out(report: ImportReport, **extra) -> KnownWordsImportOut:
     return KnownWordsImportOut(
-        total_lines=total_lines,
-        parsed_lines=len(entries),
-        invalid_lines=invalid_lines,
-        words_found=words_found,
-        words_missing=words_missing,
-        inserted=inserted,
-        skipped_existing=skipped_existing,
+        **report.as_dict(),
+        **extra,
+        words_found=report.inserted + report.skipped,
+        skipped_existing=report.skipped,
     )
+
+
+async def run_known_words_import(text: str, profile, user: User, db: AsyncSession) -> KnownWordsImportOut:
+    lines, report = parse_known_words(text)
+    if not lines:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No valid lines found")
+    if should_queue(report):
+        job = await enqueue_job("import_known_words", user.id, profile.id, {"text": text}, db)
+        return known_words_out(report, status="queued", job_id=job.id)
+    await ingest_known_words(db, profile, user.id, lines, report)
+    return known_words_out(report)
+
+
+@router.post("/onboarding/known-words", response_model=KnownWordsImportOut)
+async def import_known_words(
+    data: KnownWordsImportRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> KnownWordsImportOut:
+    profile = await get_active_learning_profile(user.id, db, require_onboarding=True)
+    return await run_known_words_import(data.text, profile, user, db)
+
+
+@router.post("/onboarding/known-words/upload", response_model=KnownWordsImportOut)
+async def upload_known_words(
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> KnownWordsImportOut:
+    # Same format as /onboarding/known-words, sent as a plain-text body instead of JSON.
+    profile = await get_active_learning_profile(user.id, db, require_onboarding=True)
+    text = await read_upload(request)
+    return await run_known_words_import(text, profile, user, db)
@@ -1,34 +1,50 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
-from sqlalchemy.dialects.postgresql import insert
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import Integer, any_, cast, delete, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_active_learning_profile, get_current_user
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.core.reading_engine import MIN_LANG_PURITY, ReadingIndex, build_bundle, passage_metrics, search_config
 from app.db.session import get_db
 from app.models import (
+    BackgroundJob,
     Corpus,
+    LearningProfile,
     ReadingPassage,
     ReadingPassageBlock,
-    ReadingPassageToken,
+    ReadingRecommendationCache,
     ReadingSource,
+    ReadingToken,
     User,
     UserCorpus,
     UserWord,
     Word,
 )
-from app.schemas.reading import ReadingFlagOut, ReadingFlagRequest, ReadingPreviewOut, ReadingPreviewRequest
+from app.schemas.reading import (
+    ReadingFlagOut,
+    ReadingFlagRequest,
+    ReadingPreviewOut,
+    ReadingPreviewRequest,
+    ReadingSearchItem,
+    ReadingSearchOut,
+)
 
 router = APIRouter(prefix="/reading", tags=["reading"])
 
 KNOWN_STATUSES = ("known", "learned")
+DEFAULT_TARGET_WORDS = 10
+DEFAULT_DAYS = 3
+RECOMMENDATION_REFRESH_KEYS = 4
+CANDIDATE_LIMIT = 80
+SEARCH_HEADLINE_OPTIONS = "StartSel=<<, StopSel=>>, MaxFragments=2, MaxWords=24, MinWords=8"
 TOKEN_RE = re.compile(r"[A-Za-z\u0400-\u04FF]+(?:['\u2019][A-Za-z\u0400-\u04FF]+)?")
-LATIN_RE = re.compile(r"[A-Za-z]")
-CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
 
 
 def normalize_text(value: str) -> str:
@@ -70,28 +86,11 @@ def reading_target_range(target_words: int) -> tuple[int, int]:
 
 
 def matches_target_language(text: str, lang: str) -> bool:
-    if not text:
-        return False
-    latin = len(LATIN_RE.findall(text))
-    cyrillic = len(CYRILLIC_RE.findall(text))
-    letters = latin + cyrillic
-    if letters == 0:
-        return False
-    latin_ratio = latin / letters
-    cyrillic_ratio = cyrillic / letters
-    if lang == "en":
-        return latin_ratio >= 0.9 and cyrillic_ratio <= 0.05
-    if lang == "ru":
-        return cyrillic_ratio >= 0.9 and latin_ratio <= 0.05
-    return True
+    lang_purity, _letter_ratio = passage_metrics(text, lang)
+    return lang_purity >= MIN_LANG_PURITY
 
 
-async def collect_target_tokens(
-    profile_id,
-    target_words: int,
-    days: int,
-    db: AsyncSession,
-) -> list[str]:
+async def recent_learned_word_ids(profile_id, days: int, db: AsyncSession) -> list[int]:
     since = datetime.now(timezone.utc) - timedelta(days=days)
     result = await db.execute(
         select(UserWord.word_id)
@@ -101,10 +100,21 @@ async def collect_target_tokens(
             UserWord.learned_at.is_not(None),
             UserWord.learned_at >= since,
         )
-        .order_by(UserWord.learned_at.desc())
+        .order_by(UserWord.learned_at.desc(), UserWord.word_id)
         .limit(300)
     )
-    word_ids = [row.word_id for row in result.fetchall()]
+    return [row.word_id for row in result.fetchall()]
+
+
+async def collect_target_tokens(
+    profile_id,
+    target_words: int,
+    days: int,
+    db: AsyncSession,
+    word_ids: list[int] | None = None,
+) -> list[str]:
+    if word_ids is None:
+        word_ids = await recent_learned_word_ids(profile_id, days, db)
     if not word_ids:
         return []
 
@@ -129,79 +139,26 @@ async def collect_target_tokens(
     return target_tokens
 
 
-def build_bundle(
-    base: ReadingPassage,
-    passages: list[ReadingPassage],
-    token_map: dict[int, set[str]],
-    min_words: int,
-    max_words: int,
-) -> tuple[list[ReadingPassage], int, set[str]]:
-    selected: list[ReadingPassage] = [base]
-    covered = set(token_map.get(base.id, set()))
-    total_words = base.word_count
-    remaining = [item for item in passages if item.id != base.id]
-
-    while True:
-        best = None
-        best_gain = 0
-        for passage in remaining:
-            if total_words + passage.word_count > max_words:
-                continue
-            new_tokens = token_map.get(passage.id, set()) - covered
-            gain = len(new_tokens)
-            if gain > best_gain:
-                best = passage
-                best_gain = gain
-            elif gain == best_gain and gain > 0 and best is not None:
-                if passage.word_count < best.word_count:
-                    best = passage
-        if best is None:
-            break
-        if best_gain == 0 and total_words >= min_words:
-            break
-        if best_gain == 0 and total_words < min_words:
-            break
-        selected.append(best)
-        covered.update(token_map.get(best.id, set()))
-        total_words += best.word_count
-        remaining = [item for item in remaining if item.id != best.id]
-
-    source_ids = {item.source_id for item in selected}
-    if len(source_ids) == 1:
-        selected_sorted = sorted(selected, key=lambda item: item.position)
-    else:
-        selected_sorted = selected
-    return selected_sorted, total_words, covered
+async def enabled_corpus_ids(profile_id, db: AsyncSession) -> list[int]:
+    result = await db.execute(
+        select(UserCorpus.corpus_id)
+        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True))
+    )
+    return sorted(row.corpus_id for row in result.fetchall())
 
 
-@router.post("", response_model=ReadingPreviewOut)
-async def preview_reading(
-    data: ReadingPreviewRequest,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> ReadingPreviewOut:
-    profile = await get_active_learning_profile(user.id, db, require_onboarding=True)
-    target_words_requested = max(1, min(int(data.target_words or 0), 50))
-    days = max(1, min(int(data.days or 3), 30))
-    variant = max(0, int(data.variant or 0))
+def recommendation_version(word_ids: list[int], corpus_ids: list[int]) -> str:
+    # The recent learned words and the enabled corpora decide the whole bundle list;
+    # passage blocks drop the cached rows directly in flag_reading.
+    payload = ",".join(map(str, word_ids)) + "|" + ",".join(map(str, corpus_ids))
+    return hashlib.sha1(payload.encode("ascii")).hexdigest()
 
-    target_tokens = await collect_target_tokens(
-        profile.id,
-        target_words_requested,
-        days,
-        db,
-    )
-    if not target_tokens:
-        return ReadingPreviewOut(
-            target_words_requested=target_words_requested,
-            message="No recently learned words to match.",
-        )
 
-    enabled_result = await db.execute(
-        select(UserCorpus.corpus_id)
-        .where(UserCorpus.profile_id == profile.id, UserCorpus.enabled.is_(True))
-    )
-    enabled_corpora = [row.corpus_id for row in enabled_result.fetchall()]
+def empty_recommendations(target_words: int, message: str) -> dict:
+    return {"target_words": target_words, "message": message, "bundles": []}
+
+
+async def reading_source_ids(profile: LearningProfile, enabled_corpora: list[int], db: AsyncSession) -> list[int]:
     source_stmt = select(ReadingSource.id).where(ReadingSource.lang == profile.target_lang)
     if enabled_corpora:
         source_stmt = source_stmt.where(ReadingSource.corpus_id.in_(enabled_corpora))
@@ -212,19 +169,33 @@ async def preview_reading(
             select(ReadingSource.id).where(ReadingSource.lang == profile.target_lang)
         )
         source_ids = [row.id for row in fallback_result.fetchall()]
+    return source_ids
+
+
+async def load_target_token_ids(target_tokens: list[str], db: AsyncSession) -> dict[int, str]:
+    result = await db.execute(
+        select(ReadingToken.id, ReadingToken.token).where(ReadingToken.token.in_(target_tokens))
+    )
+    return {row.id: row.token for row in result.fetchall()}
 
-    if not source_ids:
-        return ReadingPreviewOut(
-            target_words_requested=target_words_requested,
-            target_words=len(target_tokens),
-            message="No reading sources found.",
-        )
 
+async def select_candidates(profile_id, source_ids: list[int], target_ids: list[int], db: AsyncSession):
+    if not target_ids:
+        return []
+    target_array = literal(target_ids, type_=ARRAY(Integer))
+    # token_ids holds distinct ids, so counting matching elements equals the old count(distinct token).
+    passage_tokens = func.unnest(ReadingPassage.token_ids).table_valued("token_id").render_derived()
+    hits_expr = (
+        select(func.count())
+        .select_from(passage_tokens)
+        .where(passage_tokens.c.token_id == any_(target_array))
+        .scalar_subquery()
+        .label("hits")
+    )
     blocked_subquery = select(ReadingPassageBlock.passage_id).where(
-        ReadingPassageBlock.profile_id == profile.id
+        ReadingPassageBlock.profile_id == profile_id
     )
-    hits_expr = func.count(func.distinct(ReadingPassageToken.token)).label("hits")
-    candidate_result = await db.execute(
+    result = await db.execute(
         select(
             ReadingPassage.id,
             ReadingPassage.source_id,
@@ -232,92 +203,94 @@ async def preview_reading(
             ReadingPassage.word_count,
             hits_expr,
         )
-        .select_from(ReadingPassage)
-        .join(ReadingPassageToken, ReadingPassageToken.passage_id == ReadingPassage.id)
         .where(
             ReadingPassage.source_id.in_(source_ids),
-            ReadingPassageToken.token.in_(target_tokens),
+            ReadingPassage.token_ids.overlap(target_array),
             ReadingPassage.id.notin_(blocked_subquery),
+            # Rows not yet backfilled fall through to the text check in build_recommendations.
+            or_(ReadingPassage.lang_purity >= MIN_LANG_PURITY, ReadingPassage.lang_purity.is_(None)),
         )
-        .group_by(
-            ReadingPassage.id,
-            ReadingPassage.source_id,
-            ReadingPassage.position,
-            ReadingPassage.word_count,
-        )
-        .order_by(hits_expr.desc(), ReadingPassage.word_count.asc())
-        .limit(80)
+        .order_by(hits_expr.desc(), ReadingPassage.word_count.asc(), ReadingPassage.id)
+        .limit(CANDIDATE_LIMIT)
+    )
+    return result.fetchall()
+
+
+async def build_recommendations(
+    profile: LearningProfile,
+    target_words_requested: int,
+    days: int,
+    word_ids: list[int],
+    enabled_corpora: list[int],
+    db: AsyncSession,
+) -> dict:
+    target_tokens = await collect_target_tokens(
+        profile.id,
+        target_words_requested,
+        days,
+        db,
+        word_ids=word_ids,
     )
-    candidate_rows = candidate_result.fetchall()
+    if not target_tokens:
+        return empty_recommendations(0, "No recently learned words to match.")
+
+    source_ids = await reading_source_ids(profile, enabled_corpora, db)
+    if not source_ids:
+        return empty_recommendations(len(target_tokens), "No reading sources found.")
+
+    token_names = await load_target_token_ids(target_tokens, db)
+    candidate_rows = await select_candidates(profile.id, source_ids, list(token_names), db)
     if not candidate_rows:
-        return ReadingPreviewOut(
-            target_words_requested=target_words_requested,
-            target_words=len(target_tokens),
-            message="No matching passages found.",
-        )
+        return empty_recommendations(len(target_tokens), "No matching passages found.")
 
     passage_ids = [row.id for row in candidate_rows]
     passages_result = await db.execute(select(ReadingPassage).where(ReadingPassage.id.in_(passage_ids)))
     passages_map = {item.id: item for item in passages_result.scalars().all()}
-
-    token_result = await db.execute(
-        select(ReadingPassageToken.passage_id, ReadingPassageToken.token).where(
-            ReadingPassageToken.passage_id.in_(passage_ids)
-        )
+    index = ReadingIndex(
+        (passage.id, token_id) for passage in passages_map.values() for token_id in passage.token_ids or ()
     )
-    token_map: dict[int, set[str]] = {}
-    for passage_id, token in token_result.fetchall():
-        token_map.setdefault(passage_id, set()).add(token)
 
-    min_words, max_words = reading_target_range(target_words_requested)
+    _min_words, max_words = reading_target_range(target_words_requested)
     candidate_passages: list[ReadingPassage] = []
     for row in candidate_rows:
         passage = passages_map.get(row.id)
         if passage is None:
             continue
-        if not matches_target_language(passage.text, profile.target_lang or ""):
+        if passage.lang_purity is None and not matches_target_language(
+            passage.text, profile.target_lang or ""
+        ):
             continue
         candidate_passages.append(passage)
 
     if not candidate_passages:
-        return ReadingPreviewOut(
-            target_words_requested=target_words_requested,
-            target_words=len(target_tokens),
-            message="No matching passages found.",
-        )
+        return empty_recommendations(len(target_tokens), "No matching passages found.")
 
-    bundles: list[tuple[list[ReadingPassage], int, set[str]]] = []
+    bundles: list[tuple[list[ReadingPassage], int, int]] = []
     sorted_passages = sorted(
         candidate_passages,
-        key=lambda item: (-len(token_map.get(item.id, set())), item.word_count),
+        key=lambda item: (-index.size(item.id), item.word_count),
     )
     for base in sorted_passages[:10]:
-        bundle = build_bundle(base, sorted_passages, token_map, min_words, max_words)
+        bundle = build_bundle(base, sorted_passages, index, max_words)
         bundles.append(bundle)
 
     if not bundles:
-        return ReadingPreviewOut(
-            target_words_requested=target_words_requested,
-            target_words=len(target_tokens),
-            message="No matching passages found.",
-        )
+        return empty_recommendations(len(target_tokens), "No matching passages found.")
 
     target_token_set = set(target_tokens)
+    target_mask = index.mask_of(token_names)
     scored_bundles = []
-    for selected_passages, total_words, covered_tokens in bundles:
-        hits = len(target_token_set & covered_tokens)
+    for selected_passages, total_words, covered_mask in bundles:
+        hits = (target_mask & covered_mask).bit_count()
         coverage = hits / len(target_token_set) if target_token_set else 0.0
-        scored_bundles.append((coverage, hits, total_words, selected_passages, covered_tokens))
-
+        scored_bundles.append((coverage, hits, total_words, selected_passages, covered_mask))
     scored_bundles.sort(key=lambda item: (-item[0], -item[1], item[2]))
-    chosen = scored_bundles[variant % len(scored_bundles)]
-    coverage, hits, word_count, selected_passages, covered_tokens = chosen
-    highlight_tokens = sorted(target_token_set & covered_tokens)
-
-    text_parts = [item.text.strip() for item in selected_passages if item.text]
-    passage_text = "\n\n".join(text_parts)
 
-    selected_source_ids = {item.source_id for item in selected_passages}
+    selected_source_ids = {
+        item.source_id
+        for _coverage, _hits, _words, selected_passages, _mask in scored_bundles
+        for item in selected_passages
+    }
     source_result = await db.execute(
         select(ReadingSource.id, ReadingSource.title, Corpus.name)
         .outerjoin(Corpus, Corpus.id == ReadingSource.corpus_id)
@@ -327,31 +300,221 @@ async def preview_reading(
         row.id: (row.title, row.name)
         for row in source_result.fetchall()
     }
-    source_titles: list[str] = []
-    corpus_names: list[str] = []
-    for passage in selected_passages:
-        title, corpus = source_map.get(passage.source_id, (None, None))
-        if title and title not in source_titles:
-            source_titles.append(title)
-        if corpus and corpus not in corpus_names:
-            corpus_names.append(corpus)
-    source_title = source_titles[0] if len(source_titles) == 1 else None
-    corpus_name = corpus_names[0] if len(corpus_names) == 1 else None
 
+    items = []
+    for coverage, hits, word_count, selected_passages, covered_mask in scored_bundles:
+        text_parts = [item.text.strip() for item in selected_passages if item.text]
+        source_titles: list[str] = []
+        corpus_names: list[str] = []
+        for passage in selected_passages:
+            title, corpus = source_map.get(passage.source_id, (None, None))
+            if title and title not in source_titles:
+                source_titles.append(title)
+            if corpus and corpus not in corpus_names:
+                corpus_names.append(corpus)
+        items.append(
+            {
+                "title": source_titles[0] if source_titles else "",
+                "text": "\n\n".join(text_parts),
+                "source_title": source_titles[0] if len(source_titles) == 1 else None,
+                "source_titles": source_titles,
+                "corpus_name": corpus_names[0] if len(corpus_names) == 1 else None,
+                "corpus_names": corpus_names,
+                "passage_ids": [item.id for item in selected_passages],
+                "word_count": word_count,
+                "hits": hits,
+                "coverage": coverage,
+                "highlight_tokens": sorted(
+                    token_names[token_id] for token_id in index.tokens_of(target_mask & covered_mask)
+                ),
+            }
+        )
+    return {"target_words": len(target_tokens), "message": None, "bundles": items}
+
+
+async def load_recommendations(
+    profile: LearningProfile,
+    target_words: int,
+    days: int,
+    db: AsyncSession,
+) -> dict:
+    # A hit costs the two small version queries and one primary-key read, so paging
+    # through variants no longer reruns the token aggregation and bundle search.
+    word_ids = await recent_learned_word_ids(profile.id, days, db)
+    enabled_corpora = await enabled_corpus_ids(profile.id, db)
+    version = recommendation_version(word_ids, enabled_corpora)
+    cache = await db.get(ReadingRecommendationCache, (profile.id, target_words, days))
+    if cache and cache.words_version == version:
+        return cache.data
+
+    data = await build_recommendations(profile, target_words, days, word_ids, enabled_corpora, db)
+    now = datetime.now(timezone.utc)
+    stmt = insert(ReadingRecommendationCache).values(
+        profile_id=profile.id,
+        target_words=target_words,
+        days=days,
+        words_version=version,
+        data=data,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["profile_id", "target_words", "days"],
+        set_={"words_version": version, "data": data, "updated_at": now},
+    )
+    await db.execute(stmt)
+    await db.commit()
+    return data
+
+
+async def refresh_reading_recommendations(profile: LearningProfile, db: AsyncSession) -> int:
+    # Warm the combinations the profile actually reads with, or the defaults on first use.
+    result = await db.execute(
+        select(ReadingRecommendationCache.target_words, ReadingRecommendationCache.days)
+        .where(ReadingRecommendationCache.profile_id == profile.id)
+        .order_by(ReadingRecommendationCache.updated_at.desc())
+        .limit(RECOMMENDATION_REFRESH_KEYS)
+    )
+    keys = [(row.target_words, row.days) for row in result.fetchall()]
+    if not keys:
+        keys = [(DEFAULT_TARGET_WORDS, DEFAULT_DAYS)]
+    for target_words, days in keys:
+        await load_recommendations(profile, target_words, days, db)
+    return len(keys)
+
+
+async def queue_reading_refresh(profile_id, user_id, db: AsyncSession) -> None:
+    pending_result = await db.execute(
+        select(BackgroundJob.id)
+        .where(
+            BackgroundJob.job_type == "refresh_reading",
+            BackgroundJob.profile_id == profile_id,
+            BackgroundJob.status == "pending",
+        )
+        .limit(1)
+    )
+    if pending_result.scalar_one_or_none() is not None:
+        return
+    db.add(
+        BackgroundJob(
+            job_type="refresh_reading",
+            status="pending",
+            user_id=user_id,
+            profile_id=profile_id,
+            run_after=datetime.now(timezone.utc),
+        )
+    )
+
+
+@router.post("", response_model=ReadingPreviewOut)
+async def preview_reading(
+    data: ReadingPreviewRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> ReadingPreviewOut:
+    profile = await get_active_learning_profile(user.id, db, require_onboarding=True)
+    target_words_requested = max(1, min(int(data.target_words or 0), 50))
+    days = max(1, min(int(data.days or DEFAULT_DAYS), 30))
+    variant = max(0, int(data.variant or 0))
+
+    recommendations = await load_recommendations(profile, target_words_requested, days, db)
+    bundles = recommendations.get("bundles") or []
+    if not bundles:
+        return ReadingPreviewOut(
+            target_words_requested=target_words_requested,
+            target_words=recommendations.get("target_words") or 0,
+            message=recommendations.get("message"),
+        )
+
+    chosen = bundles[variant % len(bundles)]
     return ReadingPreviewOut(
-        title=source_titles[0] if source_titles else "",
-        text=passage_text,
-        source_title=source_title,
-        source_titles=source_titles,
-        corpus_name=corpus_name,
-        corpus_names=corpus_names,
-        passage_ids=[item.id for item in selected_passages],
-        word_count=word_count,
-        target_words=len(target_tokens),
+        **chosen,
+        target_words=recommendations.get("target_words") or 0,
         target_words_requested=target_words_requested,
-        hits=hits,
-        coverage=coverage,
-        highlight_tokens=highlight_tokens,
+    )
+
+
+@router.get("/search", response_model=ReadingSearchOut)
+async def search_reading(
+    q: str,
+    lang: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> ReadingSearchOut:
+    profile = await get_active_learning_profile(user.id, db, require_onboarding=True)
+    if limit < 1 or limit > 50:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
+    lang = (lang or profile.target_lang or "").strip().lower()
+    if len(lang) != 2:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid lang")
+    after = decode_cursor(cursor, 2)
+    if after is not None and not (isinstance(after[0], (int, float)) and isinstance(after[1], int)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    q = q.strip()
+    if not q:
+        return ReadingSearchOut(items=[])
+
+    config = cast(search_config(lang), REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, q)
+    rank = func.ts_rank_cd(ReadingPassage.search_vector, tsquery)
+    page_stmt = (
+        select(
+            ReadingPassage.id,
+            ReadingPassage.source_id,
+            ReadingPassage.position,
+            rank.label("rank"),
+        )
+        .join(ReadingSource, ReadingSource.id == ReadingPassage.source_id)
+        .where(
+            ReadingSource.lang == lang,
+            ReadingPassage.search_vector.bool_op("@@")(tsquery),
+        )
+        .order_by(rank.desc(), ReadingPassage.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        page_stmt = page_stmt.where(keyset_filter([(rank, True), (ReadingPassage.id, False)], after))
+    page = page_stmt.subquery()
+
+    # ts_headline re-parses the text, so it only runs for the rows of this page.
+    result = await db.execute(
+        select(
+            page.c.id,
+            page.c.source_id,
+            page.c.position,
+            page.c.rank,
+            ReadingSource.title,
+            func.ts_headline(config, ReadingPassage.text, tsquery, SEARCH_HEADLINE_OPTIONS).label("headline"),
+            ReadingPassageBlock.passage_id.is_not(None).label("blocked"),
+        )
+        .join(ReadingPassage, ReadingPassage.id == page.c.id)
+        .join(ReadingSource, ReadingSource.id == page.c.source_id)
+        .outerjoin(
+            ReadingPassageBlock,
+            (ReadingPassageBlock.passage_id == page.c.id) & (ReadingPassageBlock.profile_id == profile.id),
+        )
+        .order_by(page.c.rank.desc(), page.c.id)
+    )
+    rows = result.fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].rank, rows[-1].id])
+    return ReadingSearchOut(
+        items=[
+            ReadingSearchItem(
+                id=row.id,
+                source_id=row.source_id,
+                source_title=row.title,
+                position=row.position,
+                headline=row.headline,
+                rank=row.rank,
+                blocked=row.blocked,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
     )
 
 
@@ -366,12 +529,20 @@ async def flag_reading(
     if not passage_ids:
         return ReadingFlagOut(blocked=0)
 
+    # Ids from a stale client or cache may point at passages a re-import removed; blocking those
+    # would only trip the foreign key.
+    existing = await db.execute(select(ReadingPassage.id).where(ReadingPassage.id.in_(set(passage_ids))))
     values = [
         {"profile_id": profile.id, "user_id": user.id, "passage_id": passage_id}
-        for passage_id in set(passage_ids)
+        for passage_id in existing.scalars().all()
     ]
+    if not values:
+        return ReadingFlagOut(blocked=0)
     stmt = insert(ReadingPassageBlock).values(values)
     stmt = stmt.on_conflict_do_nothing(index_elements=["profile_id", "passage_id"])
     result = await db.execute(stmt)
+    await db.execute(
+        delete(ReadingRecommendationCache).where(ReadingRecommendationCache.profile_id == profile.id)
+    )
     await db.commit()
     return ReadingFlagOut(blocked=result.rowcount or 0)
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import get_active_learning_profile, get_current_user
 from app.core.audit import log_audit_event
 from app.core.config import ADMIN_EMAILS, ADMIN_TELEGRAM_CHAT_IDS
+from app.core.corpus_versions import active_entries
 from app.db.session import get_db
 from app.models import (
     BackgroundJob,
@@ -180,6 +181,7 @@ async def resolve_corpus_id(
                 UserCorpus.profile_id == profile_id,
                 UserCorpus.enabled.is_(True),
                 CorpusEntryTerm.word_id == word_id,
+                active_entries(),
             )
             .order_by(CorpusEntry.rank.asc().nulls_last(), CorpusEntry.count.desc())
             .limit(1)
@@ -193,7 +195,7 @@ async def resolve_corpus_id(
         select(CorpusEntry.corpus_id)
         .select_from(CorpusEntryTerm)
         .join(CorpusEntry, CorpusEntry.id == CorpusEntryTerm.entry_id)
-        .where(CorpusEntryTerm.word_id == word_id)
+        .where(CorpusEntryTerm.word_id == word_id, active_entries())
         .order_by(CorpusEntry.count.desc())
         .limit(1)
     )
@@ -5,7 +5,7 @@ import re
 from datetime import date, datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy import Date, Integer, and_, case, cast, func, or_, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
@@ -13,6 +13,7 @@ from sqlalchemy.orm import aliased
 from app.api.auth import get_active_learning_profile, get_current_user
 from app.core.audit import log_audit_event
 from app.core.config import ADMIN_EMAILS
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
 from app.db.session import get_db
 from app.models import (
     ChatMessage,
@@ -50,6 +51,7 @@ from app.schemas.social import (
     LeaderboardEntryOut,
     OperationStatusOut,
     PublicProfileOut,
+    PublicProfileSearchOut,
     PublicProfileSummaryOut,
     PublicProfileUpdateRequest,
     PublicProfileViewOut,
@@ -451,51 +453,99 @@ async def following(
     ]
 
 
-@router.get("/search", response_model=list[PublicProfileSummaryOut])
+@router.get("/search", response_model=PublicProfileSearchOut)
 async def search_profiles(
     query: str,
+    limit: int = 20,
+    cursor: str | None = None,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[PublicProfileSummaryOut]:
+) -> PublicProfileSearchOut:
+    if limit < 1 or limit > 50:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
     query = (query or "").strip().lower()
     if len(query) < 2:
-        return []
+        return PublicProfileSearchOut(items=[], next_cursor=None)
+    after = decode_cursor(cursor, 3)
+
+    # Expressions match the trigram indexes on user_public_profiles.
+    handle = UserPublicProfile.handle
+    display_name = func.lower(UserPublicProfile.display_name)
+    boost = case(
+        (handle.startswith(query, autoescape=True), 2),
+        (display_name.startswith(query, autoescape=True), 1),
+        else_=0,
+    )
+    score = func.greatest(
+        func.similarity(handle, query),
+        func.coalesce(func.similarity(display_name, query), 0),
+    )
+    ranked = (
+        select(
+            UserPublicProfile.user_id,
+            handle.label("handle"),
+            UserPublicProfile.display_name,
+            boost.label("boost"),
+            score.label("score"),
+        )
+        .where(
+            UserPublicProfile.is_public.is_(True),
+            or_(
+                handle.contains(query, autoescape=True),
+                display_name.contains(query, autoescape=True),
+                handle.op("%")(query),
+                display_name.op("%")(query),
+            ),
+        )
+        .subquery()
+    )
 
     stmt = (
         select(
-            UserPublicProfile.handle,
-            UserPublicProfile.display_name,
+            ranked.c.handle,
+            ranked.c.display_name,
+            ranked.c.boost,
+            ranked.c.score,
             UserProfile.avatar_url,
             UserFollow.follower_id,
         )
-        .join(UserProfile, UserProfile.user_id == UserPublicProfile.user_id)
+        .select_from(ranked)
+        .join(UserProfile, UserProfile.user_id == ranked.c.user_id)
         .outerjoin(
             UserFollow,
             and_(
                 UserFollow.follower_id == user.id,
-                UserFollow.followee_id == UserPublicProfile.user_id,
-            ),
-        )
-        .where(
-            UserPublicProfile.is_public.is_(True),
-            or_(
-                UserPublicProfile.handle.ilike(f"%{query}%"),
-                UserPublicProfile.display_name.ilike(f"%{query}%"),
+                UserFollow.followee_id == ranked.c.user_id,
             ),
         )
-        .order_by(UserPublicProfile.handle)
-        .limit(20)
     )
-    rows = (await db.execute(stmt)).all()
-    return [
-        PublicProfileSummaryOut(
-            handle=row.handle,
-            display_name=row.display_name,
-            avatar_url=row.avatar_url,
-            is_following=row.follower_id is not None,
+    if after is not None:
+        stmt = stmt.where(
+            keyset_filter(
+                [(ranked.c.boost, True), (ranked.c.score, True), (ranked.c.handle, False)],
+                after,
+            )
         )
-        for row in rows
-    ]
+    stmt = stmt.order_by(ranked.c.boost.desc(), ranked.c.score.desc(), ranked.c.handle).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([int(last.boost), float(last.score), last.handle])
+    return PublicProfileSearchOut(
+        items=[
+            PublicProfileSummaryOut(
+                handle=row.handle,
+                display_name=row.display_name,
+                avatar_url=row.avatar_url,
+                is_following=row.follower_id is not None,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/leaderboard", response_model=list[LeaderboardEntryOut])
@@ -559,46 +609,251 @@ async def list_challenges() -> list[ChallengeOut]:
     ]
 
 
-async def compute_challenge_progress(
-    challenge_key: str,
-    profile_id,
-    started_at: datetime,
-    ends_at: datetime,
-    db: AsyncSession,
-) -> int:
-    definition = CHALLENGES.get(challenge_key)
+def challenge_keys_of_type(challenge_type: str) -> list[str]:
+    return [key for key, value in CHALLENGES.items() if value["type"] == challenge_type]
+
+
+def challenge_progress_stmt(challenge_type: str, windows):
+    # windows: subquery with window_key, profile_id, started_at, ends_at columns.
+    period_end = func.least(windows.c.ends_at, func.now())
+
+    if challenge_type == "learn_words":
+        return (
+            select(windows.c.window_key, func.count(UserWord.word_id).label("progress"))
+            .select_from(windows)
+            .join(
+                UserWord,
+                and_(
+                    UserWord.profile_id == windows.c.profile_id,
+                    UserWord.learned_at >= windows.c.started_at,
+                    UserWord.learned_at <= period_end,
+                ),
+            )
+            .group_by(windows.c.window_key)
+        )
+
+    if challenge_type == "streak":
+        day = cast(StudySession.started_at, Date)
+        days = (
+            select(windows.c.window_key, day.label("day"))
+            .select_from(windows)
+            .join(
+                StudySession,
+                and_(
+                    StudySession.profile_id == windows.c.profile_id,
+                    StudySession.started_at >= windows.c.started_at,
+                    StudySession.started_at <= period_end,
+                ),
+            )
+            .group_by(windows.c.window_key, day)
+            .subquery()
+        )
+        # Gaps and islands: consecutive days share the same `day - row_number`.
+        row_number = func.row_number().over(partition_by=days.c.window_key, order_by=days.c.day)
+        islands = select(
+            days.c.window_key,
+            days.c.day,
+            (days.c.day - cast(row_number, Integer)).label("island"),
+        ).subquery()
+        runs = (
+            select(
+                islands.c.window_key,
+                func.count().label("length"),
+                func.max(islands.c.day).label("last_day"),
+            )
+            .group_by(islands.c.window_key, islands.c.island)
+            .subquery()
+        )
+        return (
+            select(runs.c.window_key, runs.c.length.label("progress"))
+            .distinct(runs.c.window_key)
+            .order_by(runs.c.window_key, runs.c.last_day.desc())
+        )
+
+    return None
+
+
+async def compute_progress_for_windows(challenge_type: str, windows, db: AsyncSession) -> dict:
+    stmt = challenge_progress_stmt(challenge_type, windows)
+    if stmt is None:
+        return {}
+    rows = (await db.execute(stmt)).all()
+    return {row[0]: int(row[1] or 0) for row in rows}
+
+
+def group_progress_windows(group_id: int):
+    return (
+        select(
+            GroupChallengeMember.profile_id.label("window_key"),
+            GroupChallengeMember.profile_id,
+            GroupChallenge.started_at,
+            GroupChallenge.ends_at,
+        )
+        .join(GroupChallenge, GroupChallenge.id == GroupChallengeMember.group_id)
+        .where(GroupChallengeMember.group_id == group_id)
+        .subquery()
+    )
+
+
+async def compute_group_progress(group: GroupChallenge, db: AsyncSession) -> dict:
+    definition = CHALLENGES.get(group.challenge_key)
     if not definition:
-        return 0
-    now = datetime.now(timezone.utc)
-    period_end = min(now, ends_at)
-    if definition["type"] == "learn_words":
-        result = await db.execute(
-            select(func.count())
-            .select_from(UserWord)
+        return {}
+    return await compute_progress_for_windows(definition["type"], group_progress_windows(group.id), db)
+
+
+def challenge_target_expr(key_column):
+    return case(
+        {key: value["target"] for key, value in CHALLENGES.items()},
+        value=key_column,
+        else_=0,
+    )
+
+
+def challenge_progress_update(model, key_column, learned: int, today: date):
+    streak_value = case(
+        (model.last_activity_on == today, model.progress),
+        (model.last_activity_on == today - timedelta(days=1), model.progress + 1),
+        else_=1,
+    )
+    return case(
+        (key_column.in_(challenge_keys_of_type("streak")), streak_value),
+        (key_column.in_(challenge_keys_of_type("learn_words")), model.progress + learned),
+        else_=model.progress,
+    )
+
+
+async def record_challenge_activity(profile_id, learned: int, now: datetime, db: AsyncSession) -> None:
+    today = now.date()
+    await db.execute(
+        update(UserChallenge)
+        .where(
+            UserChallenge.profile_id == profile_id,
+            UserChallenge.status == "active",
+            UserChallenge.started_at <= now,
+            UserChallenge.ends_at >= now,
+        )
+        .values(
+            progress=challenge_progress_update(UserChallenge, UserChallenge.challenge_key, learned, today),
+            last_activity_on=today,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(UserChallenge)
+        .where(
+            UserChallenge.profile_id == profile_id,
+            UserChallenge.status == "active",
+            UserChallenge.progress >= challenge_target_expr(UserChallenge.challenge_key),
+        )
+        .values(status="completed", completed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(GroupChallengeMember)
+        .where(
+            GroupChallengeMember.profile_id == profile_id,
+            GroupChallengeMember.group_id == GroupChallenge.id,
+            GroupChallenge.status == "active",
+            GroupChallenge.started_at <= now,
+            GroupChallenge.ends_at >= now,
+        )
+        .values(
+            progress=challenge_progress_update(
+                GroupChallengeMember,
+                GroupChallenge.challenge_key,
+                learned,
+                today,
+            ),
+            last_activity_on=today,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def settle_user_challenges(now: datetime, db: AsyncSession) -> int:
+    # Recount expiring challenges exactly before their final status is decided.
+    for challenge_type in ("learn_words", "streak"):
+        windows = (
+            select(
+                UserChallenge.id.label("window_key"),
+                UserChallenge.profile_id,
+                UserChallenge.started_at,
+                UserChallenge.ends_at,
+            )
             .where(
-                UserWord.profile_id == profile_id,
-                UserWord.learned_at.is_not(None),
-                UserWord.learned_at >= started_at,
-                UserWord.learned_at <= period_end,
+                UserChallenge.status == "active",
+                UserChallenge.ends_at < now,
+                UserChallenge.challenge_key.in_(challenge_keys_of_type(challenge_type)),
             )
+            .subquery()
+        )
+        recount = challenge_progress_stmt(challenge_type, windows).subquery()
+        await db.execute(
+            update(UserChallenge)
+            .where(UserChallenge.id == recount.c.window_key)
+            .values(progress=func.greatest(UserChallenge.progress, recount.c.progress))
+            .execution_options(synchronize_session=False)
+        )
+
+    completed = await db.execute(
+        update(UserChallenge)
+        .where(
+            UserChallenge.status == "active",
+            UserChallenge.progress >= challenge_target_expr(UserChallenge.challenge_key),
         )
-        return int(result.scalar() or 0)
+        .values(status="completed", completed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    expired = await db.execute(
+        update(UserChallenge)
+        .where(UserChallenge.status == "active", UserChallenge.ends_at < now)
+        .values(status="expired")
+        .execution_options(synchronize_session=False)
+    )
+    return int(completed.rowcount or 0) + int(expired.rowcount or 0)
 
-    if definition["type"] == "streak":
-        day_bucket = func.date_trunc("day", StudySession.started_at)
-        session_result = await db.execute(
-            select(day_bucket)
+
+async def settle_group_challenges(now: datetime, db: AsyncSession) -> int:
+    groups = (
+        await db.execute(
+            select(GroupChallenge.id, GroupChallenge.challenge_key).where(
+                GroupChallenge.status == "active",
+                GroupChallenge.ends_at < now,
+            )
+        )
+    ).all()
+    for group_id, challenge_key in groups:
+        definition = CHALLENGES.get(challenge_key)
+        if not definition:
+            continue
+        recount = challenge_progress_stmt(definition["type"], group_progress_windows(group_id)).subquery()
+        await db.execute(
+            update(GroupChallengeMember)
             .where(
-                StudySession.profile_id == profile_id,
-                StudySession.started_at >= started_at,
-                StudySession.started_at <= period_end,
+                GroupChallengeMember.group_id == group_id,
+                GroupChallengeMember.profile_id == recount.c.window_key,
             )
-            .group_by(day_bucket)
+            .values(progress=func.greatest(GroupChallengeMember.progress, recount.c.progress))
+            .execution_options(synchronize_session=False)
         )
-        days = [row[0].date() for row in session_result.fetchall()]
-        streak_current, _best = compute_streaks(days)
-        return streak_current
-    return 0
+    if not groups:
+        return 0
+    await db.execute(
+        update(GroupChallenge)
+        .where(GroupChallenge.id.in_([group_id for group_id, _key in groups]))
+        .values(status="expired")
+        .execution_options(synchronize_session=False)
+    )
+    return len(groups)
+
+
+async def sweep_challenges(db: AsyncSession) -> int:
+    now = datetime.now(timezone.utc)
+    changed = await settle_user_challenges(now, db)
+    changed += await settle_group_challenges(now, db)
+    await db.commit()
+    return changed
 
 
 @router.post("/challenges/start", response_model=UserChallengeOut)
@@ -667,29 +922,11 @@ async def my_challenges(
         )
     ).scalars().all()
 
-    now = datetime.now(timezone.utc)
-    updated = False
     results: list[UserChallengeOut] = []
     for row in rows:
         definition = CHALLENGES.get(row.challenge_key)
         if not definition:
             continue
-        progress = await compute_challenge_progress(
-            row.challenge_key,
-            profile.id,
-            row.started_at,
-            row.ends_at,
-            db,
-        )
-        if row.status == "active":
-            if progress >= definition["target"]:
-                row.status = "completed"
-                row.completed_at = now
-                updated = True
-            elif now > row.ends_at:
-                row.status = "expired"
-                updated = True
-
         results.append(
             UserChallengeOut(
                 id=row.id,
@@ -698,15 +935,12 @@ async def my_challenges(
                 started_at=row.started_at,
                 ends_at=row.ends_at,
                 completed_at=row.completed_at,
-                progress=progress,
+                progress=row.progress,
                 target=definition["target"],
                 title=ChallengeTextOut(**definition["title"]),
                 description=ChallengeTextOut(**definition["description"]),
             )
         )
-
-    if updated:
-        await db.commit()
     return results
 
 
@@ -1435,20 +1669,13 @@ async def group_challenge_detail(
     member_rows = (await db.execute(members_stmt)).all()
     members: list[GroupChallengeMemberOut] = []
     for member, public_profile, user_profile in member_rows:
-        progress = await compute_challenge_progress(
-            group.challenge_key,
-            member.profile_id,
-            group.started_at,
-            group.ends_at,
-            db,
-        )
         actor = build_actor(member.user_id, public_profile, user_profile)
         members.append(
             GroupChallengeMemberOut(
                 handle=actor.handle,
                 display_name=actor.display_name,
                 avatar_url=actor.avatar_url,
-                progress=progress,
+                progress=member.progress,
                 target=definition["target"],
             )
         )
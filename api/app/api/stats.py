@@ -210,7 +210,10 @@ async def review_plan(
             )
             .select_from(CorpusEntryTerm)
             .join(CorpusEntry, CorpusEntry.id == CorpusEntryTerm.entry_id)
-            .join(Corpus, Corpus.id == CorpusEntry.corpus_id)
+            .join(
+                Corpus,
+                (Corpus.id == CorpusEntry.corpus_id) & (Corpus.active_version == CorpusEntry.version),
+            )
             .where(CorpusEntryTerm.word_id.in_(word_ids))
         )
         seen_corpora: dict[int, set[str]] = {}
@@ -12,8 +12,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
 from app.api.auth import get_active_learning_profile, get_current_user
+from app.api.reading import queue_reading_refresh
+from app.api.social import record_challenge_activity
 from app.db.session import get_db
 from app.core.audit import log_audit_event
+from app.core.corpus_versions import active_entries
 from app.models import (
     Corpus,
     CorpusEntry,
@@ -478,7 +481,10 @@ async def build_reading_block(
         .select_from(CorpusEntryTerm)
         .join(CorpusEntry, CorpusEntry.id == CorpusEntryTerm.entry_id)
         .join(UserCorpus, UserCorpus.corpus_id == CorpusEntry.corpus_id)
-        .join(Corpus, Corpus.id == CorpusEntry.corpus_id)
+        .join(
+            Corpus,
+            (Corpus.id == CorpusEntry.corpus_id) & (Corpus.active_version == CorpusEntry.version),
+        )
         .where(
             UserCorpus.profile_id == profile_id,
             UserCorpus.enabled.is_(True),
@@ -593,7 +599,7 @@ async def fetch_corpus_words(
             UserWord,
             and_(UserWord.profile_id == profile_id, UserWord.word_id == source_term.word_id),
         )
-        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True))
+        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True), active_entries())
         .where(
             exists(
                 select(1).where(
@@ -880,6 +886,7 @@ async def fetch_user_translation_map(
             source_term.word_id.in_(word_ids),
             UserCorpus.profile_id == profile_id,
             UserCorpus.enabled.is_(True),
+            active_entries(),
         )
         .order_by(source_term.word_id, target_word.lemma.asc())
     )
@@ -1002,7 +1009,7 @@ async def seed_review_words(
             UserWord,
             and_(UserWord.profile_id == profile_id, UserWord.word_id == source_term.word_id),
         )
-        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True))
+        .where(UserCorpus.profile_id == profile_id, UserCorpus.enabled.is_(True), active_entries())
         .where(
             exists(
                 select(1).where(
@@ -1215,6 +1222,9 @@ async def submit_learn(
             db,
         )
 
+    await record_challenge_activity(profile.id, learned, now, db)
+    if learned:
+        await queue_reading_refresh(profile.id, user.id, db)
     await db.commit()
 
     await log_audit_event(
@@ -1445,6 +1455,7 @@ async def submit_review(
         db,
     )
 
+    await record_challenge_activity(profile.id, 0, now, db)
     await db.commit()
 
     await log_audit_event(
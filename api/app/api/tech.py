@@ -227,6 +227,22 @@ async def list_jobs(
     return [build_job_out(job) for job in result.scalars().all()]
 
 
+@router.get("/jobs/{job_id}", response_model=BackgroundJobOut)
+async def get_job(
+    job_id: int,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> BackgroundJobOut:
+    # Polled by clients of queued imports; running jobs keep their progress in result.
+    result = await db.execute(
+        select(BackgroundJob).where(BackgroundJob.id == job_id, BackgroundJob.user_id == user.id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return build_job_out(job)
+
+
 @router.get("/audit", response_model=list[AuditLogOut])
 async def list_audit_logs(
     limit: int = 50,
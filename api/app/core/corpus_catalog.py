@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+from sqlalchemy import delete, distinct, func, insert, select, update
+from sqlalchemy.orm import aliased
+
+from app.core.corpus_versions import active_entries
+from app.models import Corpus, CorpusEntry, CorpusEntryTerm, CorpusLangCount
+
+RESPONSE_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class CatalogCorpus:
+    id: int
+    slug: str
+    name: str
+    name_ru: str | None
+    name_en: str | None
+    content_version: int = 1
+    counts: dict[tuple[str, str], int] = field(default_factory=dict)
+
+    def words_total(self, source_lang: str | None, target_lang: str | None) -> int:
+        matching = [
+            total
+            for (source, target), total in self.counts.items()
+            if (source_lang is None or source == source_lang)
+            and (target_lang is None or target == target_lang)
+        ]
+        # Entries usually carry terms in both langs, so the widest direction stands in for a partial filter.
+        return max(matching, default=0)
+
+
+_catalog: list[CatalogCorpus] | None = None
+_catalog_stamp: tuple[int, int] | None = None
+_responses: OrderedDict[Hashable, Any] = OrderedDict()
+
+
+def invalidate_corpus_catalog() -> None:
+    global _catalog, _catalog_stamp
+    _catalog = None
+    _catalog_stamp = None
+
+
+def cached_response(key: Hashable) -> Any | None:
+    # Keys embed the corpus content_version, so a bump simply stops old entries from matching.
+    value = _responses.get(key)
+    if value is not None:
+        _responses.move_to_end(key)
+    return value
+
+
+def store_response(key: Hashable, value: Any) -> None:
+    _responses[key] = value
+    _responses.move_to_end(key)
+    while len(_responses) > RESPONSE_CACHE_SIZE:
+        _responses.popitem(last=False)
+
+
+async def bump_content_versions(db, corpus_ids: list[int] | None = None) -> None:
+    stmt = update(Corpus).values(content_version=Corpus.content_version + 1)
+    if corpus_ids is not None:
+        if not corpus_ids:
+            return
+        stmt = stmt.where(Corpus.id.in_(corpus_ids))
+    await db.execute(stmt.execution_options(synchronize_session=False))
+
+
+async def refresh_corpus_counts(db, corpus_ids: list[int] | None = None) -> None:
+    # A direction counts an entry once it has a primary source term and any term in the target lang.
+    source_term = aliased(CorpusEntryTerm)
+    target_term = aliased(CorpusEntryTerm)
+    counts = (
+        select(
+            CorpusEntry.corpus_id,
+            source_term.lang,
+            target_term.lang,
+            func.count(distinct(CorpusEntry.id)),
+        )
+        .join(
+            source_term,
+            (source_term.entry_id == CorpusEntry.id) & source_term.is_primary.is_(True),
+        )
+        .join(
+            target_term,
+            (target_term.entry_id == CorpusEntry.id) & (target_term.lang != source_term.lang),
+        )
+        .where(active_entries())
+        .group_by(CorpusEntry.corpus_id, source_term.lang, target_term.lang)
+    )
+    cleanup = delete(CorpusLangCount)
+    if corpus_ids is not None:
+        if not corpus_ids:
+            return
+        counts = counts.where(CorpusEntry.corpus_id.in_(corpus_ids))
+        cleanup = cleanup.where(CorpusLangCount.corpus_id.in_(corpus_ids))
+
+    await db.execute(cleanup)
+    await db.execute(
+        insert(CorpusLangCount).from_select(
+            ["corpus_id", "source_lang", "target_lang", "words_total"],
+            counts,
+        )
+    )
+
+
+async def mark_corpora_changed(db, corpus_ids: list[int] | None = None) -> None:
+    await bump_content_versions(db, corpus_ids)
+    await refresh_corpus_counts(db, corpus_ids)
+
+
+async def word_corpus_ids(db, word_id: int) -> list[int]:
+    result = await db.execute(
+        select(distinct(CorpusEntry.corpus_id))
+        .join(CorpusEntryTerm, CorpusEntryTerm.entry_id == CorpusEntry.id)
+        .where(CorpusEntryTerm.word_id == word_id)
+    )
+    return [row[0] for row in result.fetchall()]
+
+
+async def sync_corpus_catalog(db, corpus_ids: list[int] | None = None, counts: bool = True) -> None:
+    if counts:
+        await mark_corpora_changed(db, corpus_ids)
+    else:
+        await bump_content_versions(db, corpus_ids)
+    await db.commit()
+    invalidate_corpus_catalog()
+
+
+async def corpus_content_version(db, corpus_id: int) -> int | None:
+    result = await db.execute(select(Corpus.content_version).where(Corpus.id == corpus_id))
+    return result.scalar_one_or_none()
+
+
+async def load_corpus_catalog(db) -> list[CatalogCorpus]:
+    global _catalog, _catalog_stamp
+    # Import scripts run in other processes, so the cache is checked against a cheap stamp
+    # over the corpora rows instead of relying on in-process invalidation alone.
+    stamp_result = await db.execute(
+        select(func.count(Corpus.id), func.coalesce(func.sum(Corpus.content_version), 0))
+    )
+    count, version_sum = stamp_result.one()
+    stamp = (int(count), int(version_sum))
+    if _catalog is not None and _catalog_stamp == stamp:
+        return _catalog
+
+    corpora_result = await db.execute(
+        select(
+            Corpus.id,
+            Corpus.slug,
+            Corpus.name,
+            Corpus.name_ru,
+            Corpus.name_en,
+            Corpus.content_version,
+        ).order_by(Corpus.name)
+    )
+    counts_result = await db.execute(
+        select(
+            CorpusLangCount.corpus_id,
+            CorpusLangCount.source_lang,
+            CorpusLangCount.target_lang,
+            CorpusLangCount.words_total,
+        )
+    )
+    counts: dict[int, dict[tuple[str, str], int]] = {}
+    for corpus_id, source_lang, target_lang, words_total in counts_result.fetchall():
+        counts.setdefault(corpus_id, {})[(source_lang, target_lang)] = words_total
+
+    _catalog = [
+        CatalogCorpus(
+            id=row.id,
+            slug=row.slug,
+            name=row.name,
+            name_ru=row.name_ru,
+            name_en=row.name_en,
+            content_version=row.content_version,
+            counts=counts.get(row.id, {}),
+        )
+        for row in corpora_result.fetchall()
+    ]
+    _catalog_stamp = stamp
+    return _catalog
+
+
+def catalog_etag(catalog: list[CatalogCorpus]) -> str:
+    versions = ",".join(f"{item.id}:{item.content_version}" for item in sorted(catalog, key=lambda item: item.id))
+    return f'"catalog-{hashlib.sha1(versions.encode("ascii")).hexdigest()[:16]}"'
+
+
+def corpus_etag(kind: str, corpus_id: int, content_version: int) -> str:
+    return f'"{kind}-{corpus_id}-{content_version}"'
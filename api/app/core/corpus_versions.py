@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, func, select, tuple_, update
+
+from app.models import Corpus, CorpusEntry
+
+GC_BATCH_SIZE = 5000
+
+
+def active_entries(entry=CorpusEntry):
+    # Imports stage a new version next to the live one, so readers only see the version
+    # their corpus points at and switching is a single-row update of corpora.active_version.
+    return tuple_(entry.corpus_id, entry.version).in_(select(Corpus.id, Corpus.active_version))
+
+
+def entry_active_version():
+    return select(Corpus.active_version).where(Corpus.id == CorpusEntry.corpus_id).scalar_subquery()
+
+
+async def active_version(db, corpus_id: int) -> int | None:
+    return await db.scalar(select(Corpus.active_version).where(Corpus.id == corpus_id))
+
+
+async def next_version(db, corpus_id: int) -> int:
+    current = await active_version(db, corpus_id) or 0
+    highest = await db.scalar(select(func.max(CorpusEntry.version)).where(CorpusEntry.corpus_id == corpus_id))
+    return max(current, highest or 0) + 1
+
+
+async def activate_version(db, corpus_id: int, version: int) -> None:
+    await db.execute(
+        update(Corpus)
+        .where(Corpus.id == corpus_id)
+        .values(active_version=version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def delete_entries_in_batches(db, condition, batch_size: int = GC_BATCH_SIZE) -> int:
+    # Terms follow their entries through ON DELETE CASCADE; each batch is its own transaction.
+    removed = 0
+    while True:
+        batch = select(CorpusEntry.id).where(condition).limit(batch_size)
+        result = await db.execute(
+            delete(CorpusEntry).where(CorpusEntry.id.in_(batch)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        removed += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return removed
+
+
+async def collect_retired_versions(db, corpus_ids: list[int] | None = None, batch_size: int = GC_BATCH_SIZE) -> int:
+    # Only versions older than the active one: newer ones may be an import still staging.
+    condition = CorpusEntry.version < entry_active_version()
+    if corpus_ids is not None:
+        if not corpus_ids:
+            return 0
+        condition = condition & CorpusEntry.corpus_id.in_(corpus_ids)
+    return await delete_entries_in_batches(db, condition, batch_size)
+
+
+async def discard_staged_versions(db, corpus_ids: list[int], batch_size: int = GC_BATCH_SIZE) -> int:
+    # Versions above the active one belong to an import that failed validation or was interrupted.
+    if not corpus_ids:
+        return 0
+    condition = CorpusEntry.corpus_id.in_(corpus_ids) & (CorpusEntry.version > entry_active_version())
+    return await delete_entries_in_batches(db, condition, batch_size)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import string
+from typing import Iterable
+
+# Share of a string's letters that must be in one script for it to count as that language.
+DEFAULT_MIN_SHARE = 0.8
+# Plain majority of letters, as the SQLite word importer has always classified pairs.
+MAJORITY_SHARE = 0.5
+
+_LATIN_BYTES = string.ascii_letters.encode("ascii")
+# In UTF-8 the lead bytes 0xD0-0xD3 start exactly the code points U+0400-U+04FF and never occur
+# as continuation bytes, so counting them counts Cyrillic letters without decoding anything.
+_NOT_CYRILLIC_LEAD = bytes(value for value in range(256) if not 0xD0 <= value <= 0xD3)
+
+
+def letter_counts(text: str) -> tuple[int, int]:
+    # (latin, cyrillic) in one encode plus byte-level deletes; ASCII-only strings skip the Cyrillic count.
+    data = text.encode("utf-8", "surrogatepass")
+    latin = len(data) - len(data.translate(None, _LATIN_BYTES))
+    if len(data) == len(text):
+        return latin, 0
+    return latin, len(data.translate(None, _NOT_CYRILLIC_LEAD))
+
+
+def classify_counts(latin: int, cyrillic: int, min_share: float = DEFAULT_MIN_SHARE) -> str | None:
+    total = latin + cyrillic
+    if not total:
+        return None
+    if latin > cyrillic and latin / total >= min_share:
+        return "en"
+    if cyrillic > latin and cyrillic / total >= min_share:
+        return "ru"
+    return None
+
+
+def detect_lang(text: str | None, min_share: float = DEFAULT_MIN_SHARE) -> str | None:
+    if not text:
+        return None
+    return classify_counts(*letter_counts(text), min_share)
+
+
+def detect_langs(texts: Iterable[str | None], min_share: float = DEFAULT_MIN_SHARE) -> list[str | None]:
+    # detect_lang for every item, with the per-call overhead hoisted out of the loop.
+    latin_bytes = _LATIN_BYTES
+    not_cyrillic_lead = _NOT_CYRILLIC_LEAD
+    langs: list[str | None] = []
+    append = langs.append
+    for text in texts:
+        if not text:
+            append(None)
+            continue
+        data = text.encode("utf-8", "surrogatepass")
+        size = len(data)
+        latin = size - len(data.translate(None, latin_bytes))
+        cyrillic = 0 if size == len(text) else len(data.translate(None, not_cyrillic_lead))
+        total = latin + cyrillic
+        if not total:
+            append(None)
+        elif latin > cyrillic and latin / total >= min_share:
+            append("en")
+        elif cyrillic > latin and cyrillic / total >= min_share:
+            append("ru")
+        else:
+            append(None)
+    return langs
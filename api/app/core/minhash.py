@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import zlib
+from array import array
+from typing import Hashable, Iterable
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+LSH_BANDS = 8
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# Estimated Jaccard similarity of word 5-gram sets above which two passages count as one.
+DUPLICATE_THRESHOLD = 0.8
+
+_PRIME = (1 << 31) - 1
+_rng = random.Random(20260212)
+# Fixed coefficients: signatures stored in the database must stay comparable across runs.
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingle_hashes(tokens: list[str]) -> set[int]:
+    if len(tokens) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {
+        zlib.crc32(" ".join(tokens[idx : idx + SHINGLE_SIZE]).encode("utf-8"))
+        for idx in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(tokens: list[str]) -> list[int]:
+    hashes = shingle_hashes(tokens)
+    if not hashes:
+        return [_PRIME] * NUM_PERM
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_band_keys(signature: list[int]) -> list[int]:
+    # The band number is part of the digest, so equal rows in different bands never collide.
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(array("i", [band, *rows]).tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def similarity(left: Iterable[int], right: Iterable[int]) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+class LshIndex:
+    # Band buckets narrow the candidates; the full signature comparison then decides.
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.buckets: dict[int, list[Hashable]] = {}
+        self.signatures: dict[Hashable, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def add(self, key: Hashable, signature: list[int], band_keys: list[int]) -> None:
+        self.signatures[key] = array("i", signature)
+        for band_key in band_keys:
+            self.buckets.setdefault(band_key, []).append(key)
+
+    def match(self, signature: list[int], band_keys: list[int]) -> tuple[Hashable, float] | None:
+        best = None
+        seen = set()
+        for band_key in band_keys:
+            for key in self.buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self.signatures[key])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
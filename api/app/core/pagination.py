@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_, select, text, tuple_
+
+COUNT_CAP = 10000
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> list[Any] | None:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(keys: list[tuple[Any, bool]], values: list[Any]):
+    # keys: (column, descending) pairs in ORDER BY order; values: the last row seen.
+    directions = {descending for _column, descending in keys}
+    if len(directions) == 1:
+        row = tuple_(*[column for column, _descending in keys])
+        after = tuple_(*values)
+        return row < after if directions.pop() else row > after
+
+    clauses = []
+    for idx, (column, descending) in enumerate(keys):
+        equal = [keys[prev][0] == values[prev] for prev in range(idx)]
+        clauses.append(and_(*equal, column < values[idx] if descending else column > values[idx]))
+    return or_(*clauses)
+
+
+async def estimate_count(db, table_name: str) -> int | None:
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": table_name},
+    )
+    value = result.scalar_one_or_none()
+    if value is None or value < 0:
+        return None
+    return int(value)
+
+
+async def capped_count(db, stmt, cap: int = COUNT_CAP) -> tuple[int, bool]:
+    limited = stmt.order_by(None).limit(cap + 1).subquery()
+    result = await db.execute(select(func.count()).select_from(limited))
+    total = int(result.scalar_one() or 0)
+    if total > cap:
+        return cap, False
+    return total, True
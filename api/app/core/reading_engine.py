@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import heapq
+from typing import Hashable, Iterable, Protocol
+
+from app.core.lang import letter_counts
+
+# Share of letters that must be in the passage language's script (at most 5% foreign letters).
+MIN_LANG_PURITY = 0.95
+SEARCH_CONFIGS = {"en": "english", "ru": "russian"}
+
+
+class PassageLike(Protocol):
+    id: int
+    source_id: int
+    position: int
+    word_count: int
+
+
+def passage_metrics(text: str, lang: str) -> tuple[float, float]:
+    # Returns (lang_purity, letter_ratio); stored on reading_passages at import time.
+    if not text:
+        return 0.0, 0.0
+    latin, cyrillic = letter_counts(text)
+    letters = latin + cyrillic
+    letter_ratio = letters / len(text)
+    if letters == 0:
+        return 0.0, letter_ratio
+    if lang == "en":
+        return latin / letters, letter_ratio
+    if lang == "ru":
+        return cyrillic / letters, letter_ratio
+    return 1.0, letter_ratio
+
+
+def search_config(lang: str | None) -> str:
+    # Postgres text search config for reading_passages.search_config.
+    return SEARCH_CONFIGS.get(lang or "", "simple")
+
+
+class ReadingIndex:
+    # Every distinct token of the candidate set gets one bit, so a passage becomes a
+    # Python int and set algebra turns into &, | and int.bit_count(). Tokens may be strings
+    # or reading_tokens ids.
+    def __init__(self, rows: Iterable[tuple[int, Hashable]]) -> None:
+        self.tokens: list[Hashable] = []
+        self.bits: dict[Hashable, int] = {}
+        positions: dict[int, list[int]] = {}
+        bits = self.bits
+        for passage_id, token in rows:
+            bit = bits.get(token)
+            if bit is None:
+                bit = bits[token] = len(self.tokens)
+                self.tokens.append(token)
+            positions.setdefault(passage_id, []).append(bit)
+
+        size = (len(self.tokens) + 7) // 8
+        self.masks: dict[int, int] = {}
+        for passage_id, passage_bits in positions.items():
+            buffer = bytearray(size)
+            for bit in passage_bits:
+                buffer[bit >> 3] |= 1 << (bit & 7)
+            self.masks[passage_id] = int.from_bytes(buffer, "little")
+
+    def mask(self, passage_id: int) -> int:
+        return self.masks.get(passage_id, 0)
+
+    def size(self, passage_id: int) -> int:
+        return self.mask(passage_id).bit_count()
+
+    def mask_of(self, tokens: Iterable[Hashable]) -> int:
+        mask = 0
+        for token in tokens:
+            bit = self.bits.get(token)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def tokens_of(self, mask: int) -> set[Hashable]:
+        tokens: set[Hashable] = set()
+        while mask:
+            low = mask & -mask
+            tokens.add(self.tokens[low.bit_length() - 1])
+            mask ^= low
+        return tokens
+
+
+def build_bundle(
+    base: PassageLike,
+    passages: list[PassageLike],
+    index: ReadingIndex,
+    max_words: int,
+) -> tuple[list[PassageLike], int, int]:
+    # Greedy cover: take the passage adding the most uncovered tokens, then the shorter one,
+    # then the earlier one in `passages`. Gains only shrink as coverage grows, so heap keys
+    # are upper bounds and a popped entry whose fresh key still beats the top is the pick.
+    selected = [base]
+    covered = index.mask(base.id)
+    total_words = base.word_count
+    uncovered = ~covered
+    heap = []
+    for order, passage in enumerate(passages):
+        if passage.id == base.id or total_words + passage.word_count > max_words:
+            continue
+        mask = index.mask(passage.id)
+        gain = (mask & uncovered).bit_count()
+        if gain:
+            heap.append((-gain, passage.word_count, order, passage, mask))
+    heapq.heapify(heap)
+
+    while heap:
+        _gain, word_count, order, passage, mask = heapq.heappop(heap)
+        # The budget only shrinks, so a passage that no longer fits is dropped for good.
+        if total_words + word_count > max_words:
+            continue
+        gain = (mask & ~covered).bit_count()
+        if not gain:
+            continue
+        key = (-gain, word_count, order)
+        if heap and key > heap[0][:3]:
+            heapq.heappush(heap, (*key, passage, mask))
+            continue
+        selected.append(passage)
+        covered |= mask
+        total_words += word_count
+
+    if len({item.source_id for item in selected}) == 1:
+        selected = sorted(selected, key=lambda item: item.position)
+    return selected, total_words, covered
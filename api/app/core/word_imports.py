@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Iterator, Sequence, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+# Imports with more non-empty lines than this are queued for run_jobs instead of running in the request.
+INLINE_MAX_LINES = 2000
+# Rows per INSERT; user_words has 13 columns, which keeps a batch far below the bind parameter limit.
+UPSERT_BATCH_SIZE = 1000
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+MAX_REPORTED_ERRORS = 100
+
+T = TypeVar("T")
+ProgressCallback = Callable[[dict], Awaitable[None]]
+
+
+@dataclass
+class ImportLine:
+    line: int
+    word: str
+    translation: str
+
+
+@dataclass
+class ImportReport:
+    # Line counters cover the raw text; the rest count unique words after deduplication.
+    total_lines: int = 0
+    parsed_lines: int = 0
+    invalid_lines: int = 0
+    total_words: int = 0
+    processed_words: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    words_missing: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, error: str) -> None:
+        # Only the first errors are kept, so a broken file cannot blow up the job result.
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_import_lines(text: str, normalize: Callable[[str], str]) -> tuple[list[ImportLine], ImportReport]:
+    # One "word - translation" pair per line; line numbers count blank lines too, as an editor would.
+    report = ImportReport()
+    lines: list[ImportLine] = []
+    for number, raw_line in enumerate(text.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        report.total_lines += 1
+        if "-" not in line:
+            report.invalid_lines += 1
+            report.add_error(number, "missing '-' separator")
+            continue
+        left, right = line.split("-", 1)
+        word = normalize(left)
+        translation = normalize(right)
+        if not word or not translation:
+            report.invalid_lines += 1
+            report.add_error(number, "empty word or translation")
+            continue
+        lines.append(ImportLine(line=number, word=word, translation=translation))
+    report.parsed_lines = len(lines)
+    return lines, report
+
+
+def should_queue(report: ImportReport) -> bool:
+    return report.total_lines > INLINE_MAX_LINES
+
+
+def chunked(items: Sequence[T], size: int = UPSERT_BATCH_SIZE) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def read_upload(request: Request, limit: int = MAX_UPLOAD_BYTES) -> str:
+    # Plain-text body read chunk by chunk, so an oversized upload is cut off before it is buffered.
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Upload is too large")
+        chunks.append(chunk)
+    try:
+        return b"".join(chunks).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload must be UTF-8 text")
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Iterable
+
+from sqlalchemy import text
+
+from app.db.bulk import copy_records
+from app.models import Word
+
+# Pairs per transaction for batch merges; each pair touches every table that references words.
+MERGE_BATCH_SIZE = 500
+STATUS_PRIORITY = {"known": 3, "learned": 2, "new": 1}
+
+# word_merge_map holds every word of the batch: sources point at their target and targets point
+# at themselves, so one join reaches all rows of a merge group. Statements below only read it.
+MAP_TABLE_SQL = (
+    "CREATE TEMP TABLE word_merge_map (word_id bigint PRIMARY KEY, target_id bigint NOT NULL) ON COMMIT DROP"
+)
+SOURCE_FILTER = "m.word_id <> m.target_id"
+
+
+def duplicates_sql(table: str, keys: tuple[str, ...]) -> str:
+    # Source rows that collide on `keys` once moved, each with the row that survives for that key:
+    # the target's own row when it has one, otherwise the oldest source row.
+    key_match = " AND ".join(f"k.{key} = s.{key}" for key in keys)
+    return f"""
+        SELECT DISTINCT ON (s.id) s.id, k.id AS keep_id
+        FROM {table} AS s
+        JOIN word_merge_map AS m ON m.word_id = s.word_id AND {SOURCE_FILTER}
+        JOIN word_merge_map AS g ON g.target_id = m.target_id
+        JOIN {table} AS k ON k.word_id = g.word_id AND {key_match}
+        WHERE g.word_id = g.target_id OR k.id < s.id
+        ORDER BY s.id, g.word_id <> g.target_id, k.id
+    """
+
+
+def move_sql(table: str, column: str = "word_id") -> str:
+    return f"""
+        UPDATE {table} AS t SET {column} = m.target_id
+        FROM word_merge_map AS m
+        WHERE t.{column} = m.word_id AND {SOURCE_FILTER}
+    """
+
+
+def delete_duplicates_sql(table: str, keys: tuple[str, ...]) -> str:
+    return f"DELETE FROM {table} AS t USING ({duplicates_sql(table, keys)}) AS d WHERE t.id = d.id"
+
+
+TRANSLATION_KEYS = ("target_lang", "translation")
+ENTRY_TERM_KEYS = ("entry_id",)
+CUSTOM_WORD_KEYS = ("profile_id", "target_lang")
+USER_TRANSLATION_KEYS = ("profile_id", "target_lang", "translation")
+
+REPORT_TRANSLATIONS_SQL = f"""
+    UPDATE content_reports AS r SET translation_id = d.keep_id
+    FROM ({duplicates_sql("translations", TRANSLATION_KEYS)}) AS d
+    WHERE r.translation_id = d.id
+"""
+
+PRIMARY_TERMS_SQL = f"""
+    UPDATE corpus_entry_terms AS k SET is_primary = true
+    FROM ({duplicates_sql("corpus_entry_terms", ENTRY_TERM_KEYS)}) AS d
+    JOIN corpus_entry_terms AS s ON s.id = d.id
+    WHERE k.id = d.keep_id AND s.is_primary AND NOT k.is_primary
+"""
+
+# Stats have no id: every source row is folded into the target's row, keeping the larger count
+# and the better rank, and then dropped.
+FOLD_STATS_SQL = f"""
+    INSERT INTO corpus_word_stats (corpus_id, word_id, count, rank)
+    SELECT s.corpus_id, m.target_id, max(coalesce(s.count, 0)), min(s.rank)
+    FROM corpus_word_stats AS s
+    JOIN word_merge_map AS m ON m.word_id = s.word_id AND {SOURCE_FILTER}
+    GROUP BY s.corpus_id, m.target_id
+    ON CONFLICT (corpus_id, word_id) DO UPDATE SET
+        count = greatest(coalesce(corpus_word_stats.count, 0), excluded.count),
+        rank = least(corpus_word_stats.rank, excluded.rank)
+"""
+DELETE_STATS_SQL = f"""
+    DELETE FROM corpus_word_stats AS s
+    USING word_merge_map AS m
+    WHERE s.word_id = m.word_id AND {SOURCE_FILTER}
+"""
+
+PROGRESS_COLUMNS = (
+    "status",
+    "stage",
+    "repetitions",
+    "interval_days",
+    "ease_factor",
+    "learned_at",
+    "last_review_at",
+    "next_review_at",
+    "correct_streak",
+    "wrong_streak",
+)
+STATUS_RANK_SQL = (
+    "CASE u.status "
+    + " ".join(f"WHEN '{value}' THEN {rank}" for value, rank in STATUS_PRIORITY.items())
+    + " ELSE 1 END"
+)
+# The row with the best progress per profile and target, over the target's row and every source
+# row of the profile. Ties go to the target's row, so a copied-over target beats its source.
+BEST_USER_WORDS_SQL = f"""
+    WITH touched AS (
+        SELECT DISTINCT s.profile_id, m.target_id
+        FROM user_words AS s
+        JOIN word_merge_map AS m ON m.word_id = s.word_id AND {SOURCE_FILTER}
+    )
+    SELECT DISTINCT ON (t.profile_id, t.target_id) t.target_id, u.*
+    FROM touched AS t
+    JOIN word_merge_map AS g ON g.target_id = t.target_id
+    JOIN user_words AS u ON u.profile_id = t.profile_id AND u.word_id = g.word_id
+    ORDER BY
+        t.profile_id,
+        t.target_id,
+        {STATUS_RANK_SQL} DESC,
+        coalesce(u.repetitions, 0) DESC,
+        coalesce(u.stage, 0) DESC,
+        u.word_id <> t.target_id,
+        u.word_id
+"""
+COPY_PROGRESS_SQL = f"""
+    UPDATE user_words AS k SET {", ".join(f"{column} = b.{column}" for column in PROGRESS_COLUMNS)}
+    FROM ({BEST_USER_WORDS_SQL}) AS b
+    WHERE b.word_id <> b.target_id AND k.profile_id = b.profile_id AND k.word_id = b.target_id
+"""
+DELETE_USER_WORDS_SQL = f"""
+    DELETE FROM user_words AS s
+    USING word_merge_map AS m
+    WHERE s.word_id = m.word_id AND {SOURCE_FILTER}
+    AND NOT EXISTS (
+        SELECT 1 FROM ({BEST_USER_WORDS_SQL}) AS b
+        WHERE b.profile_id = s.profile_id AND b.word_id = s.word_id
+    )
+"""
+
+CORPUS_IDS_SQL = """
+    SELECT DISTINCT e.corpus_id
+    FROM word_merge_map AS m
+    JOIN corpus_entry_terms AS t ON t.word_id = m.word_id
+    JOIN corpus_entries AS e ON e.id = t.entry_id
+"""
+DELETE_WORDS_SQL = f"DELETE FROM words AS w USING word_merge_map AS m WHERE w.id = m.word_id AND {SOURCE_FILTER}"
+
+
+@dataclass
+class WordMergeReport:
+    # moved: rows re-pointed at a target; folded: source rows dropped as duplicates of a kept row.
+    words: int = 0
+    moved: int = 0
+    folded: int = 0
+    corpus_ids: list[int] = field(default_factory=list)
+
+    def add(self, other: WordMergeReport) -> None:
+        self.words += other.words
+        self.moved += other.moved
+        self.folded += other.folded
+        self.corpus_ids = sorted(set(self.corpus_ids) | set(other.corpus_ids))
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def normalize_merge_pairs(pairs: Iterable[tuple[int, int]]) -> dict[int, int]:
+    # source -> final target: chains (a -> b, b -> c) collapse to a -> c, b -> c, so no word is both
+    # merged away and merged into. Conflicting targets and cycles raise ValueError.
+    targets: dict[int, int] = {}
+    for source_id, target_id in pairs:
+        source_id, target_id = int(source_id), int(target_id)
+        if source_id == target_id:
+            continue
+        if targets.setdefault(source_id, target_id) != target_id:
+            raise ValueError(f"Word {source_id} has more than one merge target")
+    resolved: dict[int, int] = {}
+    for source_id in targets:
+        seen = {source_id}
+        target_id = targets[source_id]
+        while target_id in targets:
+            if target_id in seen:
+                raise ValueError(f"Merge pairs form a cycle through word {target_id}")
+            seen.add(target_id)
+            target_id = targets[target_id]
+        resolved[source_id] = target_id
+    return resolved
+
+
+async def execute_count(db, sql: str) -> int:
+    result = await db.execute(text(sql))
+    return int(result.rowcount or 0)
+
+
+async def stage_merge_map(db, pairs: dict[int, int]) -> list[int]:
+    # Loads the batch into word_merge_map and returns the corpora its words appear in.
+    # Pending ORM changes are flushed first: the statements below bypass the session.
+    await db.flush()
+    await db.execute(text(MAP_TABLE_SQL))
+    records = [(source_id, target_id) for source_id, target_id in pairs.items()]
+    records.extend((target_id, target_id) for target_id in set(pairs.values()))
+    await copy_records(db, "word_merge_map", ["word_id", "target_id"], records)
+    await db.execute(text("ANALYZE word_merge_map"))
+    result = await db.execute(text(CORPUS_IDS_SQL))
+    return sorted(row[0] for row in result.fetchall())
+
+
+async def drop_merge_map(db, pairs: dict[int, int], words_deleted: bool) -> None:
+    # ON COMMIT DROP covers the usual case; dropping early lets one transaction merge several batches.
+    await db.execute(text("DROP TABLE word_merge_map"))
+    forget_merged_rows(db, set(pairs) | set(pairs.values()), set(pairs) if words_deleted else set())
+
+
+def forget_merged_rows(db, word_ids: set[int], deleted_word_ids: set[int]) -> None:
+    # Loaded rows the statements moved or deleted are expunged, so a later get() reads them back.
+    # Nothing else is expired: objects the caller still holds (the current user, target words)
+    # must stay readable without a lazy load, which an AsyncSession cannot do implicitly.
+    for instance in list(db.identity_map.values()):
+        if isinstance(instance, Word):
+            stale = instance.id in deleted_word_ids
+        else:
+            stale = getattr(instance, "word_id", None) in word_ids
+        if stale:
+            db.expunge(instance)
+
+
+async def merge_corpus_rows(db, report: WordMergeReport) -> None:
+    await db.execute(text(FOLD_STATS_SQL))
+    report.folded += await execute_count(db, DELETE_STATS_SQL)
+    await db.execute(text(PRIMARY_TERMS_SQL))
+    report.folded += await execute_count(db, delete_duplicates_sql("corpus_entry_terms", ENTRY_TERM_KEYS))
+    report.moved += await execute_count(db, move_sql("corpus_entry_terms"))
+
+
+async def move_corpus_data(db, pairs: dict[int, int]) -> WordMergeReport:
+    # Corpus stats and entry terms only: learners keep the source words, which stay in place.
+    pairs = normalize_merge_pairs(pairs.items())
+    report = WordMergeReport()
+    if not pairs:
+        return report
+    report.corpus_ids = await stage_merge_map(db, pairs)
+    await merge_corpus_rows(db, report)
+    await drop_merge_map(db, pairs, words_deleted=False)
+    return report
+
+
+async def merge_word_pairs(db, pairs: dict[int, int]) -> WordMergeReport:
+    # Moves everything that references the source words onto their targets with one set-based
+    # statement per step, then deletes the sources. Runs in the caller's transaction.
+    pairs = normalize_merge_pairs(pairs.items())
+    report = WordMergeReport()
+    if not pairs:
+        return report
+    report.corpus_ids = await stage_merge_map(db, pairs)
+
+    await db.execute(text(REPORT_TRANSLATIONS_SQL))
+    report.folded += await execute_count(db, delete_duplicates_sql("translations", TRANSLATION_KEYS))
+    report.moved += await execute_count(db, move_sql("translations"))
+
+    await merge_corpus_rows(db, report)
+
+    for table, keys in (
+        ("user_custom_words", CUSTOM_WORD_KEYS),
+        ("user_word_translations", USER_TRANSLATION_KEYS),
+    ):
+        report.folded += await execute_count(db, delete_duplicates_sql(table, keys))
+        report.moved += await execute_count(db, move_sql(table))
+
+    await db.execute(text(COPY_PROGRESS_SQL))
+    report.folded += await execute_count(db, DELETE_USER_WORDS_SQL)
+    report.moved += await execute_count(db, move_sql("user_words"))
+
+    report.moved += await execute_count(db, move_sql("review_events"))
+    report.moved += await execute_count(db, move_sql("content_reports"))
+
+    report.words = await execute_count(db, DELETE_WORDS_SQL)
+    await drop_merge_map(db, pairs, words_deleted=True)
+    return report
+
+
+async def merge_word_batches(
+    db, pairs: Iterable[tuple[int, int]], batch_size: int = MERGE_BATCH_SIZE
+) -> WordMergeReport:
+    # Commits after every batch of sources, so a large merge never holds one long transaction.
+    items = sorted(normalize_merge_pairs(pairs).items())
+    report = WordMergeReport()
+    for start in range(0, len(items), batch_size):
+        report.add(await merge_word_pairs(db, dict(items[start : start + batch_size])))
+        await db.commit()
+    return report
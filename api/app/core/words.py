@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from app.models import Word
+
+LOOKUP_BATCH = 1000
+
+
+def lemma_key(value: str) -> str:
+    # Python twin of words.lemma_key: trimmed, whitespace runs collapsed to one space, lowercased.
+    # Python and Postgres lower() disagree on a few letters (final sigma, dotted I), so this key
+    # only groups the caller's own input; matching against words goes through lemma_key_sql.
+    return " ".join((value or "").split()).lower()
+
+
+def lemma_key_sql(value):
+    # words.lemma_key computed by Postgres for a bound value or column, comparable with the stored key.
+    return func.lower(func.btrim(func.regexp_replace(value, r"\s+", " ", "g")))
+
+
+async def find_word_ids(db, lang: str, lemmas: Iterable[str]) -> dict[str, int]:
+    # Keyed by the Python lemma_key of each input; when spelling variants of one key exist the
+    # oldest word wins. The rows come back with the input lemma they matched, so the two
+    # normalizations never have to agree.
+    spellings: dict[str, str] = {}
+    for lemma in lemmas:
+        key = lemma_key(lemma)
+        if key:
+            spellings.setdefault(key, lemma)
+    key_by_lemma = {lemma: key for key, lemma in spellings.items()}
+    inputs = sorted(key_by_lemma)
+    found: dict[str, int] = {}
+    for start in range(0, len(inputs), LOOKUP_BATCH):
+        given = select(
+            func.unnest(literal(inputs[start : start + LOOKUP_BATCH], ARRAY(String))).label("lemma")
+        ).subquery()
+        result = await db.execute(
+            select(given.c.lemma, Word.id)
+            .join(Word, (Word.lang == lang) & (Word.lemma_key == lemma_key_sql(given.c.lemma)))
+            .order_by(Word.id)
+        )
+        for lemma, word_id in result.fetchall():
+            found.setdefault(key_by_lemma[lemma], word_id)
+    return found
+
+
+async def ensure_word_ids(db, lang: str, lemmas: Iterable[str]) -> dict[str, int]:
+    # New words keep the first spelling seen for their key, with whitespace collapsed.
+    spellings: dict[str, str] = {}
+    for lemma in lemmas:
+        key = lemma_key(lemma)
+        if key:
+            spellings.setdefault(key, " ".join(lemma.split()))
+    found = await find_word_ids(db, lang, spellings.values())
+    missing = [key for key in spellings if key not in found]
+    for start in range(0, len(missing), LOOKUP_BATCH):
+        chunk = missing[start : start + LOOKUP_BATCH]
+        key_by_lemma = {spellings[key]: key for key in chunk}
+        result = await db.execute(
+            insert(Word)
+            .values([{"lemma": spellings[key], "lang": lang} for key in chunk])
+            .on_conflict_do_nothing(index_elements=["lemma", "lang"])
+            .returning(Word.id, Word.lemma)
+        )
+        for word_id, lemma in result.fetchall():
+            found.setdefault(key_by_lemma[lemma], word_id)
+    # Rows another session inserted meanwhile come back from a second lookup.
+    raced = [spellings[key] for key in missing if key not in found]
+    if raced:
+        found.update(await find_word_ids(db, lang, raced))
+    return found
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, Sequence
+
+
+async def copy_connection(session):
+    # The asyncpg connection behind the session's current transaction.
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+async def copy_records(session, table: str, columns: Sequence[str], records: Iterable[tuple]) -> None:
+    conn = await copy_connection(session)
+    await conn.copy_records_to_table(table, records=list(records), columns=list(columns))
+
+
+class Progress:
+    # Prints row counts and throughput at most once per `every` seconds.
+    def __init__(self, label: str, every: float = 5.0) -> None:
+        self.label = label
+        self.every = every
+        self.rows = 0
+        self.started = time.monotonic()
+        self.reported = self.started
+
+    def add(self, rows: int) -> None:
+        self.rows += rows
+        now = time.monotonic()
+        if now - self.reported >= self.every:
+            self.reported = now
+            self.report()
+
+    def report(self) -> None:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(f"{self.label}: {self.rows} rows, {self.rows / elapsed:.0f} rows/s")
@@ -4,6 +4,7 @@ from app.models.core import (
     Corpus,
     CorpusEntry,
     CorpusEntryTerm,
+    CorpusLangCount,
     CorpusWordStat,
     ContentReport,
     SupportTicket,
@@ -22,8 +23,9 @@ from app.models.core import (
     ReviewEvent,
     ReadingPassage,
     ReadingPassageBlock,
-    ReadingPassageToken,
+    ReadingRecommendationCache,
     ReadingSource,
+    ReadingToken,
     StudySession,
     Translation,
     User,
@@ -44,6 +46,7 @@ __all__ = [
     "Corpus",
     "CorpusEntry",
     "CorpusEntryTerm",
+    "CorpusLangCount",
     "CorpusWordStat",
     "ContentReport",
     "SupportTicket",
@@ -62,8 +65,9 @@ __all__ = [
     "ReviewEvent",
     "ReadingPassage",
     "ReadingPassageBlock",
-    "ReadingPassageToken",
+    "ReadingRecommendationCache",
     "ReadingSource",
+    "ReadingToken",
     "StudySession",
     "Translation",
     "User",
@@ -1,9 +1,11 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    Computed,
+    Date,
     DateTime,
     Float,
     ForeignKey,
@@ -14,15 +16,24 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.db.base import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created", "created_at", "id"),
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
@@ -95,6 +106,19 @@ class UserPublicProfile(Base):
     __table_args__ = (
         UniqueConstraint("handle", name="uq_user_public_profiles_handle"),
         Index("ix_user_public_profiles_handle", "handle"),
+        Index(
+            "ix_user_public_profiles_handle_trgm",
+            "handle",
+            postgresql_using="gin",
+            postgresql_ops={"handle": "gin_trgm_ops"},
+            postgresql_where=text("is_public"),
+        ),
+        Index(
+            "ix_user_public_profiles_display_name_trgm",
+            text("lower(display_name) gin_trgm_ops"),
+            postgresql_using="gin",
+            postgresql_where=text("is_public"),
+        ),
     )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -136,6 +160,7 @@ class UserChallenge(Base):
     __table_args__ = (
         Index("ix_user_challenges_user", "user_id"),
         Index("ix_user_challenges_profile", "profile_id"),
+        Index("ix_user_challenges_status_ends", "status", "ends_at"),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -152,6 +177,8 @@ class UserChallenge(Base):
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    progress: Mapped[int] = mapped_column(Integer, default=0)
+    last_activity_on: Mapped[date | None] = mapped_column(Date, nullable=True)
 
 
 class FriendRequest(Base):
@@ -214,6 +241,7 @@ class GroupChallenge(Base):
     __table_args__ = (
         UniqueConstraint("invite_code", name="uq_group_challenges_invite"),
         Index("ix_group_challenges_owner", "owner_id"),
+        Index("ix_group_challenges_status_ends", "status", "ends_at"),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -236,6 +264,7 @@ class GroupChallengeMember(Base):
         UniqueConstraint("group_id", "user_id", name="uq_group_challenge_members"),
         Index("ix_group_challenge_members_group", "group_id"),
         Index("ix_group_challenge_members_user", "user_id"),
+        Index("ix_group_challenge_members_profile", "profile_id"),
     )
 
     group_id: Mapped[int] = mapped_column(
@@ -253,6 +282,8 @@ class GroupChallengeMember(Base):
         ForeignKey("learning_profiles.id", ondelete="CASCADE"),
     )
     joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    progress: Mapped[int] = mapped_column(Integer, default=0)
+    last_activity_on: Mapped[date | None] = mapped_column(Date, nullable=True)
 
 
 class NotificationSettings(Base):
@@ -353,7 +384,10 @@ class WeakWordsCache(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
-    __table_args__ = (Index("ix_audit_logs_user", "user_id"),)
+    __table_args__ = (
+        Index("ix_audit_logs_user", "user_id"),
+        Index("ix_audit_logs_created", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
@@ -390,6 +424,21 @@ class Corpus(Base):
     name: Mapped[str] = mapped_column(String(128))
     name_ru: Mapped[str | None] = mapped_column(String(128), nullable=True)
     name_en: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    content_version: Mapped[int] = mapped_column(BigInteger, default=1, server_default=text("1"))
+    active_version: Mapped[int] = mapped_column(BigInteger, default=1, server_default=text("1"))
+
+
+class CorpusLangCount(Base):
+    __tablename__ = "corpus_lang_counts"
+
+    corpus_id: Mapped[int] = mapped_column(
+        ForeignKey("corpora.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    source_lang: Mapped[str] = mapped_column(String(2), primary_key=True)
+    target_lang: Mapped[str] = mapped_column(String(2), primary_key=True)
+    words_total: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 class UserCorpus(Base):
@@ -419,11 +468,24 @@ class Word(Base):
     __tablename__ = "words"
     __table_args__ = (
         UniqueConstraint("lemma", "lang", name="uq_words_lemma_lang"),
+        Index("ix_words_lemma_id", "lemma", "id"),
+        Index("ix_words_lang_lemma_key", "lang", "lemma_key"),
+        Index(
+            "ix_words_lemma_trgm",
+            "lemma",
+            postgresql_using="gin",
+            postgresql_ops={"lemma": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     lemma: Mapped[str] = mapped_column(String(255))
     lang: Mapped[str] = mapped_column(String(2))
+    # Comparison key from the spec: lower(trim) with whitespace runs collapsed to one space.
+    lemma_key: Mapped[str] = mapped_column(
+        String(255),
+        Computed("lower(btrim(regexp_replace(lemma, '\\s+', ' ', 'g')))", persisted=True),
+    )
 
 
 class CorpusWordStat(Base):
@@ -446,12 +508,17 @@ class CorpusWordStat(Base):
 
 class CorpusEntry(Base):
     __tablename__ = "corpus_entries"
-    __table_args__ = (Index("ix_corpus_entries_corpus", "corpus_id"),)
+    __table_args__ = (
+        Index("ix_corpus_entries_corpus_version", "corpus_id", "version"),
+        Index("ix_corpus_entries_corpus_rank", "corpus_id", text("coalesce(rank, 2147483647)"), "id"),
+        Index("ix_corpus_entries_corpus_count", "corpus_id", "count", "id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     corpus_id: Mapped[int] = mapped_column(
         ForeignKey("corpora.id", ondelete="CASCADE"),
     )
+    version: Mapped[int] = mapped_column(BigInteger, default=1, server_default=text("1"))
     count: Mapped[int] = mapped_column(Integer)
     rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
@@ -512,6 +579,9 @@ class ReadingPassage(Base):
     __tablename__ = "reading_passages"
     __table_args__ = (
         Index("ix_reading_passages_source_position", "source_id", "position"),
+        Index("ix_reading_passages_token_ids", "token_ids", postgresql_using="gin"),
+        Index("ix_reading_passages_lsh_bands", "lsh_bands", postgresql_using="gin"),
+        Index("ix_reading_passages_search_vector", "search_vector", postgresql_using="gin"),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -522,20 +592,32 @@ class ReadingPassage(Base):
     title: Mapped[str | None] = mapped_column(String(200), nullable=True)
     text: Mapped[str] = mapped_column(Text)
     word_count: Mapped[int] = mapped_column(Integer)
-
-
-class ReadingPassageToken(Base):
-    __tablename__ = "reading_passage_tokens"
+    lang_purity: Mapped[float | None] = mapped_column(Float, nullable=True)
+    letter_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Sorted distinct reading_tokens ids of the passage text.
+    token_ids: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+    # MinHash signature of the word 5-grams and its LSH band keys, see app.core.minhash.
+    minhash: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+    lsh_bands: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger), nullable=True)
+    # Text search config of the source language; set by the importer so the generated
+    # vector below never has to look at reading_sources. The default is a plain string because
+    # `text` in this class body is the column above, not sqlalchemy.text.
+    search_config: Mapped[str] = mapped_column(REGCONFIG, server_default="simple")
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector(search_config, text)", persisted=True),
+        deferred=True,
+    )
+
+
+class ReadingToken(Base):
+    __tablename__ = "reading_tokens"
     __table_args__ = (
-        Index("ix_reading_passage_tokens_token", "token"),
+        UniqueConstraint("token", name="uq_reading_tokens_token"),
     )
 
-    passage_id: Mapped[int] = mapped_column(
-        ForeignKey("reading_passages.id", ondelete="CASCADE"),
-        primary_key=True,
-    )
-    token: Mapped[str] = mapped_column(String(64), primary_key=True)
-    count: Mapped[int] = mapped_column(Integer, default=1)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    token: Mapped[str] = mapped_column(String(64))
 
 
 class ReadingPassageBlock(Base):
@@ -561,6 +643,21 @@ class ReadingPassageBlock(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
+class ReadingRecommendationCache(Base):
+    __tablename__ = "reading_recommendation_cache"
+
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("learning_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    target_words: Mapped[int] = mapped_column(Integer, primary_key=True)
+    days: Mapped[int] = mapped_column(Integer, primary_key=True)
+    words_version: Mapped[str] = mapped_column(String(40))
+    data: Mapped[dict] = mapped_column(JSON)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class ContentReport(Base):
     __tablename__ = "content_reports"
     __table_args__ = (
@@ -636,6 +733,7 @@ class UserCustomWord(Base):
     __table_args__ = (
         UniqueConstraint("profile_id", "word_id", "target_lang", name="uq_user_custom_words"),
         Index("ix_user_custom_words_profile", "profile_id"),
+        Index("ix_user_custom_words_word", "word_id"),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -691,6 +789,7 @@ class UserWord(Base):
     __tablename__ = "user_words"
     __table_args__ = (
         Index("ix_user_words_next_review", "next_review_at"),
+        Index("ix_user_words_word", "word_id"),
     )
 
     profile_id: Mapped[uuid.UUID] = mapped_column(
@@ -36,6 +36,11 @@ class AdminUserOut(BaseModel):
     target_lang: str | None = None
 
 
+class AdminUserListOut(BaseModel):
+    items: list[AdminUserOut]
+    next_cursor: str | None = None
+
+
 class AdminUserUpdate(BaseModel):
     is_active: bool | None = None
     email_verified: bool | None = None
@@ -55,6 +60,11 @@ class AdminAuditOut(BaseModel):
     created_at: datetime
 
 
+class AdminAuditListOut(BaseModel):
+    items: list[AdminAuditOut]
+    next_cursor: str | None = None
+
+
 class AdminBroadcastRequest(BaseModel):
     subject: str
     message: str
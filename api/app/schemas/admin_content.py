@@ -11,6 +11,21 @@ class AdminWordOut(BaseModel):
     lang: str
 
 
+class AdminWordMergePair(BaseModel):
+    source_id: int
+    target_id: int
+
+
+class AdminWordMergeRequest(BaseModel):
+    pairs: list[AdminWordMergePair]
+
+
+class AdminWordMergeOut(BaseModel):
+    words: int
+    moved: int
+    folded: int
+
+
 class AdminWordListItem(BaseModel):
     id: int
     lemma: str
@@ -22,7 +37,9 @@ class AdminWordListItem(BaseModel):
 
 class AdminWordListOut(BaseModel):
     total: int
+    total_exact: bool = True
     items: list[AdminWordListItem]
+    next_cursor: str | None = None
 
 
 class AdminWordDistributionItem(BaseModel):
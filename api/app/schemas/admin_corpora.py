@@ -25,4 +25,6 @@ class AdminCorpusEntryOut(BaseModel):
 
 class AdminCorpusEntriesOut(BaseModel):
     total: int
+    total_exact: bool = True
     items: list[AdminCorpusEntryOut]
+    next_cursor: str | None = None
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.schemas.word_imports import WordImportOut
+
 
 class CustomWordIn(BaseModel):
     word: str
@@ -19,13 +21,8 @@ class CustomWordsImportRequest(BaseModel):
     text: str
 
 
-class CustomWordsImportOut(BaseModel):
-    total_lines: int
-    parsed_lines: int
-    invalid_lines: int
-    inserted: int
-    updated: int
-    skipped: int
+class CustomWordsImportOut(WordImportOut):
+    pass
 
 
 class CustomWordsCountOut(BaseModel):
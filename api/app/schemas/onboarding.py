@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from app.schemas.word_imports import WordImportOut
+
 
 class CorpusOut(BaseModel):
     id: int
@@ -60,11 +62,6 @@ class KnownWordsImportRequest(BaseModel):
     text: str
 
 
-class KnownWordsImportOut(BaseModel):
-    total_lines: int
-    parsed_lines: int
-    invalid_lines: int
-    words_found: int
-    words_missing: int
-    inserted: int
-    skipped_existing: int
+class KnownWordsImportOut(WordImportOut):
+    words_found: int = 0
+    skipped_existing: int = 0
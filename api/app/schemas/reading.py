@@ -30,3 +30,18 @@ class ReadingFlagRequest(BaseModel):
 
 class ReadingFlagOut(BaseModel):
     blocked: int
+
+
+class ReadingSearchItem(BaseModel):
+    id: int
+    source_id: int
+    source_title: str
+    position: int
+    headline: str
+    rank: float
+    blocked: bool = False
+
+
+class ReadingSearchOut(BaseModel):
+    items: list[ReadingSearchItem]
+    next_cursor: str | None = None
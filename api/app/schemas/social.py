@@ -45,6 +45,11 @@ class PublicProfileSummaryOut(BaseModel):
     is_following: bool | None = None
 
 
+class PublicProfileSearchOut(BaseModel):
+    items: list[PublicProfileSummaryOut]
+    next_cursor: str | None = None
+
+
 class FollowStatusOut(BaseModel):
     following: bool
 
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class WordImportErrorOut(BaseModel):
+    line: int
+    error: str
+
+
+class WordImportOut(BaseModel):
+    # "queued" imports carry job_id; poll /tech/jobs/{job_id} for progress and the final stats.
+    status: str = "done"
+    job_id: int | None = None
+    total_lines: int
+    parsed_lines: int
+    invalid_lines: int
+    total_words: int = 0
+    processed_words: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    words_missing: int = 0
+    errors: list[WordImportErrorOut] = []
@@ -20,46 +20,15 @@ from app.models import (  # noqa: E402
     Corpus,
     CorpusWordStat,
     LearningProfile,
-    User,
     UserCorpus,
     UserCustomWord,
-    UserProfile,
     UserWord,
     Word,
 )
 
 from migrate_corpus_stats_language import run as run_corpus_migration  # noqa: E402
-from migrate_language_direction import run_migration  # noqa: E402
-
-
-async def resolve_profiles(profile_id: str | None, email: str | None) -> list[LearningProfile]:
-    async with AsyncSessionLocal() as session:
-        if profile_id:
-            result = await session.execute(
-                select(LearningProfile).where(LearningProfile.id == profile_id)
-            )
-            profile = result.scalar_one_or_none()
-            return [profile] if profile else []
-
-        if email:
-            user_result = await session.execute(select(User).where(User.email == email))
-            user = user_result.scalar_one_or_none()
-            if not user:
-                return []
-            profile_result = await session.execute(
-                select(UserProfile.active_profile_id).where(UserProfile.user_id == user.id)
-            )
-            active_profile_id = profile_result.scalar_one_or_none()
-            if not active_profile_id:
-                return []
-            profile_result = await session.execute(
-                select(LearningProfile).where(LearningProfile.id == active_profile_id)
-            )
-            profile = profile_result.scalar_one_or_none()
-            return [profile] if profile else []
-
-        result = await session.execute(select(LearningProfile))
-        return result.scalars().all()
+from migrate_language_direction import migrate_profile  # noqa: E402
+from profile_runner import DEFAULT_WORKERS, add_runner_arguments, resolve_profile_ids, run_profiles  # noqa: E402
 
 
 async def profiles_with_word_mismatch(session) -> set[str]:
@@ -133,14 +102,19 @@ async def corpora_missing_target_lang(
     return (await session.execute(stmt)).all()
 
 
-async def run(profile_id: str | None, email: str | None, apply: bool) -> None:
-    profiles = await resolve_profiles(profile_id, email)
-    if not profiles:
+async def run(
+    profile_id: str | None,
+    email: str | None,
+    apply: bool,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = 0.0,
+    checkpoint_path: Path | None = None,
+) -> None:
+    profile_ids = {str(item) for item in await resolve_profile_ids(profile_id, email)}
+    if not profile_ids:
         print("No profiles found.")
         return
 
-    profile_ids = {str(profile.id) for profile in profiles}
-
     async with AsyncSessionLocal() as session:
         mismatch_profiles = await profiles_with_word_mismatch(session)
         mismatch_profiles |= await profiles_with_custom_mismatch(session)
@@ -150,8 +124,15 @@ async def run(profile_id: str | None, email: str | None, apply: bool) -> None:
 
     if mismatch_profiles:
         print(f"Fixing profiles with mismatched words: {len(mismatch_profiles)}")
-        for pid in mismatch_profiles:
-            await run_migration(pid, apply)
+        await run_profiles(
+            "migrate_language_direction",
+            migrate_profile,
+            sorted(mismatch_profiles),
+            apply,
+            workers=workers,
+            rate=rate,
+            checkpoint_path=checkpoint_path,
+        )
     else:
         print("No profile word mismatches detected.")
 
@@ -171,15 +152,13 @@ async def run(profile_id: str | None, email: str | None, apply: bool) -> None:
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Auto-fix language consistency issues.")
-    parser.add_argument("--profile-id", default=None, help="Learning profile id.")
-    parser.add_argument("--email", default=None, help="User email (uses active profile).")
-    parser.add_argument("--apply", action="store_true", help="Apply changes to the database.")
+    add_runner_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    asyncio.run(run(args.profile_id, args.email, args.apply))
+    asyncio.run(run(args.profile_id, args.email, args.apply, args.workers, args.rate, args.checkpoint))
 
 
 if __name__ == "__main__":
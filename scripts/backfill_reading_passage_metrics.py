@@ -0,0 +1,65 @@
+"""Backfill lang_purity/letter_ratio for reading passages."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import select, update
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.core.reading_engine import passage_metrics  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import ReadingPassage, ReadingSource  # noqa: E402
+
+
+async def run(batch_size: int, recompute: bool, apply: bool) -> None:
+    updated = 0
+    last_id = 0
+    async with AsyncSessionLocal() as session:
+        while True:
+            stmt = (
+                select(ReadingPassage.id, ReadingPassage.text, ReadingSource.lang)
+                .join(ReadingSource, ReadingSource.id == ReadingPassage.source_id)
+                .where(ReadingPassage.id > last_id)
+                .order_by(ReadingPassage.id)
+                .limit(batch_size)
+            )
+            if not recompute:
+                stmt = stmt.where(ReadingPassage.lang_purity.is_(None))
+            rows = (await session.execute(stmt)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            values = []
+            for row in rows:
+                lang_purity, letter_ratio = passage_metrics(row.text or "", row.lang)
+                values.append({"id": row.id, "lang_purity": lang_purity, "letter_ratio": letter_ratio})
+            if apply:
+                await session.execute(update(ReadingPassage), values)
+                await session.commit()
+            updated += len(values)
+            print(f"Processed {updated} passages (last id {last_id}).")
+
+    if not apply:
+        print("Dry run only. Use --apply to write metrics.")
+    print(f"Done: {updated} passages.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--recompute", action="store_true", help="Recompute rows that already have metrics.")
+    parser.add_argument("--apply", action="store_true", help="Write changes to the database.")
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size, args.recompute, args.apply))
+
+
+if __name__ == "__main__":
+    main()
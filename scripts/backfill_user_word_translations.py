@@ -17,103 +17,78 @@ SCRIPTS_DIR = BASE_DIR / "scripts"
 sys.path.append(str(API_DIR))
 sys.path.append(str(SCRIPTS_DIR))
 
-from app.db.session import AsyncSessionLocal  # noqa: E402
 from app.models import (  # noqa: E402
     LearningProfile,
     Translation,
-    User,
     UserCustomWord,
-    UserProfile,
     UserWord,
     UserWordTranslation,
 )
 
-
-def chunked(items: list[int], size: int = 500) -> list[list[int]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
+from profile_runner import (  # noqa: E402
+    STREAM_BATCH_SIZE,
+    add_runner_arguments,
+    resolve_profile_ids,
+    run_profiles,
+)
 
 
-async def resolve_profiles(profile_id: str | None, email: str | None) -> list[LearningProfile]:
-    async with AsyncSessionLocal() as session:
-        if profile_id:
-            result = await session.execute(
-                select(LearningProfile).where(LearningProfile.id == profile_id)
-            )
-            profile = result.scalar_one_or_none()
-            return [profile] if profile else []
-
-        if email:
-            user_result = await session.execute(select(User).where(User.email == email))
-            user = user_result.scalar_one_or_none()
-            if not user:
-                return []
-            profile_result = await session.execute(
-                select(UserProfile.active_profile_id).where(UserProfile.user_id == user.id)
-            )
-            active_profile_id = profile_result.scalar_one_or_none()
-            if not active_profile_id:
-                return []
-            profile_result = await session.execute(
-                select(LearningProfile).where(LearningProfile.id == active_profile_id)
-            )
-            profile = profile_result.scalar_one_or_none()
-            return [profile] if profile else []
-
-        result = await session.execute(select(LearningProfile))
-        return result.scalars().all()
-
-
-async def backfill_profile(profile: LearningProfile, apply: bool) -> None:
-    async with AsyncSessionLocal() as session:
-        target_lang = profile.native_lang
-        missing_stmt = (
-            select(UserWord.word_id)
-            .where(UserWord.profile_id == profile.id)
-            .where(
-                ~exists(
-                    select(1).where(
-                        UserWordTranslation.profile_id == profile.id,
-                        UserWordTranslation.word_id == UserWord.word_id,
-                        UserWordTranslation.target_lang == target_lang,
-                    )
-                )
-            )
+async def translations_for(session, profile: LearningProfile, word_ids: list[int]) -> dict[int, list[str]]:
+    target_lang = profile.native_lang
+    translation_map: dict[int, list[str]] = defaultdict(list)
+    custom_rows = await session.execute(
+        select(UserCustomWord.word_id, UserCustomWord.translation).where(
+            UserCustomWord.profile_id == profile.id,
+            UserCustomWord.target_lang == target_lang,
+            UserCustomWord.word_id.in_(word_ids),
         )
-        word_rows = await session.execute(missing_stmt)
-        word_ids = [row[0] for row in word_rows.fetchall()]
-        if not word_ids:
-            print(f"Profile {profile.id}: no missing translations.")
-            return
-
-        translation_map: dict[int, list[str]] = defaultdict(list)
-        for chunk in chunked(word_ids):
-            custom_rows = await session.execute(
-                select(UserCustomWord.word_id, UserCustomWord.translation).where(
-                    UserCustomWord.profile_id == profile.id,
-                    UserCustomWord.target_lang == target_lang,
-                    UserCustomWord.word_id.in_(chunk),
-                )
-            )
-            for word_id, translation in custom_rows.fetchall():
-                if translation:
-                    translation_map[word_id].append(translation)
-
-            global_rows = await session.execute(
-                select(Translation.word_id, Translation.translation).where(
-                    Translation.word_id.in_(chunk),
-                    Translation.target_lang == target_lang,
+    )
+    for word_id, translation in custom_rows.fetchall():
+        if translation:
+            translation_map[word_id].append(translation)
+
+    global_rows = await session.execute(
+        select(Translation.word_id, Translation.translation).where(
+            Translation.word_id.in_(word_ids),
+            Translation.target_lang == target_lang,
+        )
+    )
+    for word_id, translation in global_rows.fetchall():
+        if translation:
+            translation_map[word_id].append(translation)
+    return translation_map
+
+
+async def backfill_profile(session, profile: LearningProfile, apply: bool) -> dict[str, int]:
+    target_lang = profile.native_lang
+    missing_stmt = (
+        select(UserWord.word_id)
+        .where(UserWord.profile_id == profile.id)
+        .where(
+            ~exists(
+                select(1).where(
+                    UserWordTranslation.profile_id == profile.id,
+                    UserWordTranslation.word_id == UserWord.word_id,
+                    UserWordTranslation.target_lang == target_lang,
                 )
             )
-            for word_id, translation in global_rows.fetchall():
-                if translation:
-                    translation_map[word_id].append(translation)
-
+        )
+        .order_by(UserWord.word_id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    counts = {"words_missing": 0, "rows": 0, "without_translation": 0, "inserted": 0}
+
+    # The cursor's snapshot predates the inserts below, so batches never see their own rows.
+    # Everything stays in one transaction: a commit would close the cursor.
+    stream = await session.stream_scalars(missing_stmt)
+    async for word_ids in stream.partitions():
+        counts["words_missing"] += len(word_ids)
+        translation_map = await translations_for(session, profile, list(word_ids))
         rows: list[dict] = []
-        missing_without_any = 0
         for word_id in word_ids:
             translations = translation_map.get(word_id, [])
             if not translations:
-                missing_without_any += 1
+                counts["without_translation"] += 1
                 continue
             for value in translations:
                 rows.append(
@@ -126,44 +101,49 @@ async def backfill_profile(profile: LearningProfile, apply: bool) -> None:
                         "source": "backfill",
                     }
                 )
-
-        print(
-            f"Profile {profile.id}: words missing={len(word_ids)} "
-            f"rows={len(rows)} without_translation={missing_without_any}"
-        )
-
+        counts["rows"] += len(rows)
         if not apply or not rows:
-            return
+            continue
 
-        stmt = insert(UserWordTranslation).values(rows)
-        stmt = stmt.on_conflict_do_nothing(
-            index_elements=["profile_id", "word_id", "target_lang", "translation"]
-        )
-        result = await session.execute(stmt)
+        # A word can carry several translations, so rows are capped separately from the word batch.
+        for start in range(0, len(rows), STREAM_BATCH_SIZE):
+            stmt = insert(UserWordTranslation).values(rows[start : start + STREAM_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=["profile_id", "word_id", "target_lang", "translation"]
+            )
+            result = await session.execute(stmt)
+            counts["inserted"] += int(result.rowcount or 0)
+
+    if apply:
         await session.commit()
-        print(f"Profile {profile.id}: inserted={int(result.rowcount or 0)}")
+    return counts
 
 
-async def run(profile_id: str | None, email: str | None, apply: bool) -> None:
-    profiles = await resolve_profiles(profile_id, email)
-    if not profiles:
+async def run(args: argparse.Namespace) -> None:
+    profile_ids = await resolve_profile_ids(args.profile_id, args.email)
+    if not profile_ids:
         print("No profiles found.")
         return
-    for profile in profiles:
-        await backfill_profile(profile, apply)
+    await run_profiles(
+        "backfill_user_word_translations",
+        backfill_profile,
+        profile_ids,
+        args.apply,
+        workers=args.workers,
+        rate=args.rate,
+        checkpoint_path=args.checkpoint,
+    )
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Backfill user word translations.")
-    parser.add_argument("--profile-id", default=None, help="Learning profile id.")
-    parser.add_argument("--email", default=None, help="User email (uses active profile).")
-    parser.add_argument("--apply", action="store_true", help="Apply changes to the database.")
+    add_runner_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    asyncio.run(run(args.profile_id, args.email, args.apply))
+    asyncio.run(run(args))
 
 
 if __name__ == "__main__":
@@ -32,7 +32,7 @@ BACKUP_TELEGRAM_BOT_TOKEN="${BACKUP_TELEGRAM_BOT_TOKEN:-}"
 BACKUP_TELEGRAM_CHAT_ID="${BACKUP_TELEGRAM_CHAT_ID:-}"
 BACKUP_TELEGRAM_MAX_BYTES="${BACKUP_TELEGRAM_MAX_BYTES:-0}"
 BACKUP_TELEGRAM_LIGHT="${BACKUP_TELEGRAM_LIGHT:-true}"
-BACKUP_TELEGRAM_EXCLUDE_TABLE_DATA="${BACKUP_TELEGRAM_EXCLUDE_TABLE_DATA:-public.reading_passages,public.reading_passage_tokens}"
+BACKUP_TELEGRAM_EXCLUDE_TABLE_DATA="${BACKUP_TELEGRAM_EXCLUDE_TABLE_DATA:-public.reading_passages}"
 BACKUP_TELEGRAM_INCLUDE_MEDIA="${BACKUP_TELEGRAM_INCLUDE_MEDIA:-false}"
 
 BACKUP_ENABLE_DRIVE="${BACKUP_ENABLE_DRIVE:-true}"
@@ -0,0 +1,142 @@
+"""Benchmark clean_corpora_by_frequency: legacy in-Python grouping vs window-function SQL."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = BASE_DIR / "scripts"
+sys.path.append(str(SCRIPTS_DIR))
+
+from clean_corpora_by_frequency import CleanPlan, parse_direction, plan_sqlite, report_lines  # noqa: E402
+
+DIRECTIONS = ["en_ru", "ru_en", "en_en", "ru_ru"]
+
+
+def make_db(path: Path, corpora: int, entries: int, vocabulary: int, seed: int) -> None:
+    # Zipf-like lemma popularity, so the same lemma shows up in many corpora with skewed counts.
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    slugs = [f"corpus{idx}_{DIRECTIONS[idx % len(DIRECTIONS)]}" for idx in range(corpora)]
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY, corpus_slug TEXT, count INTEGER)")
+    conn.execute("CREATE TABLE terms (entry_id INTEGER, lemma TEXT, lang TEXT, is_primary INTEGER)")
+    entry_rows = []
+    term_rows = []
+    lemmas = rng.choices(range(vocabulary), weights=weights, k=entries)
+    for entry_id, lemma in enumerate(lemmas, start=1):
+        slug = rng.choice(slugs)
+        source, target = slug.rsplit("_", 2)[1:]
+        entry_rows.append((entry_id, slug, int(rng.paretovariate(1.2) * 5)))
+        term_rows.append((entry_id, f"{source}{lemma}", source, 1))
+        term_rows.append((entry_id, f"{target}{lemma}", target, 1 if source != target else 0))
+    conn.executemany("INSERT INTO entries VALUES (?, ?, ?)", entry_rows)
+    conn.executemany("INSERT INTO terms VALUES (?, ?, ?, ?)", term_rows)
+    conn.commit()
+    conn.close()
+
+
+def legacy_plan(conn: sqlite3.Connection, min_ratio: float, min_count: int, keep_top: int):
+    # The pre-SQL implementation: every entry and term loaded into dicts, grouped and sorted here.
+    conn.row_factory = sqlite3.Row
+    entries = conn.execute("SELECT id, corpus_slug, count FROM entries").fetchall()
+    terms = conn.execute("SELECT entry_id, lemma, lang, is_primary FROM terms").fetchall()
+    conn.row_factory = None
+
+    primary_by_entry_lang: dict[int, dict[str, str]] = defaultdict(dict)
+    for row in terms:
+        if not row["is_primary"]:
+            continue
+        lemma = (row["lemma"] or "").strip()
+        lang = (row["lang"] or "").strip().lower()
+        if lemma and lang:
+            primary_by_entry_lang[int(row["entry_id"])][lang] = lemma
+
+    grouped: dict[tuple[str, str], list[tuple[int, str, int]]] = defaultdict(list)
+    for row in entries:
+        source_lang, _target_lang = parse_direction(row["corpus_slug"])
+        lemma = primary_by_entry_lang.get(int(row["id"]), {}).get(source_lang) if source_lang else None
+        if lemma:
+            grouped[(source_lang, lemma)].append((int(row["id"]), row["corpus_slug"], int(row["count"] or 0)))
+
+    plan = CleanPlan(entries_total=len(entries))
+    remove_ids = set()
+    for items in grouped.values():
+        items.sort(key=lambda x: x[2], reverse=True)
+        max_count = items[0][2]
+        for position, (entry_id, slug, count) in enumerate(items):
+            if position < keep_top or count >= max_count * min_ratio or count >= min_count:
+                plan.kept_by_corpus[slug] = plan.kept_by_corpus.get(slug, 0) + 1
+                continue
+            remove_ids.add(entry_id)
+            plan.removed_by_corpus[slug] = plan.removed_by_corpus.get(slug, 0) + 1
+    return plan, remove_ids
+
+
+def timed(label: str, func_, repeat: int):
+    best = None
+    value = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = func_()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<8} {best * 1000:9.1f} ms")
+    return value
+
+
+def run(db_path: Path, min_ratio: float, min_count: int, keep_top: int, repeat: int) -> None:
+    conn = sqlite3.connect(db_path)
+    entries = conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+    print(f"entries={entries}")
+
+    legacy, legacy_ids = timed("python", lambda: legacy_plan(conn, min_ratio, min_count, keep_top), repeat)
+    plan = timed("sql", lambda: plan_sqlite(conn, min_ratio, min_count, keep_top), repeat)
+    sql_ids = {row[0] for row in conn.execute("SELECT id FROM temp.clean_decisions WHERE is_removed")}
+    conn.close()
+
+    if (
+        legacy_ids != sql_ids
+        or legacy.removed_by_corpus != plan.removed_by_corpus
+        or legacy.kept_by_corpus != plan.kept_by_corpus
+        or legacy.skipped != plan.skipped
+        or report_lines(legacy) != report_lines(plan)
+    ):
+        print(f"  MISMATCH: {len(legacy_ids ^ sql_ids)} entries differ")
+    else:
+        print(f"  {len(sql_ids)} entries marked for removal, {plan.skipped} skipped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=Path, default=None, help="Corpora SQLite file (default: synthetic).")
+    parser.add_argument("--corpora", type=int, default=40)
+    parser.add_argument("--entries", type=int, default=400000)
+    parser.add_argument("--vocabulary", type=int, default=60000)
+    parser.add_argument("--min-ratio", type=float, default=0.2)
+    parser.add_argument("--min-count", type=int, default=30)
+    parser.add_argument("--keep-top", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Work on a copy: the SQL path creates temp tables and the real file stays untouched.
+        db_path = Path(tmp) / "corpora.db"
+        if args.db:
+            shutil.copy(args.db, db_path)
+        else:
+            make_db(db_path, args.corpora, args.entries, args.vocabulary, args.seed)
+        run(db_path, args.min_ratio, args.min_count, args.keep_top, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Benchmark group challenge progress: per-member queries vs batch queries."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.api.social import CHALLENGES, compute_group_progress, compute_streaks  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import (  # noqa: E402
+    GroupChallenge,
+    GroupChallengeMember,
+    LearningProfile,
+    StudySession,
+    User,
+    UserWord,
+    Word,
+)
+
+CHUNK_SIZE = 1000
+
+
+def chunked(items: list[dict], size: int = CHUNK_SIZE):
+    for idx in range(0, len(items), size):
+        yield items[idx : idx + size]
+
+
+async def insert_rows(session, model, rows: list[dict]) -> None:
+    for chunk in chunked(rows):
+        await session.execute(insert(model), chunk)
+
+
+async def seed_group(session, members: int, challenge_key: str, words_per_member: int) -> GroupChallenge:
+    now = datetime.now(timezone.utc)
+    started_at = now - timedelta(days=CHALLENGES[challenge_key]["days"] - 1)
+    tag = uuid.uuid4().hex[:8]
+
+    word_rows = [{"lemma": f"bench-{tag}-{idx}", "lang": "en"} for idx in range(words_per_member)]
+    await insert_rows(session, Word, word_rows)
+    word_ids = (
+        await session.execute(select(Word.id).where(Word.lemma.like(f"bench-{tag}-%")))
+    ).scalars().all()
+
+    users = []
+    profiles = []
+    for idx in range(members):
+        user_id = uuid.uuid4()
+        users.append({"id": user_id, "email": f"bench-{tag}-{idx}@local", "hashed_password": "-"})
+        profiles.append(
+            {"id": uuid.uuid4(), "user_id": user_id, "native_lang": "ru", "target_lang": "en"}
+        )
+    await insert_rows(session, User, users)
+    await insert_rows(session, LearningProfile, profiles)
+
+    group = GroupChallenge(
+        owner_id=users[0]["id"],
+        challenge_key=challenge_key,
+        status="active",
+        invite_code=tag[:6].upper(),
+        started_at=started_at,
+        ends_at=started_at + timedelta(days=CHALLENGES[challenge_key]["days"]),
+    )
+    session.add(group)
+    await session.flush()
+
+    member_rows = []
+    user_word_rows = []
+    session_rows = []
+    for user, profile in zip(users, profiles):
+        member_rows.append({"group_id": group.id, "user_id": user["id"], "profile_id": profile["id"]})
+        for word_id in random.sample(word_ids, k=random.randint(0, len(word_ids))):
+            user_word_rows.append(
+                {
+                    "profile_id": profile["id"],
+                    "user_id": user["id"],
+                    "word_id": word_id,
+                    "status": "learned",
+                    "learned_at": started_at + timedelta(minutes=random.randint(0, 60 * 24 * 6)),
+                }
+            )
+        for day in range(CHALLENGES[challenge_key]["days"]):
+            if random.random() < 0.8:
+                session_rows.append(
+                    {
+                        "profile_id": profile["id"],
+                        "user_id": user["id"],
+                        "session_type": "learn",
+                        "started_at": started_at + timedelta(days=day, hours=1),
+                    }
+                )
+    await insert_rows(session, GroupChallengeMember, member_rows)
+    await insert_rows(session, UserWord, user_word_rows)
+    await insert_rows(session, StudySession, session_rows)
+    return group
+
+
+async def per_member_progress(session, group: GroupChallenge) -> dict:
+    definition = CHALLENGES[group.challenge_key]
+    period_end = min(datetime.now(timezone.utc), group.ends_at)
+    profile_ids = (
+        await session.execute(
+            select(GroupChallengeMember.profile_id).where(GroupChallengeMember.group_id == group.id)
+        )
+    ).scalars().all()
+    progress = {}
+    for profile_id in profile_ids:
+        if definition["type"] == "learn_words":
+            result = await session.execute(
+                select(func.count())
+                .select_from(UserWord)
+                .where(
+                    UserWord.profile_id == profile_id,
+                    UserWord.learned_at >= group.started_at,
+                    UserWord.learned_at <= period_end,
+                )
+            )
+            progress[profile_id] = int(result.scalar() or 0)
+        else:
+            day_bucket = func.date_trunc("day", StudySession.started_at)
+            result = await session.execute(
+                select(day_bucket)
+                .where(
+                    StudySession.profile_id == profile_id,
+                    StudySession.started_at >= group.started_at,
+                    StudySession.started_at <= period_end,
+                )
+                .group_by(day_bucket)
+            )
+            days = [row[0].date() for row in result.fetchall()]
+            progress[profile_id] = compute_streaks(days)[0]
+    return progress
+
+
+async def timed(label: str, func_, repeat: int):
+    best = None
+    value = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = await func_()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<12} {best * 1000:9.1f} ms")
+    return value
+
+
+async def run(sizes: list[int], repeat: int, words: int) -> None:
+    async with AsyncSessionLocal() as session:
+        try:
+            for challenge_key in ("learn_100_30", "streak_7"):
+                for size in sizes:
+                    group = await seed_group(session, size, challenge_key, words)
+                    print(f"{challenge_key} members={size}")
+                    legacy = await timed("per-member", lambda: per_member_progress(session, group), repeat)
+                    batch = await timed("batch", lambda: compute_group_progress(group, session), repeat)
+                    mismatched = [
+                        profile_id
+                        for profile_id, value in legacy.items()
+                        if batch.get(profile_id, 0) != value
+                    ]
+                    if mismatched:
+                        print(f"  MISMATCH for {len(mismatched)} members")
+        finally:
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--words", type=int, default=120)
+    args = parser.parse_args()
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    asyncio.run(run(sizes, args.repeat, args.words))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark language detection: legacy regex findall vs app.core.lang."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.core.lang import DEFAULT_MIN_SHARE, MAJORITY_SHARE, detect_lang, detect_langs  # noqa: E402
+
+LATIN_RE = re.compile(r"[A-Za-z]")
+CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
+RUSSIAN = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+MIXED = RUSSIAN + string.ascii_lowercase + " -'.1"
+
+
+def legacy_detect(value: str, min_share: float) -> str | None:
+    # The two-findall version that custom_words, import_sqlite and normalize_custom_words each carried.
+    if not value:
+        return None
+    latin = len(LATIN_RE.findall(value))
+    cyrillic = len(CYRILLIC_RE.findall(value))
+    total = latin + cyrillic
+    if total == 0:
+        return None
+    if latin > cyrillic and latin / total >= min_share:
+        return "en"
+    if cyrillic > latin and cyrillic / total >= min_share:
+        return "ru"
+    return None
+
+
+def make_lemmas(size: int, rng: random.Random) -> list[str]:
+    # Roughly the corpus mix: English and Russian lemmas, some phrases, a few mixed-script artifacts.
+    lemmas = []
+    for _ in range(size):
+        roll = rng.random()
+        length = rng.randint(2, 14)
+        if roll < 0.45:
+            alphabet = string.ascii_lowercase
+        elif roll < 0.9:
+            alphabet = RUSSIAN
+        else:
+            alphabet = MIXED
+        lemmas.append("".join(rng.choice(alphabet) for _ in range(length)))
+    return lemmas
+
+
+def timed(label: str, func_, repeat: int):
+    best = None
+    value = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = func_()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<8} {best * 1000:9.1f} ms")
+    return value
+
+
+def run(size: int, repeat: int, seed: int) -> None:
+    lemmas = make_lemmas(size, random.Random(seed))
+    for label, min_share in (("share", DEFAULT_MIN_SHARE), ("majority", MAJORITY_SHARE)):
+        print(f"lemmas={size} threshold={label}")
+        legacy = timed("regex", lambda: [legacy_detect(lemma, min_share) for lemma in lemmas], repeat)
+        single = timed("single", lambda: [detect_lang(lemma, min_share) for lemma in lemmas], repeat)
+        batch = timed("batch", lambda: detect_langs(lemmas, min_share), repeat)
+        mismatched = sum(1 for old, one, many in zip(legacy, single, batch) if not old == one == many)
+        if mismatched:
+            print(f"  MISMATCH in {mismatched} lemmas")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.size, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
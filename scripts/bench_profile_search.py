@@ -0,0 +1,136 @@
+"""Benchmark /social/search: legacy ILIKE scan vs trigram-ranked search."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import and_, or_, select, text
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.api.social import search_profiles  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import User, UserFollow, UserProfile, UserPublicProfile  # noqa: E402
+
+DEFAULT_QUERIES = ["an", "anna", "max_1", "kate_4f", "olga", "zz9", "dmitry"]
+
+SEED_SQL = """
+WITH src AS (
+    SELECT
+        i,
+        md5('bench-profile-' || i) AS user_key,
+        (ARRAY['anna', 'max', 'kate', 'ivan', 'olga', 'alex', 'dima', 'nina', 'sam', 'lee'])[1 + i % 10] AS name
+    FROM generate_series(1, :total) AS i
+),
+new_users AS (
+    INSERT INTO users (id, email, hashed_password, is_active)
+    SELECT user_key::uuid, 'bench-' || i || '@local', '-', true FROM src
+    RETURNING id
+),
+new_profiles AS (
+    INSERT INTO user_profile (user_id, interface_lang, theme, onboarding_done)
+    SELECT id, 'en', 'light', false FROM new_users
+    RETURNING user_id
+)
+INSERT INTO user_public_profiles (user_id, handle, display_name, is_public)
+SELECT
+    src.user_key::uuid,
+    left(src.name || '_' || substr(src.user_key, 1, 6) || src.i, 32),
+    initcap(src.name) || ' ' || substr(src.user_key, 7, 5),
+    src.i % 5 <> 0
+FROM src
+JOIN new_profiles ON new_profiles.user_id = src.user_key::uuid
+"""
+
+
+async def legacy_search(session, user_id, query: str):
+    stmt = (
+        select(
+            UserPublicProfile.handle,
+            UserPublicProfile.display_name,
+            UserProfile.avatar_url,
+            UserFollow.follower_id,
+        )
+        .join(UserProfile, UserProfile.user_id == UserPublicProfile.user_id)
+        .outerjoin(
+            UserFollow,
+            and_(
+                UserFollow.follower_id == user_id,
+                UserFollow.followee_id == UserPublicProfile.user_id,
+            ),
+        )
+        .where(
+            UserPublicProfile.is_public.is_(True),
+            or_(
+                UserPublicProfile.handle.ilike(f"%{query}%"),
+                UserPublicProfile.display_name.ilike(f"%{query}%"),
+            ),
+        )
+        .order_by(UserPublicProfile.handle)
+        .limit(20)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def timed(label: str, func_, repeat: int):
+    best = None
+    value = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = await func_()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<8} {best * 1000:9.1f} ms")
+    return value
+
+
+async def run(total: int, queries: list[str], repeat: int, pages: int) -> None:
+    async with AsyncSessionLocal() as session:
+        try:
+            started = time.perf_counter()
+            await session.execute(text(SEED_SQL), {"total": total})
+            await session.execute(text("ANALYZE user_public_profiles"))
+            print(f"seeded {total} profiles in {time.perf_counter() - started:.1f}s")
+
+            viewer = (await session.execute(select(User).limit(1))).scalar_one()
+            for query in queries:
+                print(f"query={query!r}")
+                await timed("ilike", lambda: legacy_search(session, viewer.id, query), repeat)
+                page = await timed(
+                    "trigram",
+                    lambda: search_profiles(query=query, limit=20, cursor=None, user=viewer, db=session),
+                    repeat,
+                )
+                cursor = page.next_cursor
+                for number in range(2, pages + 1):
+                    if not cursor:
+                        break
+                    page = await timed(
+                        f"page {number}",
+                        lambda: search_profiles(query=query, limit=20, cursor=cursor, user=viewer, db=session),
+                        repeat,
+                    )
+                    cursor = page.next_cursor
+        finally:
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=1_000_000)
+    parser.add_argument("--queries", default=",".join(DEFAULT_QUERIES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=3)
+    args = parser.parse_args()
+    queries = [item.strip() for item in args.queries.split(",") if item.strip()]
+    asyncio.run(run(args.total, queries, args.repeat, args.pages))
+
+
+if __name__ == "__main__":
+    main()
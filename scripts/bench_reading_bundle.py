@@ -0,0 +1,136 @@
+"""Benchmark reading bundle selection: set-based greedy cover vs bitmask engine."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.core.reading_engine import ReadingIndex, build_bundle  # noqa: E402
+
+
+@dataclass
+class Passage:
+    id: int
+    source_id: int
+    position: int
+    word_count: int
+
+
+def legacy_bundle(base, passages, token_map, max_words):
+    selected = [base]
+    covered = set(token_map.get(base.id, set()))
+    total_words = base.word_count
+    remaining = [item for item in passages if item.id != base.id]
+
+    while True:
+        best = None
+        best_gain = 0
+        for passage in remaining:
+            if total_words + passage.word_count > max_words:
+                continue
+            gain = len(token_map.get(passage.id, set()) - covered)
+            if gain > best_gain:
+                best = passage
+                best_gain = gain
+            elif gain == best_gain and gain > 0 and best is not None:
+                if passage.word_count < best.word_count:
+                    best = passage
+        if best is None:
+            break
+        selected.append(best)
+        covered.update(token_map.get(best.id, set()))
+        total_words += best.word_count
+        remaining = [item for item in remaining if item.id != best.id]
+
+    if len({item.source_id for item in selected}) == 1:
+        selected = sorted(selected, key=lambda item: item.position)
+    return selected, total_words, covered
+
+
+def make_candidates(size: int, vocabulary: int, rng: random.Random):
+    # Zipf-like token draws so common words overlap heavily between passages.
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    words = [f"w{rank}" for rank in range(vocabulary)]
+    passages = []
+    rows = []
+    for idx in range(size):
+        word_count = rng.randint(30, 160)
+        passages.append(Passage(id=idx + 1, source_id=rng.randint(1, 20), position=idx, word_count=word_count))
+        rows.extend((idx + 1, token) for token in set(rng.choices(words, weights=weights, k=word_count)))
+    return passages, rows
+
+
+def token_sets(rows):
+    token_map = {}
+    for passage_id, token in rows:
+        token_map.setdefault(passage_id, set()).add(token)
+    return token_map
+
+
+def timed(label: str, func_, repeat: int):
+    best = None
+    value = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = func_()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<8} {best * 1000:9.1f} ms")
+    return value
+
+
+def run(sizes: list[int], bases: int, max_words: int, vocabulary: int, repeat: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for size in sizes:
+        candidates, rows = make_candidates(size, vocabulary, rng)
+        print(f"candidates={size}")
+
+        # Both sides start from the (passage_id, token) rows the endpoint fetches.
+        def sets():
+            token_map = token_sets(rows)
+            ordered = sorted(candidates, key=lambda item: (-len(token_map[item.id]), item.word_count))
+            return [legacy_bundle(base, ordered, token_map, max_words) for base in ordered[:bases]]
+
+        def engine():
+            index = ReadingIndex(rows)
+            ordered = sorted(candidates, key=lambda item: (-index.size(item.id), item.word_count))
+            return index, [build_bundle(base, ordered, index, max_words) for base in ordered[:bases]]
+
+        legacy = timed("sets", sets, repeat)
+
+        index, bundles = timed("bitmask", engine, repeat)
+        mismatched = 0
+        for (old_sel, old_words, old_cov), (new_sel, new_words, new_mask) in zip(legacy, bundles):
+            if (
+                [item.id for item in old_sel] != [item.id for item in new_sel]
+                or old_words != new_words
+                or old_cov != index.tokens_of(new_mask)
+            ):
+                mismatched += 1
+        if mismatched:
+            print(f"  MISMATCH in {mismatched} bundles")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="80,500,5000")
+    parser.add_argument("--bases", type=int, default=10)
+    parser.add_argument("--max-words", type=int, default=600)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    run(sizes, args.bases, args.max_words, args.vocabulary, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
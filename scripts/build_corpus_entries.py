@@ -9,12 +9,22 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
-from sqlalchemy import delete, func, or_, select
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
 sys.path.append(str(API_DIR))
 
+from app.core.corpus_catalog import mark_corpora_changed  # noqa: E402
+from app.core.corpus_versions import (  # noqa: E402
+    activate_version,
+    active_entries,
+    collect_retired_versions,
+    discard_staged_versions,
+    next_version,
+)
+from app.core.words import ensure_word_ids, find_word_ids, lemma_key  # noqa: E402
 from app.db.session import AsyncSessionLocal  # noqa: E402
 from app.models import (  # noqa: E402
     Corpus,
@@ -27,10 +37,7 @@ from app.models import (  # noqa: E402
 
 SPLIT_RE = re.compile(r"[;,/]")
 SPACE_RE = re.compile(r"\s+")
-
-
-def normalize_key(value: str) -> str:
-    return SPACE_RE.sub(" ", value.strip()).lower()
+BATCH_SIZE = 1000
 
 
 def clean_text(value: str) -> str:
@@ -46,50 +53,35 @@ def split_translation(value: str) -> list[str]:
     return parts
 
 
-async def load_word_index(session) -> tuple[dict[tuple[str, str], int], dict[int, str]]:
-    result = await session.execute(select(Word.id, Word.lemma, Word.lang))
-    mapping: dict[tuple[str, str], int] = {}
-    id_to_lang: dict[int, str] = {}
-    for word_id, lemma, lang in result.fetchall():
-        normalized = normalize_key(lemma)
-        mapping.setdefault((lang, normalized), word_id)
-        id_to_lang.setdefault(word_id, lang)
-    return mapping, id_to_lang
-
-
-async def ensure_word(
-    session, word_index, id_to_lang, lemma: str, lang: str, apply: bool
-) -> int | None:
-    normalized = normalize_key(lemma)
-    if not normalized:
-        return None
-    key = (lang, normalized)
-    existing = word_index.get(key)
-    if existing:
-        return existing
-    if not apply:
-        return None
-    cleaned = clean_text(lemma)
-    if not cleaned:
-        return None
-    word = Word(lemma=cleaned, lang=lang)
-    session.add(word)
-    await session.flush()
-    word_index[key] = word.id
-    id_to_lang[word.id] = lang
-    return word.id
-
-
-async def build_entries_for_corpus(
-    session,
-    corpus: Corpus,
-    word_index,
-    id_to_lang,
-    apply: bool,
-    reset: bool,
-) -> None:
+async def resolve_words(session, wanted: dict[tuple[str, str], str], apply: bool) -> dict[tuple[str, str], int]:
+    # `wanted` maps (lang, lemma_key) to the cleaned lemma used when the word is missing.
+    by_lang: dict[str, list[str]] = defaultdict(list)
+    for (lang, _key), lemma in wanted.items():
+        by_lang[lang].append(lemma)
+    resolved: dict[tuple[str, str], int] = {}
+    for lang, lemmas in by_lang.items():
+        word_ids = await (ensure_word_ids if apply else find_word_ids)(session, lang, lemmas)
+        resolved.update(((lang, key), word_id) for key, word_id in word_ids.items())
+    return resolved
+
+
+async def insert_entries(session, corpus_id: int, version: int, stats) -> list[int]:
+    entry_ids: list[int] = []
+    for start in range(0, len(stats), BATCH_SIZE):
+        result = await session.execute(
+            insert(CorpusEntry).returning(CorpusEntry.id, sort_by_parameter_order=True),
+            [
+                {"corpus_id": corpus_id, "version": version, "count": int(count or 0), "rank": rank}
+                for _word_id, count, rank, _lemma, _lang in stats[start : start + BATCH_SIZE]
+            ],
+        )
+        entry_ids.extend(result.scalars().all())
+    return entry_ids
+
+
+async def build_entries_for_corpus(session, corpus: Corpus, apply: bool, reset: bool) -> None:
     existing_count = await session.scalar(
-        select(func.count()).select_from(CorpusEntry).where(CorpusEntry.corpus_id == corpus.id)
+        select(func.count()).select_from(CorpusEntry).where(CorpusEntry.corpus_id == corpus.id, active_entries())
     )
     if existing_count and not reset:
         print(f"Skip {corpus.slug}: already has entries ({existing_count}). Use --reset.")
@@ -112,81 +104,63 @@ async def build_entries_for_corpus(
         print(f"Skip {corpus.slug}: no corpus words.")
         return
 
-    stats_word_ids = [row[0] for row in stats]
     translations_result = await session.execute(
         select(Translation.word_id, Translation.translation, Translation.target_lang)
-        .where(Translation.word_id.in_(stats_word_ids))
+        .where(Translation.word_id.in_(select(CorpusWordStat.word_id).where(CorpusWordStat.corpus_id == corpus.id)))
         .where(or_(Translation.source.is_(None), Translation.source != "custom"))
         .order_by(Translation.word_id, Translation.id)
     )
     translations_map: dict[int, list[tuple[str, str]]] = defaultdict(list)
+    wanted: dict[tuple[str, str], str] = {}
     for word_id, translation, target_lang in translations_result.fetchall():
         normalized_lang = (target_lang or "").strip().lower()
         if not translation or not normalized_lang:
             continue
         for part in split_translation(translation):
-            translations_map[word_id].append((normalized_lang, part))
-
-    if apply and reset and existing_count:
-        await session.execute(
-            delete(CorpusEntryTerm).where(
-                CorpusEntryTerm.entry_id.in_(
-                    select(CorpusEntry.id).where(CorpusEntry.corpus_id == corpus.id)
-                )
-            )
-        )
-        await session.execute(delete(CorpusEntry).where(CorpusEntry.corpus_id == corpus.id))
-
-    created = 0
-    for word_id, count, rank, lemma, lang in stats:
-        if apply:
-            entry = CorpusEntry(corpus_id=corpus.id, count=int(count or 0), rank=rank)
-            session.add(entry)
-            await session.flush()
-            entry_id = entry.id
-        else:
-            entry_id = None
-
-        if apply and entry_id is not None:
-            session.add(
-                CorpusEntryTerm(
-                    entry_id=entry_id,
-                    word_id=word_id,
-                    lang=lang,
-                    is_primary=True,
-                )
-            )
+            key = (normalized_lang, lemma_key(part))
+            if not key[1]:
+                continue
+            wanted.setdefault(key, clean_text(part))
+            translations_map[word_id].append(key)
 
+    word_ids = await resolve_words(session, wanted, apply)
+
+    entry_ids: list[int | None] = [None] * len(stats)
+    version = None
+    if apply:
+        # The rebuild is staged as a new version; the current entries stay live until the switch.
+        await discard_staged_versions(session, [corpus.id])
+        version = await next_version(session, corpus.id)
+        entry_ids = await insert_entries(session, corpus.id, version, stats)
+
+    terms = []
+    for entry_id, (word_id, _count, _rank, _lemma, lang) in zip(entry_ids, stats):
+        terms.append({"entry_id": entry_id, "word_id": word_id, "lang": lang, "is_primary": True})
         added_word_ids = {word_id}
         primary_langs = {lang}
-        for target_lang, value in translations_map.get(word_id, []):
-            term_id = await ensure_word(session, word_index, id_to_lang, value, target_lang, apply)
+        for key in translations_map.get(word_id, []):
+            term_id = word_ids.get(key)
             if term_id is None or term_id in added_word_ids:
                 continue
+            target_lang = key[0]
             is_primary = target_lang not in primary_langs
-            if apply and entry_id is not None:
-                session.add(
-                    CorpusEntryTerm(
-                        entry_id=entry_id,
-                        word_id=term_id,
-                        lang=target_lang,
-                        is_primary=is_primary,
-                    )
-                )
+            terms.append({"entry_id": entry_id, "word_id": term_id, "lang": target_lang, "is_primary": is_primary})
             added_word_ids.add(term_id)
             if is_primary:
                 primary_langs.add(target_lang)
 
-        created += 1
-
     if apply:
+        for start in range(0, len(terms), BATCH_SIZE):
+            await session.execute(insert(CorpusEntryTerm), terms[start : start + BATCH_SIZE])
+        await activate_version(session, corpus.id, version)
+        await mark_corpora_changed(session, [corpus.id])
         await session.commit()
-    print(f"{corpus.slug}: entries={created}, words={len(stats_word_ids)}")
+        await collect_retired_versions(session, [corpus.id])
+    print(f"{corpus.slug}: entries={len(stats)}, terms={len(terms)}, translation words={len(word_ids)}/{len(wanted)}")
 
 
 async def run(slug: str | None, apply: bool, reset: bool) -> None:
     async with AsyncSessionLocal() as session:
-        word_index, id_to_lang = await load_word_index(session)
         if slug:
             result = await session.execute(select(Corpus).where(Corpus.slug == slug))
             corpora = [row for row in result.scalars().all()]
@@ -199,21 +173,14 @@ async def run(slug: str | None, apply: bool, reset: bool) -> None:
             return
 
         for corpus in corpora:
-            await build_entries_for_corpus(
-                session,
-                corpus,
-                word_index,
-                id_to_lang,
-                apply=apply,
-                reset=reset,
-            )
+            await build_entries_for_corpus(session, corpus, apply=apply, reset=reset)
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build corpus entries from words + translations.")
     parser.add_argument("--slug", default=None, help="Corpus slug to process.")
     parser.add_argument("--apply", action="store_true", help="Apply changes to the database.")
-    parser.add_argument("--reset", action="store_true", help="Clear existing entries before rebuild.")
+    parser.add_argument("--reset", action="store_true", help="Rebuild corpora that already have entries.")
     return parser.parse_args()
 
 
@@ -0,0 +1,213 @@
+"""Check reading token id arrays against the legacy reading_passage_tokens rows.
+
+Run between `alembic upgrade 2f3a4b5c6d7e` and the revision that drops the legacy table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import column, func, or_, select, table, text
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.api.reading import (  # noqa: E402
+    CANDIDATE_LIMIT,
+    DEFAULT_DAYS,
+    DEFAULT_TARGET_WORDS,
+    KNOWN_STATUSES,
+    collect_target_tokens,
+    enabled_corpus_ids,
+    load_target_token_ids,
+    reading_source_ids,
+    reading_target_range,
+    select_candidates,
+)
+from app.core.reading_engine import MIN_LANG_PURITY, ReadingIndex, build_bundle  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import LearningProfile, ReadingPassage, ReadingPassageBlock, UserWord  # noqa: E402
+
+legacy_tokens = table(
+    "reading_passage_tokens",
+    column("passage_id"),
+    column("token"),
+)
+
+
+async def count_posting_mismatches(session) -> int:
+    result = await session.execute(
+        text(
+            """
+            SELECT count(*)
+            FROM reading_passages AS p
+            WHERE coalesce(p.token_ids, '{}') IS DISTINCT FROM (
+                SELECT coalesce(array_agg(t.id ORDER BY t.id), '{}')
+                FROM reading_passage_tokens AS rpt
+                JOIN reading_tokens AS t ON t.token = rpt.token
+                WHERE rpt.passage_id = p.id
+            )
+            """
+        )
+    )
+    return int(result.scalar() or 0)
+
+
+async def print_sizes(session) -> None:
+    result = await session.execute(
+        text(
+            """
+            SELECT
+                pg_total_relation_size('reading_passage_tokens'),
+                pg_total_relation_size('reading_tokens'),
+                pg_relation_size('ix_reading_passages_token_ids'),
+                (SELECT coalesce(sum(pg_column_size(token_ids)), 0) FROM reading_passages)
+            """
+        )
+    )
+    legacy, dictionary, gin, arrays = result.one()
+    print(f"legacy rows+indexes: {legacy / 2**20:.1f} MiB")
+    print(f"dictionary: {dictionary / 2**20:.1f} MiB, arrays: {arrays / 2**20:.1f} MiB, gin: {gin / 2**20:.1f} MiB")
+
+
+async def legacy_candidates(session, profile_id, source_ids: list[int], target_tokens: list[str]):
+    hits_expr = func.count(func.distinct(legacy_tokens.c.token)).label("hits")
+    blocked_subquery = select(ReadingPassageBlock.passage_id).where(ReadingPassageBlock.profile_id == profile_id)
+    result = await session.execute(
+        select(
+            ReadingPassage.id,
+            ReadingPassage.source_id,
+            ReadingPassage.position,
+            ReadingPassage.word_count,
+            hits_expr,
+        )
+        .select_from(ReadingPassage)
+        .join(legacy_tokens, legacy_tokens.c.passage_id == ReadingPassage.id)
+        .where(
+            ReadingPassage.source_id.in_(source_ids),
+            legacy_tokens.c.token.in_(target_tokens),
+            ReadingPassage.id.notin_(blocked_subquery),
+            or_(ReadingPassage.lang_purity >= MIN_LANG_PURITY, ReadingPassage.lang_purity.is_(None)),
+        )
+        .group_by(
+            ReadingPassage.id,
+            ReadingPassage.source_id,
+            ReadingPassage.position,
+            ReadingPassage.word_count,
+        )
+        .order_by(hits_expr.desc(), ReadingPassage.word_count.asc(), ReadingPassage.id)
+        .limit(CANDIDATE_LIMIT)
+    )
+    return result.fetchall()
+
+
+def bundle_summaries(rows, index: ReadingIndex, target_mask: int, names, max_words: int):
+    ordered = sorted(rows, key=lambda item: (-index.size(item.id), item.word_count))
+    summaries = []
+    for base in ordered[:10]:
+        selected, total_words, covered = build_bundle(base, ordered, index, max_words)
+        highlight = sorted(names(token) for token in index.tokens_of(target_mask & covered))
+        summaries.append(([item.id for item in selected], total_words, highlight))
+    return summaries
+
+
+async def check_profile(session, profile, target_words: int, days: int) -> tuple[bool, float, float]:
+    target_tokens = await collect_target_tokens(profile.id, target_words, days, session)
+    if not target_tokens:
+        return True, 0.0, 0.0
+    source_ids = await reading_source_ids(profile, await enabled_corpus_ids(profile.id, session), session)
+    if not source_ids:
+        return True, 0.0, 0.0
+
+    started = time.perf_counter()
+    old_rows = await legacy_candidates(session, profile.id, source_ids, target_tokens)
+    legacy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    token_names = await load_target_token_ids(target_tokens, session)
+    new_rows = await select_candidates(profile.id, source_ids, list(token_names), session)
+    postings_time = time.perf_counter() - started
+
+    if [(row.id, row.hits) for row in old_rows] != [(row.id, row.hits) for row in new_rows]:
+        print(f"profile {profile.id}: candidate lists differ")
+        return False, legacy_time, postings_time
+
+    passage_ids = [row.id for row in new_rows]
+    legacy_rows = await session.execute(
+        select(legacy_tokens.c.passage_id, legacy_tokens.c.token).where(
+            legacy_tokens.c.passage_id.in_(passage_ids)
+        )
+    )
+    old_index = ReadingIndex(legacy_rows.fetchall())
+    arrays = await session.execute(
+        select(ReadingPassage.id, ReadingPassage.token_ids).where(ReadingPassage.id.in_(passage_ids))
+    )
+    new_index = ReadingIndex(
+        (passage_id, token_id) for passage_id, token_ids in arrays.fetchall() for token_id in token_ids or ()
+    )
+    _min_words, max_words = reading_target_range(target_words)
+    old_bundles = bundle_summaries(old_rows, old_index, old_index.mask_of(target_tokens), str, max_words)
+    new_bundles = bundle_summaries(
+        new_rows, new_index, new_index.mask_of(token_names), token_names.__getitem__, max_words
+    )
+    if old_bundles != new_bundles:
+        print(f"profile {profile.id}: bundles differ")
+        return False, legacy_time, postings_time
+    return True, legacy_time, postings_time
+
+
+async def run(profiles: int, target_words: int, days: int, skip_postings: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        await print_sizes(session)
+        failed = False
+        if not skip_postings:
+            mismatches = await count_posting_mismatches(session)
+            print(f"passages with mismatched token ids: {mismatches}")
+            failed = mismatches > 0
+
+        profile_result = await session.execute(
+            select(LearningProfile)
+            .where(
+                LearningProfile.id.in_(
+                    select(UserWord.profile_id).where(
+                        UserWord.status.in_(KNOWN_STATUSES),
+                        UserWord.learned_at.is_not(None),
+                    )
+                )
+            )
+            .limit(profiles)
+        )
+        checked = 0
+        legacy_total = 0.0
+        postings_total = 0.0
+        for profile in profile_result.scalars().all():
+            ok, legacy_time, postings_time = await check_profile(session, profile, target_words, days)
+            failed = failed or not ok
+            legacy_total += legacy_time
+            postings_total += postings_time
+            checked += 1
+
+    print(f"profiles checked: {checked}")
+    print(f"candidate query: legacy {legacy_total * 1000:.1f} ms, postings {postings_total * 1000:.1f} ms")
+    if failed:
+        raise SystemExit("Token postings differ from the legacy table.")
+    print("Token postings match the legacy table.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument("--target-words", type=int, default=DEFAULT_TARGET_WORDS)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--skip-postings", action="store_true", help="Skip the full-table token id comparison.")
+    args = parser.parse_args()
+    asyncio.run(run(args.profiles, args.target_words, args.days, args.skip_postings))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,123 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import re
 import shutil
 import sqlite3
-from collections import defaultdict
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
 SLUG_RE = re.compile(r"_(ru|en)_(ru|en)$", re.IGNORECASE)
+DIRECTION_SUFFIXES = ("_ru_ru", "_ru_en", "_en_ru", "_en_en")
+
+# Each backend provides the entry and term rows plus the expression for the last six
+# characters of the corpus slug; the cleaning itself is the same SQL on both.
+SQLITE_SOURCE = {
+    "entries": "SELECT id, corpus_slug AS corpus, coalesce(count, 0) AS count FROM entries",
+    # rowid keeps the old behaviour where the last primary term of a language won.
+    "terms": "SELECT entry_id, lemma, lang, is_primary, rowid AS term_order FROM terms",
+    "suffix": "substr(lower(corpus), -6)",
+    "temp_table": "CREATE TEMP TABLE clean_decisions AS",
+}
+POSTGRES_SOURCE = {
+    "entries": """
+        SELECT e.id, c.slug AS corpus, coalesce(e.count, 0) AS count
+        FROM corpus_entries AS e
+        JOIN corpora AS c ON c.id = e.corpus_id AND c.active_version = e.version
+    """,
+    "terms": """
+        SELECT t.entry_id, w.lemma, t.lang, t.is_primary, t.id AS term_order
+        FROM corpus_entry_terms AS t
+        JOIN words AS w ON w.id = t.word_id
+    """,
+    "suffix": "right(lower(corpus), 6)",
+    "temp_table": "CREATE TEMP TABLE clean_decisions ON COMMIT DROP AS",
+}
+
+DECISIONS_SQL = """
+{temp_table}
+WITH entry_rows AS ({entries}),
+term_rows AS ({terms}),
+directed AS (
+    SELECT id, corpus, count, substr({suffix}, 2, 2) AS source_lang
+    FROM entry_rows
+    WHERE {suffix} IN ({suffixes})
+),
+sourced AS (
+    -- The last primary term in the corpus source language names the entry's lemma.
+    SELECT
+        d.id,
+        d.corpus,
+        d.count,
+        d.source_lang,
+        trim(t.lemma) AS lemma,
+        row_number() OVER (PARTITION BY d.id ORDER BY t.term_order DESC) AS pick
+    FROM directed AS d
+    JOIN term_rows AS t ON t.entry_id = d.id AND lower(trim(t.lang)) = d.source_lang
+    WHERE t.is_primary AND trim(coalesce(t.lemma, '')) <> ''
+),
+grouped AS (
+    SELECT
+        id,
+        corpus,
+        count,
+        row_number() OVER lemma_group AS group_rank,
+        -- Same window as the rank, so both come out of one sort.
+        first_value(count) OVER lemma_group AS max_count,
+        min(id) OVER (PARTITION BY source_lang, lemma) AS group_first
+    FROM sourced
+    WHERE pick = 1
+    WINDOW lemma_group AS (PARTITION BY source_lang, lemma ORDER BY count DESC, id)
+)
+SELECT
+    id,
+    corpus,
+    group_first,
+    group_rank,
+    group_rank > :keep_top
+        AND count < max_count * CAST(:min_ratio AS DOUBLE PRECISION)
+        AND count < :min_count AS is_removed
+FROM grouped
+"""
+
+# The report used to list corpora in the order a walk over lemma groups (by first entry, then
+# by rank) first reached them; first_removed/first_kept are those positions, so ties keep it.
+SUMMARY_SQL = """
+WITH visits AS (
+    SELECT corpus, is_removed, row_number() OVER (ORDER BY group_first, group_rank) AS visit
+    FROM clean_decisions
+)
+SELECT
+    corpus,
+    sum(CASE WHEN is_removed THEN 1 ELSE 0 END) AS removed,
+    sum(CASE WHEN is_removed THEN 0 ELSE 1 END) AS kept,
+    min(CASE WHEN is_removed THEN visit END) AS first_removed,
+    min(CASE WHEN is_removed THEN NULL ELSE visit END) AS first_kept
+FROM visits
+GROUP BY corpus
+"""
 
 
 @dataclass
-class EntryMeta:
-    entry_id: int
-    corpus_slug: str
-    count: int
+class CleanPlan:
+    entries_total: int = 0
+    removed_by_corpus: dict[str, int] = field(default_factory=dict)
+    kept_by_corpus: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def marked(self) -> int:
+        return sum(self.removed_by_corpus.values())
+
+    @property
+    def skipped(self) -> int:
+        # Entries without a ru/en direction or a primary source lemma never reach clean_decisions.
+        return self.entries_total - self.marked - sum(self.kept_by_corpus.values())
 
 
 def parse_direction(slug: str) -> tuple[str | None, str | None]:
@@ -27,20 +129,149 @@ def parse_direction(slug: str) -> tuple[str | None, str | None]:
     return match.group(1).lower(), match.group(2).lower()
 
 
-def load_rows(conn: sqlite3.Connection, query: str):
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    return cur.execute(query).fetchall()
+def decisions_sql(source: dict[str, str]) -> str:
+    suffixes = ", ".join(f"'{suffix}'" for suffix in DIRECTION_SUFFIXES)
+    return DECISIONS_SQL.format(suffixes=suffixes, **source)
+
+
+def build_plan(entries_total: int, summary_rows) -> CleanPlan:
+    plan = CleanPlan(entries_total=entries_total)
+    rows = [tuple(row) for row in summary_rows]
+    for corpus, removed, _kept, _first_removed, _first_kept in sorted(
+        (row for row in rows if row[1]), key=lambda row: row[3]
+    ):
+        plan.removed_by_corpus[corpus] = int(removed)
+    for corpus, _removed, kept, _first_removed, _first_kept in sorted(
+        (row for row in rows if row[2]), key=lambda row: row[4]
+    ):
+        plan.kept_by_corpus[corpus] = int(kept)
+    return plan
+
+
+def report_lines(plan: CleanPlan) -> list[str]:
+    lines = [
+        f"Entries total: {plan.entries_total}",
+        f"Skipped entries (no primary source lemma): {plan.skipped}",
+        f"Marked for removal: {plan.marked}",
+        "",
+        "Removed by corpus:",
+    ]
+    for slug, count in sorted(plan.removed_by_corpus.items(), key=lambda x: x[1], reverse=True):
+        lines.append(f"  {slug}: {count}")
+    lines.append("")
+    lines.append("Kept by corpus:")
+    for slug, count in sorted(plan.kept_by_corpus.items(), key=lambda x: x[1], reverse=True):
+        lines.append(f"  {slug}: {count}")
+    return lines
+
+
+def plan_sqlite(conn: sqlite3.Connection, min_ratio: float, min_count: int, keep_top: int) -> CleanPlan:
+    # Leaves the clean_decisions temp table on the connection for the deletes.
+    params = {"min_ratio": min_ratio, "min_count": min_count, "keep_top": keep_top}
+    conn.execute("DROP TABLE IF EXISTS temp.clean_decisions")
+    conn.execute(decisions_sql(SQLITE_SOURCE), params)
+    entries_total = conn.execute(f"SELECT count(*) FROM ({SQLITE_SOURCE['entries']})").fetchone()[0]
+    return build_plan(entries_total, conn.execute(SUMMARY_SQL).fetchall())
+
+
+def apply_sqlite(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM terms WHERE entry_id IN (SELECT id FROM temp.clean_decisions WHERE is_removed)")
+    conn.execute("DELETE FROM entries WHERE id IN (SELECT id FROM temp.clean_decisions WHERE is_removed)")
+    conn.commit()
+
+
+def run_sqlite(
+    db_path: Path,
+    out_path: Path,
+    report_path: Path,
+    min_ratio: float,
+    min_count: int,
+    keep_top: int,
+    apply: bool,
+) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"DB not found: {db_path}")
+
+    if apply:
+        if out_path.exists():
+            out_path.unlink()
+        shutil.copy(db_path, out_path)
+        db_path = out_path
+
+    conn = sqlite3.connect(db_path)
+    try:
+        plan = plan_sqlite(conn, min_ratio, min_count, keep_top)
+        lines = report_lines(plan)
+        report_path.write_text("\n".join(lines), encoding="utf-8")
+        if apply:
+            apply_sqlite(conn)
+    finally:
+        conn.close()
+
+    print("\n".join(lines))
+    if not apply:
+        print(f"Dry run. Report saved to {report_path}")
+        return
+    print(f"Cleaned db saved to {out_path}")
+
+
+async def run_postgres(
+    report_path: Path,
+    min_ratio: float,
+    min_count: int,
+    keep_top: int,
+    batch_size: int,
+    apply: bool,
+) -> None:
+    # Imported here so the SQLite mode runs without the API dependencies installed.
+    from sqlalchemy import delete, select, text
+
+    from app.core.corpus_catalog import mark_corpora_changed
+    from app.db.session import AsyncSessionLocal
+    from app.models import Corpus, CorpusEntry
+
+    params = {"min_ratio": min_ratio, "min_count": min_count, "keep_top": keep_top}
+    async with AsyncSessionLocal() as session:
+        await session.execute(text(decisions_sql(POSTGRES_SOURCE)), params)
+        entries_total = await session.scalar(text(f"SELECT count(*) FROM ({POSTGRES_SOURCE['entries']}) AS e"))
+        summary = await session.execute(text(SUMMARY_SQL))
+        plan = build_plan(entries_total or 0, summary.fetchall())
+        removed = await session.execute(text("SELECT id FROM clean_decisions WHERE is_removed ORDER BY id"))
+        remove_ids = list(removed.scalars().all())
+        # Drops clean_decisions before the deletes run in their own transactions.
+        await session.commit()
+
+        lines = report_lines(plan)
+        report_path.write_text("\n".join(lines), encoding="utf-8")
+        print("\n".join(lines))
+        if not apply:
+            print(f"Dry run. Report saved to {report_path}. Use --apply to delete from Postgres.")
+            return
+
+        for start in range(0, len(remove_ids), batch_size):
+            chunk = remove_ids[start : start + batch_size]
+            await session.execute(
+                delete(CorpusEntry).where(CorpusEntry.id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        if plan.removed_by_corpus:
+            result = await session.execute(select(Corpus.id).where(Corpus.slug.in_(plan.removed_by_corpus)))
+            await mark_corpora_changed(session, list(result.scalars().all()))
+            await session.commit()
+    print(f"Removed {len(remove_ids)} entries from Postgres.")
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--db", type=Path, default=Path("corpora.db"))
     parser.add_argument("--out", type=Path, default=Path("corpora_clean_freq.db"))
-    parser.add_argument("--apply", action="store_true", help="Write cleaned db to --out.")
+    parser.add_argument("--postgres", action="store_true", help="Clean active corpus_entries in Postgres instead.")
+    parser.add_argument("--apply", action="store_true", help="Write cleaned db to --out (or delete in Postgres).")
     parser.add_argument("--min-ratio", type=float, default=0.2)
     parser.add_argument("--min-count", type=int, default=30)
     parser.add_argument("--keep-top", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Postgres delete batch size.")
     parser.add_argument("--report", type=Path, default=Path("corpora_clean_freq_report.txt"))
     args = parser.parse_args()
 
@@ -49,99 +280,12 @@ def main() -> None:
     if args.keep_top < 1:
         raise SystemExit("--keep-top must be >= 1.")
 
-    db_path = args.db
-    if not db_path.exists():
-        raise SystemExit(f"DB not found: {db_path}")
-
-    conn = sqlite3.connect(db_path)
-    entries = load_rows(conn, "SELECT id, corpus_slug, count FROM entries")
-    terms = load_rows(conn, "SELECT entry_id, lemma, lang, is_primary FROM terms")
-    conn.close()
-
-    primary_by_entry_lang: dict[int, dict[str, str]] = defaultdict(dict)
-    for row in terms:
-        if not row["is_primary"]:
-            continue
-        lemma = (row["lemma"] or "").strip()
-        lang = (row["lang"] or "").strip().lower()
-        if not lemma or not lang:
-            continue
-        primary_by_entry_lang[int(row["entry_id"])][lang] = lemma
-
-    grouped: dict[tuple[str, str], list[EntryMeta]] = defaultdict(list)
-    skipped_entries = 0
-    for row in entries:
-        entry_id = int(row["id"])
-        slug = row["corpus_slug"]
-        source_lang, _target_lang = parse_direction(slug)
-        if not source_lang:
-            skipped_entries += 1
-            continue
-        lemma = primary_by_entry_lang.get(entry_id, {}).get(source_lang)
-        if not lemma:
-            skipped_entries += 1
-            continue
-        grouped[(source_lang, lemma)].append(
-            EntryMeta(entry_id=entry_id, corpus_slug=slug, count=int(row["count"] or 0))
+    if args.postgres:
+        asyncio.run(
+            run_postgres(args.report, args.min_ratio, args.min_count, args.keep_top, args.batch_size, args.apply)
         )
-
-    remove_entry_ids: set[int] = set()
-    removed_by_corpus: dict[str, int] = defaultdict(int)
-    keep_by_corpus: dict[str, int] = defaultdict(int)
-
-    for _key, items in grouped.items():
-        items.sort(key=lambda x: x.count, reverse=True)
-        if not items:
-            continue
-        max_count = items[0].count
-        keep_ids = {item.entry_id for item in items[: args.keep_top]}
-        for item in items:
-            if item.entry_id in keep_ids:
-                keep_by_corpus[item.corpus_slug] += 1
-                continue
-            threshold = max_count * args.min_ratio
-            if item.count >= threshold or item.count >= args.min_count:
-                keep_by_corpus[item.corpus_slug] += 1
-                continue
-            remove_entry_ids.add(item.entry_id)
-            removed_by_corpus[item.corpus_slug] += 1
-
-    report_lines = []
-    report_lines.append(f"Entries total: {len(entries)}")
-    report_lines.append(f"Skipped entries (no primary source lemma): {skipped_entries}")
-    report_lines.append(f"Marked for removal: {len(remove_entry_ids)}")
-    report_lines.append("")
-    report_lines.append("Removed by corpus:")
-    for slug, count in sorted(removed_by_corpus.items(), key=lambda x: x[1], reverse=True):
-        report_lines.append(f"  {slug}: {count}")
-
-    report_lines.append("")
-    report_lines.append("Kept by corpus:")
-    for slug, count in sorted(keep_by_corpus.items(), key=lambda x: x[1], reverse=True):
-        report_lines.append(f"  {slug}: {count}")
-
-    args.report.write_text("\n".join(report_lines), encoding="utf-8")
-
-    if not args.apply:
-        print("\n".join(report_lines))
-        print(f"Dry run. Report saved to {args.report}")
         return
-
-    if args.out.exists():
-        args.out.unlink()
-    shutil.copy(db_path, args.out)
-
-    out_conn = sqlite3.connect(args.out)
-    out_cur = out_conn.cursor()
-    if remove_entry_ids:
-        ids = ",".join(str(entry_id) for entry_id in remove_entry_ids)
-        out_cur.execute(f"DELETE FROM terms WHERE entry_id IN ({ids})")
-        out_cur.execute(f"DELETE FROM entries WHERE id IN ({ids})")
-    out_conn.commit()
-    out_conn.close()
-
-    print("\n".join(report_lines))
-    print(f"Cleaned db saved to {args.out}")
+    run_sqlite(args.db, args.out, args.report, args.min_ratio, args.min_count, args.keep_top, args.apply)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""Find and remove near-duplicate reading passages with MinHash/LSH."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy import case, delete, select, update
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+SCRIPTS_DIR = BASE_DIR / "scripts"
+sys.path.append(str(API_DIR))
+sys.path.append(str(SCRIPTS_DIR))
+
+from app.core.minhash import DUPLICATE_THRESHOLD, LshIndex, lsh_band_keys, minhash_signature  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import ReadingPassage, ReadingRecommendationCache, ReadingSource  # noqa: E402
+
+from import_reading_texts import tokenize_words  # noqa: E402
+
+
+async def scan_lang(session, lang: str, threshold: float, batch_size: int, apply: bool):
+    # Passages are visited in id order, so the earliest imported copy stays canonical.
+    index = LshIndex(threshold)
+    clusters: dict[int, list[tuple[int, float]]] = {}
+    signed = 0
+    last_id = 0
+    while True:
+        result = await session.execute(
+            select(
+                ReadingPassage.id,
+                ReadingPassage.minhash,
+                ReadingPassage.lsh_bands,
+                # Text is only needed for passages imported before signatures existed.
+                case((ReadingPassage.minhash.is_(None), ReadingPassage.text), else_=None).label("text"),
+            )
+            .join(ReadingSource, ReadingSource.id == ReadingPassage.source_id)
+            .where(ReadingSource.lang == lang, ReadingPassage.id > last_id)
+            .order_by(ReadingPassage.id)
+            .limit(batch_size)
+        )
+        rows = result.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        values = []
+        for row in rows:
+            signature = row.minhash
+            band_keys = row.lsh_bands
+            if signature is None:
+                signature = minhash_signature(tokenize_words(row.text or ""))
+                band_keys = lsh_band_keys(signature)
+                values.append({"id": row.id, "minhash": signature, "lsh_bands": band_keys})
+            match = index.match(signature, band_keys)
+            if match is not None:
+                canonical, score = match
+                clusters.setdefault(canonical, []).append((row.id, score))
+                continue
+            index.add(row.id, signature, band_keys)
+        if values and apply:
+            await session.execute(update(ReadingPassage), values)
+            await session.commit()
+        signed += len(values)
+    return clusters, signed
+
+
+def write_report(path: Path, lang: str, clusters: dict[int, list[tuple[int, float]]]) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        for canonical, members in clusters.items():
+            item = {
+                "lang": lang,
+                "canonical": canonical,
+                "duplicates": [{"id": passage_id, "similarity": round(score, 3)} for passage_id, score in members],
+            }
+            handle.write(json.dumps(item) + "\n")
+
+
+async def run(langs: list[str] | None, threshold: float, batch_size: int, report: str | None, apply: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        if not langs:
+            result = await session.execute(select(ReadingSource.lang).distinct().order_by(ReadingSource.lang))
+            langs = [row.lang for row in result.fetchall()]
+
+        removed = 0
+        for lang in langs:
+            clusters, signed = await scan_lang(session, lang, threshold, batch_size, apply)
+            duplicate_ids = [passage_id for members in clusters.values() for passage_id, _score in members]
+            print(
+                f"{lang}: {len(clusters)} clusters, {len(duplicate_ids)} duplicates, "
+                f"{signed} signatures computed."
+            )
+            for canonical, members in sorted(clusters.items(), key=lambda item: -len(item[1]))[:10]:
+                print(f"  passage {canonical}: {len(members)} copies")
+            if report:
+                write_report(Path(report), lang, clusters)
+            if apply:
+                for start in range(0, len(duplicate_ids), batch_size):
+                    chunk = duplicate_ids[start : start + batch_size]
+                    await session.execute(delete(ReadingPassage).where(ReadingPassage.id.in_(chunk)))
+                    await session.commit()
+            removed += len(duplicate_ids)
+
+        if apply and removed:
+            # Cached bundles may quote removed passages; they rebuild on the next request.
+            await session.execute(delete(ReadingRecommendationCache))
+            await session.commit()
+
+    if not apply:
+        print("Dry run only. Use --apply to store signatures and delete duplicates.")
+    print(f"Done: {removed} duplicate passages.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lang", action="append", help="Language to scan (repeatable, default: all).")
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--report", default=None, help="JSON lines file with one cluster per line.")
+    parser.add_argument("--apply", action="store_true", help="Write changes to the database.")
+    args = parser.parse_args()
+    asyncio.run(run(args.lang, args.threshold, args.batch_size, args.report, args.apply))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,28 @@ import re
 import sqlite3
 import sys
 from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Iterator
 
-from sqlalchemy import delete, select, text
+from sqlalchemy import delete, distinct, func, select, text, tuple_, update
 from sqlalchemy.dialects.postgresql import insert
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
 sys.path.append(str(API_DIR))
 
+from app.core.corpus_catalog import mark_corpora_changed  # noqa: E402
+from app.core.corpus_versions import (  # noqa: E402
+    activate_version,
+    active_entries,
+    active_version,
+    collect_retired_versions,
+    discard_staged_versions,
+    next_version,
+)
+from app.core.words import lemma_key  # noqa: E402
+from app.db.bulk import Progress, copy_records  # noqa: E402
 from app.db.session import AsyncSessionLocal  # noqa: E402
 from app.models import (  # noqa: E402
     Corpus,
@@ -28,6 +40,8 @@ from app.models import (  # noqa: E402
 )
 
 SLUG_RE = re.compile(r"_(ru|en)_(ru|en)$", re.IGNORECASE)
+# words.lemma_key over import_terms.lemma.
+LEMMA_KEY_SQL = "lower(btrim(regexp_replace(lemma, '\\s+', ' ', 'g')))"
 
 CORPUS_NAMES = {
     "agronomandagricult": {
@@ -62,26 +76,23 @@ def normalize_slug(slug: str) -> str:
     return base.lower()
 
 
-def chunked(items: Iterable, size: int) -> Iterable[list]:
-    batch = []
-    for item in items:
-        batch.append(item)
-        if len(batch) >= size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
-
-
-def load_sqlite(db_path: Path):
+def open_sqlite(db_path: Path) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    corpora = cur.execute("SELECT * FROM corpora").fetchall()
-    entries = cur.execute("SELECT * FROM entries").fetchall()
-    terms = cur.execute("SELECT * FROM terms").fetchall()
-    conn.close()
-    return corpora, entries, terms
+    return conn
+
+
+def iter_chunks(conn: sqlite3.Connection, query: str, size: int) -> Iterator[list[sqlite3.Row]]:
+    cursor = conn.execute(query)
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            break
+        yield rows
+
+
+def count_rows(conn: sqlite3.Connection, table: str) -> int:
+    return int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
 
 
 async def upsert_corpora(session, corpora_rows) -> dict[str, int]:
@@ -116,30 +127,165 @@ async def upsert_corpora(session, corpora_rows) -> dict[str, int]:
     return {row.slug: row.id for row in result.fetchall()}
 
 
-async def ensure_words(session, word_pairs: set[tuple[str, str]]) -> None:
-    for batch in chunked(sorted(word_pairs), 1000):
-        rows = [{"lemma": lemma, "lang": lang} for lemma, lang in batch]
-        stmt = insert(Word).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["lemma", "lang"])
-        await session.execute(stmt)
+async def reserve_entry_ids(session, conn: sqlite3.Connection) -> int:
+    # Staged entries reuse the SQLite ids shifted into a freshly reserved block of the
+    # sequence, so they never collide with the live version and terms map by arithmetic.
+    low, high = conn.execute("SELECT MIN(id), MAX(id) FROM entries").fetchone()
+    if low is None:
+        return 0
+    await set_sequence(session, "corpus_entries", "id")
+    base = int(await session.scalar(text("SELECT nextval('corpus_entries_id_seq')")))
+    await session.execute(
+        text("SELECT setval('corpus_entries_id_seq', :last, true)"),
+        {"last": base + int(high) - int(low)},
+    )
+    await session.commit()
+    return base - int(low)
+
+
+async def load_entries(
+    session,
+    conn: sqlite3.Connection,
+    corpora_map: dict[str, int],
+    versions: dict[int, int],
+    id_offset: int,
+    chunk_size: int,
+) -> int:
+    await session.execute(
+        text(
+            "CREATE TEMP TABLE import_entries "
+            "(id bigint, corpus_id bigint, version bigint, count integer, rank integer) ON COMMIT DROP"
+        )
+    )
+    progress = Progress("entries")
+    for rows in iter_chunks(conn, "SELECT id, corpus_slug, count, rank FROM entries", chunk_size):
+        records = []
+        for row in rows:
+            corpus_id = corpora_map.get(row["corpus_slug"])
+            if corpus_id is None:
+                continue
+            records.append(
+                (int(row["id"]) + id_offset, corpus_id, versions[corpus_id], int(row["count"] or 0), row["rank"])
+            )
+        await copy_records(session, "import_entries", ["id", "corpus_id", "version", "count", "rank"], records)
+        await session.execute(
+            text(
+                "INSERT INTO corpus_entries (id, corpus_id, version, count, rank) "
+                "SELECT id, corpus_id, version, count, rank FROM import_entries"
+            )
+        )
+        await session.execute(text("TRUNCATE import_entries"))
+        progress.add(len(rows))
+    await session.commit()
+    progress.report()
+    return progress.rows
+
+
+def clean_term(row) -> tuple[str, str] | None:
+    lemma = (row["lemma"] or "").strip()
+    lang = (row["lang"] or "").strip().lower()
+    if not lemma or not lang:
+        return None
+    return lemma, lang
+
+
+async def create_terms_table(session) -> None:
+    # key is the same expression as words.lemma_key, so staged terms match words by key.
+    await session.execute(
+        text(
+            "CREATE TEMP TABLE import_terms "
+            "(entry_id bigint, lemma varchar(255), lang varchar(2), is_primary boolean, "
+            f"key varchar(255) GENERATED ALWAYS AS ({LEMMA_KEY_SQL}) STORED) ON COMMIT DROP"
+        )
+    )
 
 
-async def fetch_word_ids(session, word_pairs: set[tuple[str, str]]) -> dict[tuple[str, str], int]:
-    by_lang: dict[str, list[str]] = defaultdict(list)
-    for lemma, lang in word_pairs:
-        by_lang[lang].append(lemma)
+async def write_terms(session, records: list[tuple[int, str, str, bool]]) -> None:
+    # Word ids are resolved by joining the chunk against words inside Postgres,
+    # so no lemma map is ever held in Python. Words are matched on lemma_key, so
+    # spelling and case variants reuse the oldest word of their key.
+    await copy_records(session, "import_terms", ["entry_id", "lemma", "lang", "is_primary"], records)
+    await session.execute(
+        text(
+            "INSERT INTO words (lemma, lang) "
+            "SELECT DISTINCT ON (t.lang, t.key) btrim(regexp_replace(t.lemma, '\\s+', ' ', 'g')), t.lang "
+            "FROM import_terms AS t "
+            "WHERE NOT EXISTS (SELECT 1 FROM words AS w WHERE w.lang = t.lang AND w.lemma_key = t.key) "
+            "ORDER BY t.lang, t.key, t.lemma "
+            "ON CONFLICT (lemma, lang) DO NOTHING"
+        )
+    )
+    await session.execute(
+        text(
+            "INSERT INTO corpus_entry_terms (entry_id, word_id, lang, is_primary) "
+            "SELECT t.entry_id, w.id, t.lang, t.is_primary "
+            "FROM import_terms AS t "
+            "JOIN LATERAL ("
+            "SELECT id FROM words WHERE lang = t.lang AND lemma_key = t.key ORDER BY id LIMIT 1"
+            ") AS w ON true "
+            "JOIN corpus_entries AS e ON e.id = t.entry_id "
+            "ON CONFLICT (entry_id, word_id) DO NOTHING"
+        )
+    )
+    await session.execute(text("TRUNCATE import_terms"))
+
 
-    mapping: dict[tuple[str, str], int] = {}
-    for lang, lemmas in by_lang.items():
-        for batch in chunked(lemmas, 1000):
-            result = await session.execute(
-                select(Word.id, Word.lemma, Word.lang).where(
-                    Word.lang == lang, Word.lemma.in_(batch)
-                )
+async def load_terms(session, conn: sqlite3.Connection, id_offset: int, chunk_size: int) -> int:
+    await create_terms_table(session)
+    progress = Progress("terms")
+    for rows in iter_chunks(conn, "SELECT entry_id, lemma, lang, is_primary FROM terms", chunk_size):
+        records = []
+        for row in rows:
+            term = clean_term(row)
+            if term is None:
+                continue
+            lemma, lang = term
+            records.append((int(row["entry_id"]) + id_offset, lemma, lang, bool(row["is_primary"])))
+        await write_terms(session, records)
+        progress.add(len(rows))
+    await session.commit()
+    progress.report()
+    return progress.rows
+
+
+async def validate_staged(
+    session,
+    conn: sqlite3.Connection,
+    corpora_map: dict[str, int],
+    versions: dict[int, int],
+) -> tuple[list[int], list[str]]:
+    expected = {corpus_id: 0 for corpus_id in versions}
+    for slug, total in conn.execute("SELECT corpus_slug, COUNT(*) FROM entries GROUP BY corpus_slug"):
+        corpus_id = corpora_map.get(slug)
+        if corpus_id in expected:
+            expected[corpus_id] = int(total)
+
+    staged = {}
+    if versions:
+        result = await session.execute(
+            select(
+                CorpusEntry.corpus_id,
+                func.count(distinct(CorpusEntry.id)),
+                func.count(CorpusEntryTerm.id),
             )
-            for word_id, lemma, lang in result.fetchall():
-                mapping[(lemma, lang)] = word_id
-    return mapping
+            .outerjoin(CorpusEntryTerm, CorpusEntryTerm.entry_id == CorpusEntry.id)
+            .where(tuple_(CorpusEntry.corpus_id, CorpusEntry.version).in_(list(versions.items())))
+            .group_by(CorpusEntry.corpus_id)
+        )
+        staged = {corpus_id: (entries, terms) for corpus_id, entries, terms in result.fetchall()}
+
+    slugs = {corpus_id: slug for slug, corpus_id in corpora_map.items()}
+    valid = []
+    errors = []
+    for corpus_id, total in expected.items():
+        entries, terms = staged.get(corpus_id, (0, 0))
+        if entries != total:
+            errors.append(f"{slugs[corpus_id]}: staged {entries} entries, expected {total}")
+        elif total and not terms:
+            errors.append(f"{slugs[corpus_id]}: staged entries have no terms")
+        else:
+            valid.append(corpus_id)
+    return valid, errors
 
 
 async def set_sequence(session, table: str, column: str) -> None:
@@ -156,116 +302,269 @@ async def set_sequence(session, table: str, column: str) -> None:
         pass
 
 
-async def run(db_path: Path, apply: bool, drop_missing: bool, replace_all: bool) -> None:
-    corpora_rows, entries_rows, terms_rows = load_sqlite(db_path)
+@dataclass
+class EntrySnapshot:
+    id: int
+    count: int
+    rank: int | None
+    # (lang, lemma_key) -> (is_primary, corpus_entry_terms.id or None for SQLite rows)
+    terms: dict[tuple[str, str], tuple[bool, int | None]] = field(default_factory=dict)
+    # (lang, lemma_key) -> spelling written for new terms; only SQLite snapshots need it.
+    lemmas: dict[tuple[str, str], str] = field(default_factory=dict)
+
+    def key(self) -> tuple[tuple[str, str], ...]:
+        return tuple(sorted(term for term, (is_primary, _term_id) in self.terms.items() if is_primary))
+
+    def flags(self) -> dict[tuple[str, str], bool]:
+        return {term: is_primary for term, (is_primary, _term_id) in self.terms.items()}
+
+
+@dataclass
+class CorpusDiff:
+    inserts: list[EntrySnapshot] = field(default_factory=list)
+    updates: list[tuple[EntrySnapshot, EntrySnapshot]] = field(default_factory=list)
+    deletes: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+
+def sqlite_snapshot(conn: sqlite3.Connection, slug: str) -> list[EntrySnapshot]:
+    entries = {
+        row["id"]: EntrySnapshot(row["id"], int(row["count"] or 0), row["rank"])
+        for row in conn.execute("SELECT id, count, rank FROM entries WHERE corpus_slug = ? ORDER BY id", (slug,))
+    }
+    terms = conn.execute(
+        "SELECT t.entry_id, t.lemma, t.lang, t.is_primary FROM terms AS t "
+        "JOIN entries AS e ON e.id = t.entry_id WHERE e.corpus_slug = ?",
+        (slug,),
+    )
+    for row in terms:
+        term = clean_term(row)
+        if term is not None:
+            lemma, lang = term
+            key = (lang, lemma_key(lemma))
+            # The first duplicate wins, like ON CONFLICT DO NOTHING in the full import.
+            entries[row["entry_id"]].terms.setdefault(key, (bool(row["is_primary"]), None))
+            entries[row["entry_id"]].lemmas.setdefault(key, lemma)
+    return list(entries.values())
+
+
+async def postgres_snapshot(session, corpus_id: int) -> list[EntrySnapshot]:
+    result = await session.execute(
+        select(
+            CorpusEntry.id,
+            CorpusEntry.count,
+            CorpusEntry.rank,
+            CorpusEntryTerm.id.label("term_id"),
+            CorpusEntryTerm.lang,
+            CorpusEntryTerm.is_primary,
+            Word.lemma,
+        )
+        .outerjoin(CorpusEntryTerm, CorpusEntryTerm.entry_id == CorpusEntry.id)
+        .outerjoin(Word, Word.id == CorpusEntryTerm.word_id)
+        .where(CorpusEntry.corpus_id == corpus_id, active_entries())
+        .order_by(CorpusEntry.id)
+    )
+    entries: dict[int, EntrySnapshot] = {}
+    for row in result.fetchall():
+        entry = entries.get(row.id)
+        if entry is None:
+            entry = entries[row.id] = EntrySnapshot(row.id, row.count, row.rank)
+        if row.term_id is not None:
+            entry.terms[(row.lang, lemma_key(row.lemma))] = (row.is_primary, row.term_id)
+    return list(entries.values())
+
+
+def diff_entries(current: list[EntrySnapshot], wanted: list[EntrySnapshot]) -> CorpusDiff:
+    # Entries are matched on their primary lemma keys; equal keys pair up in id order.
+    pending: dict[tuple[tuple[str, str], ...], list[EntrySnapshot]] = defaultdict(list)
+    for entry in current:
+        pending[entry.key()].append(entry)
+    diff = CorpusDiff()
+    for entry in wanted:
+        bucket = pending.get(entry.key())
+        if not bucket:
+            diff.inserts.append(entry)
+            continue
+        existing = bucket.pop(0)
+        if (existing.count, existing.rank, existing.flags()) != (entry.count, entry.rank, entry.flags()):
+            diff.updates.append((existing, entry))
+    diff.deletes = [entry.id for bucket in pending.values() for entry in bucket]
+    return diff
+
+
+async def apply_diff(session, corpus_id: int, version: int, diff: CorpusDiff, batch_size: int) -> None:
+    for start in range(0, len(diff.deletes), batch_size):
+        await session.execute(delete(CorpusEntry).where(CorpusEntry.id.in_(diff.deletes[start : start + batch_size])))
+        await session.commit()
+
+    for start in range(0, len(diff.updates), batch_size):
+        chunk = diff.updates[start : start + batch_size]
+        await session.execute(
+            update(CorpusEntry),
+            [{"id": current.id, "count": wanted.count, "rank": wanted.rank} for current, wanted in chunk],
+        )
+        stale_ids = []
+        records = []
+        for current, wanted in chunk:
+            flags = wanted.flags()
+            for term, (is_primary, term_id) in current.terms.items():
+                if flags.get(term) != is_primary:
+                    stale_ids.append(term_id)
+            existing = current.flags()
+            for (lang, key), is_primary in flags.items():
+                if existing.get((lang, key)) != is_primary:
+                    records.append((current.id, wanted.lemmas[(lang, key)], lang, is_primary))
+        if stale_ids:
+            await session.execute(delete(CorpusEntryTerm).where(CorpusEntryTerm.id.in_(stale_ids)))
+        if records:
+            await create_terms_table(session)
+            await write_terms(session, records)
+        await session.commit()
+
+    for start in range(0, len(diff.inserts), batch_size):
+        chunk = diff.inserts[start : start + batch_size]
+        result = await session.execute(
+            insert(CorpusEntry).returning(CorpusEntry.id, sort_by_parameter_order=True),
+            [
+                {"corpus_id": corpus_id, "version": version, "count": entry.count, "rank": entry.rank}
+                for entry in chunk
+            ],
+        )
+        records = [
+            (entry_id, entry.lemmas[(lang, key)], lang, is_primary)
+            for entry_id, entry in zip(result.scalars().all(), chunk)
+            for (lang, key), is_primary in entry.flags().items()
+        ]
+        if records:
+            await create_terms_table(session)
+            await write_terms(session, records)
+        await session.commit()
+
+
+async def run_diff(conn: sqlite3.Connection, corpora_rows, apply: bool, drop_missing: bool, batch_size: int) -> None:
+    async with AsyncSessionLocal() as session:
+        if apply:
+            corpora_map = await upsert_corpora(session, corpora_rows)
+            await session.commit()
+        else:
+            result = await session.execute(select(Corpus.slug, Corpus.id))
+            corpora_map = {row.slug: row.id for row in result.fetchall()}
+
+        totals = CorpusDiff()
+        touched = 0
+        changed = []
+        for row in corpora_rows:
+            slug = row["slug"]
+            wanted = sqlite_snapshot(conn, slug)
+            corpus_id = corpora_map.get(slug)
+            current = await postgres_snapshot(session, corpus_id) if corpus_id is not None else []
+            diff = diff_entries(current, wanted)
+            if not diff:
+                continue
+            print(f"{slug}: +{len(diff.inserts)} ~{len(diff.updates)} -{len(diff.deletes)}")
+            totals.inserts += diff.inserts
+            totals.updates += diff.updates
+            totals.deletes += diff.deletes
+            touched += 1
+            if apply:
+                version = await active_version(session, corpus_id)
+                await apply_diff(session, corpus_id, version, diff, batch_size)
+                changed.append(corpus_id)
+
+        print(
+            f"Diff: {len(totals.inserts)} inserts, {len(totals.updates)} updates, "
+            f"{len(totals.deletes)} deletes across {touched} corpora."
+        )
+        if not apply:
+            print("Dry run only. Use --apply to write the diff into Postgres.")
+            return
+
+        if drop_missing:
+            await session.execute(delete(Corpus).where(~Corpus.slug.in_({row["slug"] for row in corpora_rows})))
+        await mark_corpora_changed(session, changed)
+        await session.commit()
+
+
+async def run(
+    db_path: Path,
+    apply: bool,
+    drop_missing: bool,
+    replace_all: bool,
+    chunk_size: int,
+    diff: bool,
+    batch_size: int,
+) -> None:
+    conn = open_sqlite(db_path)
+    corpora_rows = conn.execute("SELECT * FROM corpora").fetchall()
 
     if not corpora_rows:
         print("No corpora found in sqlite.")
+        conn.close()
         return
 
-    # group entries/terms
-    entries_by_corpus: dict[str, list] = defaultdict(list)
-    for row in entries_rows:
-        entries_by_corpus[row["corpus_slug"]].append(row)
-
-    terms_by_entry: dict[int, list] = defaultdict(list)
-    word_pairs: set[tuple[str, str]] = set()
-    for row in terms_rows:
-        lemma = (row["lemma"] or "").strip()
-        lang = (row["lang"] or "").strip().lower()
-        if not lemma or not lang:
-            continue
-        terms_by_entry[row["entry_id"]].append(row)
-        word_pairs.add((lemma, lang))
-
     print(f"SQLite corpora: {len(corpora_rows)}")
-    print(f"SQLite entries: {len(entries_rows)}")
-    print(f"SQLite terms: {len(terms_rows)}")
+    print(f"SQLite entries: {count_rows(conn, 'entries')}")
+    print(f"SQLite terms: {count_rows(conn, 'terms')}")
+    if diff:
+        await run_diff(conn, corpora_rows, apply, drop_missing, batch_size)
+        conn.close()
+        return
     if not apply:
         print("Dry run only. Use --apply to write into Postgres.")
+        conn.close()
         return
 
     async with AsyncSessionLocal() as session:
         corpora_map = await upsert_corpora(session, corpora_rows)
         await session.commit()
 
-        await ensure_words(session, word_pairs)
-        await session.commit()
-        word_id_map = await fetch_word_ids(session, word_pairs)
-
         corpus_slugs = {row["slug"] for row in corpora_rows}
+        corpus_ids = [corpora_map[slug] for slug in corpus_slugs if slug in corpora_map]
+        # Readers keep using the active version while the new one is loaded next to it.
+        await discard_staged_versions(session, corpus_ids)
+        versions = {corpus_id: await next_version(session, corpus_id) for corpus_id in corpus_ids}
+        id_offset = await reserve_entry_ids(session, conn)
+
+        await load_entries(session, conn, corpora_map, versions, id_offset, chunk_size)
+        await load_terms(session, conn, id_offset, chunk_size)
+        valid_ids, errors = await validate_staged(session, conn, corpora_map, versions)
+        conn.close()
+        for error in errors:
+            print(f"Validation failed: {error}")
+
+        rejected = [corpus_id for corpus_id in corpus_ids if corpus_id not in valid_ids]
+        if rejected:
+            await discard_staged_versions(session, rejected)
+
+        switched = list(valid_ids)
         if replace_all:
-            await session.execute(delete(CorpusEntryTerm))
-            await session.execute(delete(CorpusEntry))
-            await session.execute(delete(CorpusWordStat))
-        else:
-            # delete old data per corpus
-            corpus_ids = [corpora_map[slug] for slug in corpus_slugs if slug in corpora_map]
-            for corpus_id in corpus_ids:
-                await session.execute(
-                    delete(CorpusEntryTerm).where(
-                        CorpusEntryTerm.entry_id.in_(
-                            select(CorpusEntry.id).where(CorpusEntry.corpus_id == corpus_id)
-                        )
-                    )
-                )
-                await session.execute(delete(CorpusEntry).where(CorpusEntry.corpus_id == corpus_id))
-                await session.execute(delete(CorpusWordStat).where(CorpusWordStat.corpus_id == corpus_id))
-
+            # Corpora missing from SQLite switch to an empty version.
+            missing = await session.execute(select(Corpus.id).where(~Corpus.slug.in_(corpus_slugs)))
+            for corpus_id in missing.scalars().all():
+                versions[corpus_id] = await next_version(session, corpus_id)
+                switched.append(corpus_id)
+
+        for corpus_id in switched:
+            await activate_version(session, corpus_id, versions[corpus_id])
+        if switched:
+            await session.execute(delete(CorpusWordStat).where(CorpusWordStat.corpus_id.in_(switched)))
         if drop_missing:
             await session.execute(delete(Corpus).where(~Corpus.slug.in_(corpus_slugs)))
-
+        await mark_corpora_changed(session, switched)
         await session.commit()
+        print(f"Switched corpora: {len(switched)}")
 
-        # insert entries
-        entry_rows = []
-        for corpus_slug, rows in entries_by_corpus.items():
-            corpus_id = corpora_map.get(corpus_slug)
-            if not corpus_id:
-                continue
-            for row in rows:
-                entry_rows.append(
-                    {
-                        "id": int(row["id"]),
-                        "corpus_id": corpus_id,
-                        "count": int(row["count"] or 0),
-                        "rank": row["rank"],
-                    }
-                )
-        for batch in chunked(entry_rows, 1000):
-            stmt = insert(CorpusEntry).values(batch)
-            stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
-            await session.execute(stmt)
-        await session.commit()
+        removed = await collect_retired_versions(session, switched)
+        print(f"Retired entries removed: {removed}")
 
-        # insert terms
-        term_rows = []
-        for entry_id, rows in terms_by_entry.items():
-            for row in rows:
-                lemma = (row["lemma"] or "").strip()
-                lang = (row["lang"] or "").strip().lower()
-                word_id = word_id_map.get((lemma, lang))
-                if not word_id:
-                    continue
-                term_rows.append(
-                    {
-                        "entry_id": int(entry_id),
-                        "word_id": word_id,
-                        "lang": lang,
-                        "is_primary": bool(row["is_primary"]),
-                    }
-                )
-        for batch in chunked(term_rows, 1000):
-            stmt = insert(CorpusEntryTerm).values(batch)
-            stmt = stmt.on_conflict_do_nothing(index_elements=["entry_id", "word_id"])
-            await session.execute(stmt)
-        await session.commit()
-
-        await set_sequence(session, "corpus_entries", "id")
         await set_sequence(session, "corpus_entry_terms", "id")
         await set_sequence(session, "words", "id")
         await session.commit()
 
+    if errors:
+        raise SystemExit("Some corpora failed validation and kept their previous version.")
     print("Import complete.")
 
 
@@ -281,11 +580,28 @@ def main() -> None:
     parser.add_argument(
         "--replace-all",
         action="store_true",
-        help="Delete all corpus entries/terms/stats before import.",
+        help="Also switch corpora missing from SQLite to an empty version.",
     )
+    parser.add_argument("--chunk-size", type=int, default=20000, help="SQLite rows per COPY batch.")
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Only write entries that changed, keeping the ids of unchanged ones.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Changed entries per commit in --diff mode.")
     args = parser.parse_args()
-    asyncio.run(run(args.db, args.apply, args.drop_missing, args.replace_all))
+    asyncio.run(
+        run(
+            args.db,
+            args.apply,
+            args.drop_missing,
+            args.replace_all,
+            args.chunk_size,
+            args.diff,
+            args.batch_size,
+        )
+    )
 
 
 if __name__ == "__main__":
-    main()
+    main()
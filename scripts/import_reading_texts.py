@@ -5,19 +5,25 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
-from sqlalchemy import delete, select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import BigInteger, delete, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
 sys.path.append(str(API_DIR))
 
+from app.core.minhash import DUPLICATE_THRESHOLD, LshIndex, lsh_band_keys, minhash_signature  # noqa: E402
+from app.core.reading_engine import passage_metrics, search_config  # noqa: E402
+from app.db.bulk import copy_connection  # noqa: E402
 from app.db.session import AsyncSessionLocal  # noqa: E402
-from app.models import Corpus, ReadingPassage, ReadingPassageToken, ReadingSource  # noqa: E402
+from app.models import Corpus, ReadingPassage, ReadingRecommendationCache, ReadingSource  # noqa: E402
 
 TOKEN_RE = re.compile(r"[A-Za-z\u0400-\u04FF]+(?:['\u2019][A-Za-z\u0400-\u04FF]+)?")
 DIGIT_RE = re.compile(r"\d")
@@ -40,6 +46,19 @@ NOISE_MARKERS = [
     "\u043f\u0440\u0438\u043b\u043e\u0436\u0435\u043d\u0438\u0435",
     "\u043b\u0438\u0442\u0435\u0440\u0430\u0442\u0443\u0440\u0430",
 ]
+# reading_passages columns written by COPY; search_config is added by the INSERT that follows.
+PASSAGE_COLUMNS = [
+    "id",
+    "source_id",
+    "position",
+    "text",
+    "word_count",
+    "lang_purity",
+    "letter_ratio",
+    "token_ids",
+    "minhash",
+    "lsh_bands",
+]
 
 
 def normalize_key(value: str) -> str:
@@ -62,10 +81,6 @@ def load_lang_map(path: Path) -> dict[str, str]:
     return lang_map
 
 
-def chunked(items: list[dict], size: int) -> list[list[dict]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
-
-
 def tokenize_words(text: str) -> list[str]:
     return [token.lower() for token in TOKEN_RE.findall(text)]
 
@@ -164,6 +179,69 @@ def build_passages(paragraphs: list[str], min_words: int, max_words: int) -> lis
     return passages
 
 
+def parse_file(file_path: str, lang: str, min_words: int, max_words: int) -> list[tuple]:
+    # Runs in a worker process: everything CPU-bound happens here, the parent only writes.
+    raw = Path(file_path).read_text(encoding="utf-8", errors="ignore")
+    paragraphs = extract_paragraphs(raw)
+    passages = []
+    for passage_text in build_passages(paragraphs, min_words=min_words, max_words=max_words):
+        tokens = tokenize_words(passage_text)
+        if not tokens:
+            continue
+        lang_purity, letter_ratio = passage_metrics(passage_text, lang)
+        signature = minhash_signature(tokens)
+        passages.append(
+            (
+                passage_text,
+                len(tokens),
+                lang_purity,
+                letter_ratio,
+                sorted(set(tokens)),
+                signature,
+                lsh_band_keys(signature),
+            )
+        )
+    return passages
+
+
+@dataclass
+class SourceJob:
+    path: Path
+    slug: str
+    lang: str
+    corpus_id: int | None
+    signature: str
+
+
+def file_signature(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_state(path: Path | None) -> dict[str, str]:
+    if path is None or not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save_state(path: Path | None, state: dict[str, str]) -> None:
+    if path is None:
+        return
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, ensure_ascii=False, indent=0)
+    tmp_path.replace(path)
+
+
+def append_report(path: Path | None, duplicates: list[dict]) -> None:
+    if path is None or not duplicates:
+        return
+    with path.open("a", encoding="utf-8") as handle:
+        for item in duplicates:
+            handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
 async def load_corpus_map(session) -> dict[str, int]:
     result = await session.execute(select(Corpus.id, Corpus.slug, Corpus.name))
     corpus_map: dict[str, int] = {}
@@ -173,77 +251,152 @@ async def load_corpus_map(session) -> dict[str, int]:
     return corpus_map
 
 
-async def import_file(
-    session,
-    file_path: Path,
-    folder_key: str,
-    lang: str,
-    corpus_id: int | None,
-    min_words: int,
-    max_words: int,
-    replace: bool,
-) -> None:
-    source_slug = f"{folder_key}-{normalize_key(file_path.stem)}"
-    source_slug = source_slug[:120]
-    existing_result = await session.execute(
-        select(ReadingSource).where(ReadingSource.slug == source_slug, ReadingSource.lang == lang)
+async def allocate_ids(session, table: str, count: int) -> list[int]:
+    result = await session.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {"table": table, "count": count},
     )
-    existing = existing_result.scalar_one_or_none()
-    if existing:
-        if not replace:
-            print(f"Skip {file_path.name}: source exists.")
-            return
-        await session.execute(
-            delete(ReadingSource).where(
-                ReadingSource.slug == source_slug, ReadingSource.lang == lang
+    return [row[0] for row in result.fetchall()]
+
+
+async def resolve_token_ids(session, tokens: set[str]) -> dict[str, int]:
+    # Rows inserted by the CTE are invisible to the join in the same statement, so each token
+    # comes back exactly once: either freshly inserted or already in the dictionary.
+    result = await session.execute(
+        text(
+            """
+            WITH input AS (SELECT unnest(CAST(:tokens AS varchar[])) AS token),
+            inserted AS (
+                INSERT INTO reading_tokens (token)
+                SELECT token FROM input
+                ON CONFLICT (token) DO NOTHING
+                RETURNING id, token
             )
+            SELECT id, token FROM inserted
+            UNION ALL
+            SELECT reading_tokens.id, reading_tokens.token
+            FROM reading_tokens JOIN input ON input.token = reading_tokens.token
+            """
+        ),
+        {"tokens": sorted(tokens)},
+    )
+    return {row.token: row.id for row in result.fetchall()}
+
+
+async def drop_near_duplicates(session, job: SourceJob, passages, threshold: float) -> tuple[list, list[dict]]:
+    # Earlier passages win: ones already stored in this language, then earlier ones of this file.
+    index = LshIndex(threshold)
+    band_keys = sorted({key for passage in passages for key in passage[6]})
+    result = await session.execute(
+        select(ReadingPassage.id, ReadingPassage.minhash, ReadingPassage.lsh_bands)
+        .join(ReadingSource, ReadingSource.id == ReadingPassage.source_id)
+        .where(
+            ReadingSource.lang == job.lang,
+            ReadingPassage.lsh_bands.overlap(literal(band_keys, type_=ARRAY(BigInteger))),
         )
-        await session.commit()
+    )
+    for row in result.fetchall():
+        index.add(row.id, row.minhash, row.lsh_bands)
+
+    kept = []
+    duplicates = []
+    for number, passage in enumerate(passages, start=1):
+        match = index.match(passage[5], passage[6])
+        if match is not None:
+            canonical, score = match
+            duplicates.append(
+                {
+                    "source": job.slug,
+                    "lang": job.lang,
+                    "passage": number,
+                    "duplicate_of": canonical,
+                    "similarity": round(score, 3),
+                }
+            )
+            continue
+        index.add(f"{job.slug}#{number}", passage[5], passage[6])
+        kept.append(passage)
+    return kept, duplicates
 
-    text = file_path.read_text(encoding="utf-8", errors="ignore")
-    paragraphs = extract_paragraphs(text)
-    passages = build_passages(paragraphs, min_words=min_words, max_words=max_words)
+
+async def write_source(
+    session,
+    job: SourceJob,
+    passages,
+    replace: bool,
+    threshold: float | None,
+) -> tuple[int, list[dict]]:
+    # One transaction per source: an interrupted run leaves whole sources or nothing.
+    if replace:
+        removed = await session.execute(
+            delete(ReadingSource).where(ReadingSource.slug == job.slug, ReadingSource.lang == job.lang)
+        )
+        if removed.rowcount:
+            # Cached bundles may quote the replaced passages; they rebuild on the next request.
+            await session.execute(delete(ReadingRecommendationCache))
+    duplicates: list[dict] = []
+    if threshold is not None:
+        passages, duplicates = await drop_near_duplicates(session, job, passages, threshold)
     if not passages:
-        print(f"Skip {file_path.name}: no passages.")
-        return
+        await session.commit()
+        return 0, duplicates
 
-    source = ReadingSource(
-        corpus_id=corpus_id,
-        slug=source_slug,
-        title=file_path.stem,
-        lang=lang,
-    )
+    source = ReadingSource(corpus_id=job.corpus_id, slug=job.slug, title=job.path.stem, lang=job.lang)
     session.add(source)
     await session.flush()
 
-    position = 1
-    for passage_text in passages:
-        tokens = tokenize_words(passage_text)
-        if not tokens:
-            continue
-        passage = ReadingPassage(
-            source_id=source.id,
-            position=position,
-            text=passage_text,
-            word_count=len(tokens),
+    token_map = await resolve_token_ids(session, {token for passage in passages for token in passage[4]})
+    passage_ids = await allocate_ids(session, "reading_passages", len(passages))
+    conn = await copy_connection(session)
+    # asyncpg has no binary COPY encoder for regconfig, so passages are staged without it and
+    # search_config is cast on the way into reading_passages. search_vector is a generated
+    # column, so that INSERT fills the full-text index as it goes.
+    await session.execute(
+        text(
+            "CREATE TEMP TABLE import_passages ON COMMIT DROP AS "
+            f"SELECT {', '.join(PASSAGE_COLUMNS)} FROM reading_passages WITH NO DATA"
         )
-        session.add(passage)
-        await session.flush()
-
-        token_counts: dict[str, int] = {}
-        for token in tokens:
-            token_counts[token] = token_counts.get(token, 0) + 1
-        rows = [
-            {"passage_id": passage.id, "token": token, "count": count}
-            for token, count in token_counts.items()
-        ]
-        for batch in chunked(rows, 500):
-            await session.execute(insert(ReadingPassageToken).values(batch))
+    )
+    await conn.copy_records_to_table(
+        "import_passages",
+        records=[
+            (
+                passage_id,
+                source.id,
+                position,
+                *passage[:4],
+                sorted(token_map[token] for token in passage[4]),
+                passage[5],
+                passage[6],
+            )
+            for position, (passage_id, passage) in enumerate(zip(passage_ids, passages), start=1)
+        ],
+        columns=PASSAGE_COLUMNS,
+    )
+    await session.execute(
+        text(
+            f"INSERT INTO reading_passages ({', '.join(PASSAGE_COLUMNS)}, search_config) "
+            f"SELECT {', '.join(PASSAGE_COLUMNS)}, CAST(:config AS regconfig) FROM import_passages"
+        ),
+        {"config": search_config(job.lang)},
+    )
+    await session.commit()
+    return len(passages), duplicates
 
-        position += 1
 
-    await session.commit()
-    print(f"Imported {file_path.name}: {position - 1} passages.")
+def collect_jobs(root: Path, lang_map: dict[str, str], corpus_map: dict[str, int], fallback_lang: str | None):
+    jobs: list[SourceJob] = []
+    for folder in sorted([item for item in root.iterdir() if item.is_dir()]):
+        folder_key = normalize_key(folder.name)
+        lang = lang_map.get(folder_key) or fallback_lang
+        if not lang:
+            print(f"Skip {folder.name}: language not resolved.")
+            continue
+        corpus_id = corpus_map.get(folder_key)
+        for file_path in sorted(folder.rglob("*.txt")):
+            slug = f"{folder_key}-{normalize_key(file_path.stem)}"[:120]
+            jobs.append(SourceJob(file_path, slug, lang, corpus_id, file_signature(file_path)))
+    return jobs
 
 
 async def run_import(args) -> None:
@@ -252,28 +405,64 @@ async def run_import(args) -> None:
         raise SystemExit(f"Path not found: {root}")
 
     lang_map = load_lang_map(BASE_DIR / "scripts" / "import_map.json")
+    state_path = Path(args.state) if args.state else None
+    state = load_state(state_path)
+    report_path = Path(args.dedupe_report) if args.dedupe_report else None
+    threshold = None if args.no_dedupe else args.dedupe_threshold
 
     async with AsyncSessionLocal() as session:
         corpus_map = await load_corpus_map(session)
-
-        for folder in sorted([item for item in root.iterdir() if item.is_dir()]):
-            folder_key = normalize_key(folder.name)
-            lang = lang_map.get(folder_key) or args.lang
-            if not lang:
-                print(f"Skip {folder.name}: language not resolved.")
-                continue
-            corpus_id = corpus_map.get(folder_key)
-            for file_path in sorted(folder.rglob("*.txt")):
-                await import_file(
-                    session,
-                    file_path,
-                    folder_key,
-                    lang,
-                    corpus_id,
-                    args.min_words,
-                    args.max_words,
-                    args.replace,
-                )
+        existing_result = await session.execute(select(ReadingSource.slug, ReadingSource.lang))
+        existing = {(row.slug, row.lang) for row in existing_result.fetchall()}
+
+        jobs = []
+        for job in collect_jobs(root, lang_map, corpus_map, args.lang):
+            if (job.slug, job.lang) in existing:
+                if not args.replace:
+                    print(f"Skip {job.path.name}: source exists.")
+                    continue
+                if state.get(f"{job.lang}:{job.slug}") == job.signature:
+                    print(f"Skip {job.path.name}: unchanged since last import.")
+                    continue
+            jobs.append(job)
+
+        loop = asyncio.get_running_loop()
+        window = max(1, args.jobs) * 2
+        imported = 0
+        duplicates_total = 0
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            queue = iter(jobs)
+            pending: dict[asyncio.Future, SourceJob] = {}
+
+            def submit_next() -> None:
+                job = next(queue, None)
+                if job is not None:
+                    future = loop.run_in_executor(
+                        pool, parse_file, str(job.path), job.lang, args.min_words, args.max_words
+                    )
+                    pending[future] = job
+
+            for _ in range(window):
+                submit_next()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future)
+                    submit_next()
+                    passages = future.result()
+                    if not passages:
+                        print(f"Skip {job.path.name}: no passages.")
+                        continue
+                    count, duplicates = await write_source(session, job, passages, args.replace, threshold)
+                    state[f"{job.lang}:{job.slug}"] = job.signature
+                    save_state(state_path, state)
+                    append_report(report_path, duplicates)
+                    duplicates_total += len(duplicates)
+                    imported += 1
+                    print(f"Imported {job.path.name}: {count} passages, {len(duplicates)} near-duplicates skipped.")
+
+    print(f"Done: {imported} sources imported, {len(jobs) - imported} skipped.")
+    print(f"Near-duplicate passages skipped: {duplicates_total}.")
 
 
 def parse_args() -> argparse.Namespace:
@@ -283,6 +472,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--min-words", type=int, default=80, help="Minimum words per passage.")
     parser.add_argument("--max-words", type=int, default=140, help="Maximum words per passage.")
     parser.add_argument("--replace", action="store_true", help="Replace existing sources.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Tokenizer processes.")
+    parser.add_argument(
+        "--state",
+        default=None,
+        help="JSON checkpoint of finished sources; lets an interrupted --replace run resume.",
+    )
+    parser.add_argument("--no-dedupe", action="store_true", help="Keep near-duplicate passages.")
+    parser.add_argument(
+        "--dedupe-threshold",
+        type=float,
+        default=DUPLICATE_THRESHOLD,
+        help="MinHash similarity above which a passage is treated as a duplicate.",
+    )
+    parser.add_argument(
+        "--dedupe-report",
+        default=None,
+        help="JSON lines file for skipped passages (passage = number within the parsed file).",
+    )
     return parser.parse_args()
 
 
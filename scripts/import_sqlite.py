@@ -5,11 +5,13 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
-import re
+import os
 import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Awaitable, Callable, Iterable, Iterator
 
 from sqlalchemy import delete, select
 from sqlalchemy.dialects.postgresql import insert
@@ -18,38 +20,17 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
 sys.path.append(str(API_DIR))
 
+from app.core.lang import MAJORITY_SHARE, detect_langs  # noqa: E402
+from app.core.words import ensure_word_ids, lemma_key  # noqa: E402
 from app.db.session import AsyncSessionLocal  # noqa: E402
-from app.models import Corpus, CorpusWordStat, Translation, Word  # noqa: E402
+from app.models import Corpus, CorpusWordStat, Translation  # noqa: E402
 
 SKIP_FILES = {"translations_cache.db", "delete.db"}
-LATIN_RE = re.compile(r"[A-Za-z]")
-CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
 LANGS = {"ru", "en"}
-
-
-def detect_lang(text: str) -> str | None:
-    if not text:
-        return None
-    latin = len(LATIN_RE.findall(text))
-    cyrillic = len(CYRILLIC_RE.findall(text))
-    if latin == 0 and cyrillic == 0:
-        return None
-    if latin > cyrillic:
-        return "en"
-    if cyrillic > latin:
-        return "ru"
-    return None
-
-
-def chunked(items: Iterable, size: int) -> Iterable[list]:
-    batch = []
-    for item in items:
-        batch.append(item)
-        if len(batch) >= size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_DB_CONCURRENCY = 2
+# Translation rows per detect_langs call while streaming a SQLite file.
+DETECT_BATCH_SIZE = 1000
 
 
 def load_mapping(path: Path) -> dict:
@@ -62,13 +43,11 @@ def sqlite_tables(conn: sqlite3.Connection) -> list[str]:
     return [row[0] for row in cursor.fetchall()]
 
 
-def read_translations(conn: sqlite3.Connection) -> list[tuple[str, int, str]]:
+def read_translations(conn: sqlite3.Connection) -> Iterator[tuple[str, int, str]]:
     cursor = conn.execute("SELECT word, count, translation FROM translations")
-    return [
-        (row[0], int(row[1]), row[2])
-        for row in cursor.fetchall()
-        if row[2] and str(row[2]).strip()
-    ]
+    for row in cursor:
+        if row[2] and str(row[2]).strip():
+            yield row[0], int(row[1]), row[2]
 
 
 async def ensure_corpus(session, slug: str, name: str) -> int:
@@ -85,31 +64,15 @@ async def ensure_corpus(session, slug: str, name: str) -> int:
     return result.scalar_one()
 
 
-async def ensure_words(session, lemmas: list[str], lang: str) -> None:
-    for batch in chunked(lemmas, 1000):
-        rows = [{"lemma": lemma, "lang": lang} for lemma in batch]
-        stmt = insert(Word).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["lemma", "lang"])
-        await session.execute(stmt)
-
-
-async def fetch_word_ids(session, lemmas: list[str], lang: str) -> dict[str, int]:
-    mapping: dict[str, int] = {}
-    for batch in chunked(lemmas, 1000):
-        result = await session.execute(
-            select(Word.id, Word.lemma).where(Word.lang == lang, Word.lemma.in_(batch))
-        )
-        for word_id, lemma in result.fetchall():
-            mapping[lemma] = word_id
-    return mapping
-
-
 async def upsert_corpus_stats(session, corpus_id: int, word_counts: list[tuple[str, int]], word_id_map: dict[str, int]):
     rows = []
+    seen: set[int] = set()
     for rank, (lemma, count) in enumerate(word_counts, start=1):
-        word_id = word_id_map.get(lemma)
-        if word_id is None:
+        word_id = word_id_map.get(lemma_key(lemma))
+        # Spelling variants share a word; the most frequent one is listed first.
+        if word_id is None or word_id in seen:
             continue
+        seen.add(word_id)
         rows.append(
             {
                 "corpus_id": corpus_id,
@@ -144,7 +107,7 @@ async def upsert_translations(
 ):
     rows = []
     for lemma, _count, translation in translations:
-        word_id = word_id_map.get(lemma)
+        word_id = word_id_map.get(lemma_key(lemma))
         if word_id is None:
             continue
         rows.append(
@@ -171,19 +134,39 @@ async def upsert_translations(
         await session.execute(stmt)
 
 
-def build_pairs(
-    rows: list[tuple[str, int, str]],
-    fallback_pair: tuple[str, str] | None,
-) -> tuple[list[tuple[str, str, int]], int]:
-    pairs: list[tuple[str, str, int]] = []
-    unknown = 0
+def classify_rows(
+    rows: Iterable[tuple[str, int, str]],
+    batch_size: int = DETECT_BATCH_SIZE,
+) -> Iterator[tuple[str, str, int, str | None, str | None]]:
+    # (word, translation, count, word_lang, translation_lang) for every non-empty row. Rows are
+    # classified a bounded batch at a time, so the SQLite cursor still streams.
+    batch: list[tuple[str, str, int]] = []
+
+    def flush() -> Iterator[tuple[str, str, int, str | None, str | None]]:
+        langs = detect_langs([text for left, right, _count in batch for text in (left, right)], MAJORITY_SHARE)
+        for idx, (left, right, count) in enumerate(batch):
+            yield left, right, count, langs[2 * idx], langs[2 * idx + 1]
+
     for word, count, translation in rows:
         left = str(word).strip()
         right = str(translation).strip()
         if not left or not right:
             continue
-        source_lang = detect_lang(left)
-        target_lang = detect_lang(right)
+        batch.append((left, right, count))
+        if len(batch) >= batch_size:
+            yield from flush()
+            batch = []
+    if batch:
+        yield from flush()
+
+
+def build_pairs(
+    rows: Iterable[tuple[str, int, str]],
+    fallback_pair: tuple[str, str] | None,
+) -> tuple[list[tuple[str, str, int]], int]:
+    pairs: list[tuple[str, str, int]] = []
+    unknown = 0
+    for left, right, count, source_lang, target_lang in classify_rows(rows):
         if source_lang in LANGS and target_lang in LANGS and source_lang != target_lang:
             if source_lang == "ru":
                 pairs.append((left, right, count))
@@ -202,97 +185,157 @@ def build_pairs(
     return pairs, unknown
 
 
-async def import_database(db_path: Path, mapping: dict) -> None:
-    slug = db_path.stem
-    if slug not in mapping:
-        print(f"Skip {slug}: missing in import_map.json")
-        return
+@dataclass
+class ParsedDatabase:
+    slug: str
+    name: str
+    # (source_lang, target_lang, lemmas, word_counts, translation_rows) per direction
+    directions: list[tuple[str, str, list[str], list[tuple[str, int]], list[tuple[str, int, str]]]] = field(
+        default_factory=list
+    )
+    unknown: int = 0
+    skipped: str | None = None
 
-    meta = mapping[slug]
-    name = meta.get("name", slug)
-    fallback_source = meta.get("source_lang", "en")
-    fallback_target = meta.get("target_lang", "ru")
-    fallback_pair = (fallback_source, fallback_target)
+
+def parse_database(db_path: Path, meta: dict) -> ParsedDatabase:
+    # Runs in a worker process: everything here is CPU-bound and touches no Postgres state.
+    slug = db_path.stem
+    parsed = ParsedDatabase(slug, meta.get("name", slug))
+    fallback_pair = (meta.get("source_lang", "en"), meta.get("target_lang", "ru"))
 
     conn = sqlite3.connect(db_path)
     try:
-        tables = sqlite_tables(conn)
-        if "translations" not in tables:
-            print(f"Skip {slug}: no translations table")
-            return
-
-        translations = read_translations(conn)
-        if not translations:
-            print(f"Skip {slug}: empty translations table")
-            return
-
-        pairs, unknown = build_pairs(translations, fallback_pair)
-        if not pairs:
-            print(f"Skip {slug}: no ru/en pairs found")
-            return
-
-        ru_counts: dict[str, int] = {}
-        en_counts: dict[str, int] = {}
-        ru_lemmas: set[str] = set()
-        en_lemmas: set[str] = set()
-        for ru_word, en_word, count in pairs:
-            ru_lemmas.add(ru_word)
-            en_lemmas.add(en_word)
-            ru_counts[ru_word] = max(ru_counts.get(ru_word, 0), count)
-            en_counts[en_word] = max(en_counts.get(en_word, 0), count)
-
-        ru_word_counts = sorted(ru_counts.items(), key=lambda item: (-item[1], item[0]))
-        en_word_counts = sorted(en_counts.items(), key=lambda item: (-item[1], item[0]))
-
-        ru_translations = {(ru_word, en_word) for ru_word, en_word, _count in pairs}
-        en_translations = {(en_word, ru_word) for ru_word, en_word, _count in pairs}
-
-        async with AsyncSessionLocal() as session:
-            corpus_id = await ensure_corpus(session, slug, name)
+        if "translations" not in sqlite_tables(conn):
+            parsed.skipped = "no translations table"
+            return parsed
+        pairs, parsed.unknown = build_pairs(read_translations(conn), fallback_pair)
+    finally:
+        conn.close()
+    if not pairs:
+        parsed.skipped = "no ru/en pairs found"
+        return parsed
+
+    ru_counts: dict[str, int] = {}
+    en_counts: dict[str, int] = {}
+    for ru_word, en_word, count in pairs:
+        ru_counts[ru_word] = max(ru_counts.get(ru_word, 0), count)
+        en_counts[en_word] = max(en_counts.get(en_word, 0), count)
+    ru_translations = {(ru_word, en_word) for ru_word, en_word, _count in pairs}
+    en_translations = {(en_word, ru_word) for ru_word, en_word, _count in pairs}
+
+    for source_lang, target_lang, counts, pair_set in (
+        ("ru", "en", ru_counts, ru_translations),
+        ("en", "ru", en_counts, en_translations),
+    ):
+        if not counts:
+            continue
+        word_counts = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        translations_rows = [(lemma, 0, translation) for lemma, translation in sorted(pair_set)]
+        parsed.directions.append((source_lang, target_lang, sorted(counts), word_counts, translations_rows))
+    return parsed
+
+
+class ImportProgress:
+    # Completed phases per file ("reset", then one per source lang, then "done"), saved after
+    # every phase so a failed run resumes where it stopped. The state is plain JSON.
+    def __init__(
+        self,
+        state: dict | None = None,
+        save: Callable[[dict], Awaitable[None]] | None = None,
+    ) -> None:
+        self.state = state or {}
+        self.state.setdefault("files", {})
+        self.save = save
+        self.lock = asyncio.Lock()
+
+    def is_done(self, slug: str, phase: str = "done") -> bool:
+        return phase in self.state["files"].get(slug, {}).get("phases", [])
+
+    async def mark(self, slug: str, phase: str, **info) -> None:
+        async with self.lock:
+            entry = self.state["files"].setdefault(slug, {"phases": []})
+            if phase not in entry["phases"]:
+                entry["phases"].append(phase)
+            entry.update(info)
+            self.state["done"] = sum(1 for item in self.state["files"].values() if "done" in item["phases"])
+            if self.save is not None:
+                await self.save(self.state)
+
+
+async def write_database(parsed: ParsedDatabase, progress: ImportProgress) -> None:
+    slug = parsed.slug
+    async with AsyncSessionLocal() as session:
+        corpus_id = await ensure_corpus(session, slug, parsed.name)
+        await session.commit()
+
+        if not progress.is_done(slug, "reset"):
+            await session.execute(delete(CorpusWordStat).where(CorpusWordStat.corpus_id == corpus_id))
             await session.commit()
+            await progress.mark(slug, "reset")
 
-            await session.execute(
-                delete(CorpusWordStat).where(CorpusWordStat.corpus_id == corpus_id)
-            )
+        # Every write below is an upsert, so a direction interrupted midway is simply redone.
+        for source_lang, target_lang, lemmas, word_counts, translations_rows in parsed.directions:
+            if progress.is_done(slug, source_lang):
+                continue
+            word_id_map = await ensure_word_ids(session, source_lang, lemmas)
             await session.commit()
 
-            for source_lang, target_lang, lemmas_set, word_counts, pair_set in (
-                ("ru", "en", ru_lemmas, ru_word_counts, ru_translations),
-                ("en", "ru", en_lemmas, en_word_counts, en_translations),
-            ):
-                if not lemmas_set:
-                    continue
-                lemmas = sorted(lemmas_set)
-                translations_rows = [
-                    (lemma, 0, translation) for lemma, translation in sorted(pair_set)
-                ]
-
-                await ensure_words(session, lemmas, source_lang)
-                await session.commit()
-
-                word_id_map = await fetch_word_ids(session, lemmas, source_lang)
-
-                await upsert_corpus_stats(session, corpus_id, word_counts, word_id_map)
-                await session.commit()
-
-                await upsert_translations(session, translations_rows, word_id_map, target_lang)
-                await session.commit()
-
-            total_words = len(ru_word_counts) + len(en_word_counts)
-            total_translations = len(ru_translations) + len(en_translations)
-            print(f"Imported {slug}: {total_words} words, {total_translations} translations")
-        if unknown:
-            print(f"Note {slug}: {unknown} rows with unknown language direction")
-    finally:
-        conn.close()
-
+            await upsert_corpus_stats(session, corpus_id, word_counts, word_id_map)
+            await session.commit()
 
-async def run(sqlite_dir: Path, map_path: Path) -> None:
+            await upsert_translations(session, translations_rows, word_id_map, target_lang)
+            await session.commit()
+            await progress.mark(slug, source_lang)
+
+    total_words = sum(len(direction[3]) for direction in parsed.directions)
+    total_translations = sum(len(direction[4]) for direction in parsed.directions)
+    await progress.mark(slug, "done", words=total_words, translations=total_translations, unknown=parsed.unknown)
+    print(f"Imported {slug}: {total_words} words, {total_translations} translations")
+    if parsed.unknown:
+        print(f"Note {slug}: {parsed.unknown} rows with unknown language direction")
+
+
+async def run(
+    sqlite_dir: Path,
+    map_path: Path,
+    workers: int = DEFAULT_WORKERS,
+    db_concurrency: int = DEFAULT_DB_CONCURRENCY,
+    progress: ImportProgress | None = None,
+) -> dict:
     mapping = load_mapping(map_path)
-    for db_path in sorted(sqlite_dir.glob("*.db")):
-        if db_path.name in SKIP_FILES:
-            continue
-        await import_database(db_path, mapping)
+    progress = progress or ImportProgress()
+    paths = [path for path in sorted(sqlite_dir.glob("*.db")) if path.name not in SKIP_FILES]
+    progress.state["total"] = len(paths)
+
+    loop = asyncio.get_running_loop()
+    # Parsed files wait for a writer slot, so only this many are held in memory at once.
+    in_flight = asyncio.Semaphore(workers + db_concurrency)
+    writers = asyncio.Semaphore(db_concurrency)
+
+    async def handle(db_path: Path, pool: ProcessPoolExecutor) -> None:
+        slug = db_path.stem
+        if progress.is_done(slug):
+            return
+        if slug not in mapping:
+            print(f"Skip {slug}: missing in import_map.json")
+            await progress.mark(slug, "done", skipped="missing in import_map.json")
+            return
+        async with in_flight:
+            parsed = await loop.run_in_executor(pool, parse_database, db_path, mapping[slug])
+            if parsed.skipped:
+                print(f"Skip {slug}: {parsed.skipped}")
+                await progress.mark(slug, "done", skipped=parsed.skipped)
+                return
+            async with writers:
+                await write_database(parsed, progress)
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        outcomes = await asyncio.gather(*(handle(path, pool) for path in paths), return_exceptions=True)
+    # Other files still finish and checkpoint before the first failure is raised.
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return progress.state
 
 
 def main() -> None:
@@ -307,8 +350,27 @@ def main() -> None:
         type=Path,
         default=Path("scripts/import_map.json"),
     )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Processes parsing SQLite files.")
+    parser.add_argument("--db-concurrency", type=int, default=DEFAULT_DB_CONCURRENCY, help="Files written at once.")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="JSON file with finished files and phases; an interrupted run resumes from it.",
+    )
     args = parser.parse_args()
-    asyncio.run(run(args.sqlite_dir, args.map))
+
+    state = None
+    if args.checkpoint and args.checkpoint.exists():
+        state = json.loads(args.checkpoint.read_text(encoding="utf-8"))
+
+    async def save_checkpoint(current: dict) -> None:
+        args.checkpoint.write_text(json.dumps(current), encoding="utf-8")
+
+    progress = ImportProgress(state, save_checkpoint if args.checkpoint else None)
+    asyncio.run(run(args.sqlite_dir, args.map, args.workers, args.db_concurrency, progress))
+    if args.checkpoint and args.checkpoint.exists():
+        args.checkpoint.unlink()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""Merge words that share a lemma_key within a language into the oldest of them."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.core.corpus_catalog import mark_corpora_changed  # noqa: E402
+from app.core.word_merge import MERGE_BATCH_SIZE, merge_word_batches  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import Word  # noqa: E402
+
+STREAM_BATCH_SIZE = 1000
+
+
+async def duplicate_pairs(session, lang: str | None) -> list[tuple[int, int, str, str]]:
+    # (source_id, target_id, lang, lemma) for every word that is not the oldest of its lemma_key.
+    ranked = select(
+        Word.id,
+        Word.lang,
+        Word.lemma,
+        func.min(Word.id).over(partition_by=(Word.lang, Word.lemma_key)).label("target_id"),
+    )
+    if lang:
+        ranked = ranked.where(Word.lang == lang)
+    ranked = ranked.subquery()
+    stmt = (
+        select(ranked.c.id, ranked.c.target_id, ranked.c.lang, ranked.c.lemma)
+        .where(ranked.c.id != ranked.c.target_id)
+        .order_by(ranked.c.target_id, ranked.c.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    result = await session.stream(stmt)
+    return [tuple(row) async for row in result]
+
+
+async def run(lang: str | None, apply: bool, batch_size: int, sample: int) -> None:
+    async with AsyncSessionLocal() as session:
+        rows = await duplicate_pairs(session, lang)
+        if not rows:
+            print("No duplicate words found.")
+            return
+
+        by_lang: dict[str, int] = {}
+        for _source_id, _target_id, word_lang, _lemma in rows:
+            by_lang[word_lang] = by_lang.get(word_lang, 0) + 1
+        targets = len({target_id for _source_id, target_id, _lang, _lemma in rows})
+        print(f"Duplicate words: {len(rows)} into {targets} targets")
+        for word_lang, total in sorted(by_lang.items()):
+            print(f"  {word_lang}: {total}")
+        for source_id, target_id, word_lang, lemma in rows[:sample]:
+            print(f"  {word_lang} {lemma!r}: {source_id} -> {target_id}")
+
+        if not apply:
+            print("Dry run. Re-run with --apply to merge.")
+            return
+
+        report = await merge_word_batches(
+            session, [(source_id, target_id) for source_id, target_id, _lang, _lemma in rows], batch_size
+        )
+        await mark_corpora_changed(session, report.corpus_ids)
+        await session.commit()
+        print(
+            f"Merged words: {report.words}, rows moved: {report.moved}, "
+            f"duplicates folded: {report.folded}, corpora touched: {len(report.corpus_ids)}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Merge words with the same lemma_key.")
+    parser.add_argument("--lang", default=None, help="Only merge words of this language.")
+    parser.add_argument("--apply", action="store_true", help="Apply changes to the database.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MERGE_BATCH_SIZE,
+        help="Source words merged per transaction.",
+    )
+    parser.add_argument("--sample", type=int, default=20, help="Duplicates to print.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    asyncio.run(run(args.lang, args.apply, args.batch_size, args.sample))
+
+
+if __name__ == "__main__":
+    main()
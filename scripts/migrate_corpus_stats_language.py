@@ -15,6 +15,7 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
 sys.path.append(str(API_DIR))
 
+from app.core.words import ensure_word_ids, find_word_ids, lemma_key  # noqa: E402
 from app.db.session import AsyncSessionLocal  # noqa: E402
 from app.models import Corpus, CorpusWordStat, Translation, Word  # noqa: E402
 
@@ -40,23 +41,13 @@ def chunked(items: list[str], size: int) -> list[list[str]]:
 
 
 async def ensure_words(session, lemmas: list[str], lang: str) -> None:
-    filtered = [lemma for lemma in lemmas if 0 < len(lemma) <= 255]
-    for batch in chunked(filtered, 1000):
-        rows = [{"lemma": lemma, "lang": lang} for lemma in batch]
-        stmt = insert(Word).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["lemma", "lang"])
-        await session.execute(stmt)
+    await ensure_word_ids(session, lang, [lemma for lemma in lemmas if 0 < len(lemma) <= 255])
 
 
 async def fetch_word_map(session, lemmas: list[str], lang: str) -> dict[str, int]:
-    mapping: dict[str, int] = {}
-    for batch in chunked(lemmas, 1000):
-        result = await session.execute(
-            select(Word.id, Word.lemma).where(Word.lang == lang, Word.lemma.in_(batch))
-        )
-        for word_id, lemma in result.fetchall():
-            mapping[lemma] = word_id
-    return mapping
+    # Matched on lemma_key, so spelling variants of a lemma resolve to the same word.
+    word_ids = await find_word_ids(session, lang, lemmas)
+    return {lemma: word_ids[lemma_key(lemma)] for lemma in lemmas if lemma_key(lemma) in word_ids}
 
 
 async def find_corpora(session, from_lang: str, to_lang: str, slug: str | None) -> list[Corpus]:
@@ -8,14 +8,15 @@ import re
 import sys
 from pathlib import Path
 
-from sqlalchemy import select, update
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import or_, select, update
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
+SCRIPTS_DIR = BASE_DIR / "scripts"
 sys.path.append(str(API_DIR))
+sys.path.append(str(SCRIPTS_DIR))
 
-from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.core.words import ensure_word_ids, find_word_ids, lemma_key  # noqa: E402
 from app.models import (  # noqa: E402
     LearningProfile,
     ReviewEvent,
@@ -25,6 +26,14 @@ from app.models import (  # noqa: E402
     Word,
 )
 
+from profile_runner import (  # noqa: E402
+    DEFAULT_WORKERS,
+    STREAM_BATCH_SIZE,
+    add_runner_arguments,
+    resolve_profile_ids,
+    run_profiles,
+)
+
 
 STATUS_PRIORITY = {"known": 3, "learned": 2, "new": 1}
 SPLIT_RE = re.compile(r"[;,/]")
@@ -94,275 +103,294 @@ def merge_translations(existing: str, new_value: str) -> str:
     return " / ".join(merged)
 
 
-def chunked(items: list[str], size: int) -> list[list[str]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
-
-
 async def fetch_target_word_map(session, lemmas: list[str], lang: str) -> dict[str, int]:
-    mapping: dict[str, int] = {}
-    for batch in chunked(lemmas, 1000):
-        result = await session.execute(
-            select(Word.id, Word.lemma).where(Word.lang == lang, Word.lemma.in_(batch))
-        )
-        for word_id, lemma in result.fetchall():
-            mapping[lemma] = word_id
-    return mapping
+    # Matched on lemma_key, so spelling variants of a lemma resolve to the same word.
+    word_ids = await find_word_ids(session, lang, lemmas)
+    return {lemma: word_ids[lemma_key(lemma)] for lemma in lemmas if lemma_key(lemma) in word_ids}
 
 
 async def ensure_words(session, lemmas: list[str], lang: str) -> None:
-    filtered = [lemma for lemma in lemmas if 0 < len(lemma) <= 255]
-    for batch in chunked(filtered, 1000):
-        rows = [{"lemma": lemma, "lang": lang} for lemma in batch]
-        stmt = insert(Word).values(rows)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["lemma", "lang"])
-        await session.execute(stmt)
+    await ensure_word_ids(session, lang, [lemma for lemma in lemmas if 0 < len(lemma) <= 255])
 
 
-async def migrate_profile(profile: LearningProfile, apply: bool) -> None:
-    if profile.native_lang == profile.target_lang:
-        return
+async def load_user_words(session, profile: LearningProfile, word_ids: set[int]) -> dict[int, UserWord]:
+    ids = sorted(word_ids)
+    user_words: dict[int, UserWord] = {}
+    for start in range(0, len(ids), STREAM_BATCH_SIZE):
+        result = await session.execute(
+            select(UserWord).where(
+                UserWord.profile_id == profile.id,
+                UserWord.word_id.in_(ids[start : start + STREAM_BATCH_SIZE]),
+            )
+        )
+        for user_word in result.scalars():
+            user_words[user_word.word_id] = user_word
+    return user_words
 
-    async with AsyncSessionLocal() as session:
-        user_rows = (
-            await session.execute(
-                select(UserWord, Word.lemma, Word.lang)
-                .join(Word, Word.id == UserWord.word_id)
-                .where(UserWord.profile_id == profile.id)
+
+async def load_custom_words(
+    session, profile: LearningProfile, word_ids: set[int], target_lang: str
+) -> dict[tuple[int, str], UserCustomWord]:
+    ids = sorted(word_ids)
+    custom_words: dict[tuple[int, str], UserCustomWord] = {}
+    for start in range(0, len(ids), STREAM_BATCH_SIZE):
+        result = await session.execute(
+            select(UserCustomWord).where(
+                UserCustomWord.profile_id == profile.id,
+                UserCustomWord.target_lang == target_lang,
+                UserCustomWord.word_id.in_(ids[start : start + STREAM_BATCH_SIZE]),
             )
-        ).all()
-        custom_rows = (
-            await session.execute(
-                select(UserCustomWord, Word.lemma, Word.lang)
-                .join(Word, Word.id == UserCustomWord.word_id)
-                .where(UserCustomWord.profile_id == profile.id)
+        )
+        for custom_word in result.scalars():
+            custom_words[(custom_word.word_id, custom_word.target_lang)] = custom_word
+    return custom_words
+
+
+async def migrate_profile(session, profile: LearningProfile, apply: bool) -> dict[str, int]:
+    counts = {
+        "user_moved": 0,
+        "user_merged": 0,
+        "user_missing": 0,
+        "custom_moved": 0,
+        "custom_merged": 0,
+        "custom_missing": 0,
+    }
+    if profile.native_lang == profile.target_lang:
+        return counts
+
+    # Only rows in the wrong direction are loaded; rows that are already right are fetched
+    # further down, and only those that turn out to be merge targets.
+    user_rows = (
+        await session.execute(
+            select(UserWord, Word.lemma, Word.lang)
+            .join(Word, Word.id == UserWord.word_id)
+            .where(UserWord.profile_id == profile.id, Word.lang != profile.target_lang)
+        )
+    ).all()
+    custom_rows = (
+        await session.execute(
+            select(UserCustomWord, Word.lemma, Word.lang)
+            .join(Word, Word.id == UserCustomWord.word_id)
+            .where(
+                UserCustomWord.profile_id == profile.id,
+                or_(Word.lang != profile.target_lang, UserCustomWord.target_lang != profile.native_lang),
             )
-        ).all()
-
-        lemmas_needed = {
-            row.lemma for row in user_rows if row.lang != profile.target_lang
-        } | {row.lemma for row in custom_rows if row.lang != profile.target_lang}
-        lemmas_list = sorted(lemmas_needed)
-
-        target_word_map = await fetch_target_word_map(session, lemmas_list, profile.target_lang)
-        reverse_translation_map: dict[str, int] = {}
-        if lemmas_list:
-            reverse_result = await session.execute(
-                select(Translation.translation, Translation.word_id)
-                .select_from(Translation)
-                .join(Word, Word.id == Translation.word_id)
-                .where(
-                    Translation.target_lang == profile.native_lang,
-                    Translation.translation.in_(lemmas_list),
-                    Word.lang == profile.target_lang,
-                )
+        )
+    ).all()
+    if not user_rows and not custom_rows:
+        return counts
+
+    lemmas_needed = {row.lemma for row in user_rows} | {
+        row.lemma for row in custom_rows if row.lang != profile.target_lang
+    }
+    lemmas_list = sorted(lemmas_needed)
+
+    target_word_map = await fetch_target_word_map(session, lemmas_list, profile.target_lang)
+    reverse_translation_map: dict[str, int] = {}
+    if lemmas_list:
+        reverse_result = await session.execute(
+            select(Translation.translation, Translation.word_id)
+            .select_from(Translation)
+            .join(Word, Word.id == Translation.word_id)
+            .where(
+                Translation.target_lang == profile.native_lang,
+                Translation.translation.in_(lemmas_list),
+                Word.lang == profile.target_lang,
             )
-            for translation, word_id in reverse_result.fetchall():
-                key = normalize_text(str(translation or ""))
-                if not key:
-                    continue
-                reverse_translation_map.setdefault(key, word_id)
-
-        source_word_ids = [row.UserWord.word_id for row in user_rows if row.lang != profile.target_lang]
-        translation_map: dict[int, list[str]] = {}
-        if source_word_ids:
-            translations_result = await session.execute(
-                select(Translation.word_id, Translation.translation)
-                .where(
-                    Translation.word_id.in_(source_word_ids),
-                    Translation.target_lang == profile.target_lang,
-                )
-                .order_by(Translation.word_id, Translation.id)
+        )
+        for translation, word_id in reverse_result.fetchall():
+            key = normalize_text(str(translation or ""))
+            if not key:
+                continue
+            reverse_translation_map.setdefault(key, word_id)
+
+    source_word_ids = [row.UserWord.word_id for row in user_rows]
+    translation_map: dict[int, list[str]] = {}
+    if source_word_ids:
+        translations_result = await session.execute(
+            select(Translation.word_id, Translation.translation)
+            .where(
+                Translation.word_id.in_(source_word_ids),
+                Translation.target_lang == profile.target_lang,
             )
-            for word_id, translation in translations_result.fetchall():
-                if translation:
-                    translation_map.setdefault(word_id, []).append(str(translation))
-
-        custom_translation_map: dict[int, list[str]] = {}
-        if source_word_ids:
-            custom_translation_result = await session.execute(
-                select(UserCustomWord.word_id, UserCustomWord.translation)
-                .where(
-                    UserCustomWord.profile_id == profile.id,
-                    UserCustomWord.word_id.in_(source_word_ids),
-                )
-                .order_by(UserCustomWord.word_id, UserCustomWord.created_at)
+            .order_by(Translation.word_id, Translation.id)
+        )
+        for word_id, translation in translations_result.fetchall():
+            if translation:
+                translation_map.setdefault(word_id, []).append(str(translation))
+
+    custom_translation_map: dict[int, list[str]] = {}
+    if source_word_ids:
+        custom_translation_result = await session.execute(
+            select(UserCustomWord.word_id, UserCustomWord.translation)
+            .where(
+                UserCustomWord.profile_id == profile.id,
+                UserCustomWord.word_id.in_(source_word_ids),
             )
-            for word_id, translation in custom_translation_result.fetchall():
-                if translation:
-                    custom_translation_map.setdefault(word_id, []).append(str(translation))
-
-        if apply:
-            missing_lemmas = [
-                row.lemma
-                for row in custom_rows
-                if row.lang != profile.target_lang and row.lemma not in target_word_map
-            ]
-            translation_lemmas = []
-            for word_id in source_word_ids:
-                primary = pick_primary_translation(translation_map.get(word_id, []))
-                if not primary:
-                    primary = pick_primary_translation(custom_translation_map.get(word_id, []))
-                if primary and primary not in target_word_map:
-                    translation_lemmas.append(primary)
-            ensure_lemmas = sorted(set(missing_lemmas + translation_lemmas))
-            if ensure_lemmas:
-                await ensure_words(session, ensure_lemmas, profile.target_lang)
-                target_word_map = await fetch_target_word_map(
-                    session, lemmas_list + ensure_lemmas, profile.target_lang
-                )
-
-        moved_user = 0
-        merged_user = 0
-        missing_user = 0
-        moved_custom = 0
-        merged_custom = 0
-        missing_custom = 0
-
-        user_by_word_id = {row.UserWord.word_id: row.UserWord for row in user_rows}
-        moves: list[tuple[int, int]] = []
-        deletes: list[UserWord] = []
-        event_map: dict[int, int] = {}
-
-        for row in user_rows:
-            user_word, lemma, word_lang = row.UserWord, row.lemma, row.lang
-            if word_lang == profile.target_lang:
-                continue
-            target_id = target_word_map.get(lemma)
-            if not target_id:
-                primary = pick_primary_translation(translation_map.get(user_word.word_id, []))
-                if not primary:
-                    primary = pick_primary_translation(custom_translation_map.get(user_word.word_id, []))
-                if primary:
-                    target_id = target_word_map.get(primary)
-            if not target_id:
-                target_id = reverse_translation_map.get(normalize_text(lemma))
-            if not target_id:
-                missing_user += 1
-                continue
-            if target_id == user_word.word_id:
-                continue
-            existing = user_by_word_id.get(target_id)
-            if existing:
-                if is_better_progress(user_word, existing):
-                    copy_progress(existing, user_word)
-                deletes.append(user_word)
-                merged_user += 1
-            else:
-                moves.append((user_word.word_id, target_id))
-                user_by_word_id[target_id] = user_word
-                moved_user += 1
-            event_map[user_word.word_id] = target_id
-
-        if apply:
-            for old_id, new_id in moves:
-                await session.execute(
-                    update(UserWord)
-                    .where(UserWord.profile_id == profile.id, UserWord.word_id == old_id)
-                    .values(word_id=new_id)
-                )
-            for row in deletes:
-                await session.delete(row)
-            for old_id, new_id in event_map.items():
-                await session.execute(
-                    update(ReviewEvent)
-                    .where(ReviewEvent.profile_id == profile.id, ReviewEvent.word_id == old_id)
-                    .values(word_id=new_id)
-                )
-
-        custom_by_key = {(row.UserCustomWord.word_id, row.UserCustomWord.target_lang): row.UserCustomWord for row in custom_rows}
-
-        for row in custom_rows:
-            custom_word, lemma, word_lang = row.UserCustomWord, row.lemma, row.lang
-            target_word_id = (
-                custom_word.word_id
-                if word_lang == profile.target_lang
-                else target_word_map.get(lemma)
+            .order_by(UserCustomWord.word_id, UserCustomWord.created_at)
+        )
+        for word_id, translation in custom_translation_result.fetchall():
+            if translation:
+                custom_translation_map.setdefault(word_id, []).append(str(translation))
+
+    if apply:
+        missing_lemmas = [
+            row.lemma
+            for row in custom_rows
+            if row.lang != profile.target_lang and row.lemma not in target_word_map
+        ]
+        translation_lemmas = []
+        for word_id in source_word_ids:
+            primary = pick_primary_translation(translation_map.get(word_id, []))
+            if not primary:
+                primary = pick_primary_translation(custom_translation_map.get(word_id, []))
+            if primary and primary not in target_word_map:
+                translation_lemmas.append(primary)
+        ensure_lemmas = sorted(set(missing_lemmas + translation_lemmas))
+        if ensure_lemmas:
+            await ensure_words(session, ensure_lemmas, profile.target_lang)
+            target_word_map = await fetch_target_word_map(
+                session, lemmas_list + ensure_lemmas, profile.target_lang
             )
-            if not target_word_id:
-                primary = pick_primary_translation([custom_word.translation or ""])
-                if primary:
-                    target_word_id = target_word_map.get(primary)
-            if not target_word_id:
-                missing_custom += 1
-                continue
 
-            new_target_lang = profile.native_lang
-            if (
-                custom_word.word_id == target_word_id
-                and custom_word.target_lang == new_target_lang
-            ):
-                continue
-
-            existing = custom_by_key.get((target_word_id, new_target_lang))
-            if existing and existing.id != custom_word.id:
-                merged_translation = merge_translations(
-                    existing.translation or "", custom_word.translation or ""
-                )
-                if apply and merged_translation != existing.translation:
-                    existing.translation = merged_translation
-                if apply:
-                    await session.delete(custom_word)
-                merged_custom += 1
-                continue
+    resolved_user: list[tuple[UserWord, int]] = []
+    for row in user_rows:
+        user_word, lemma = row.UserWord, row.lemma
+        target_id = target_word_map.get(lemma)
+        if not target_id:
+            primary = pick_primary_translation(translation_map.get(user_word.word_id, []))
+            if not primary:
+                primary = pick_primary_translation(custom_translation_map.get(user_word.word_id, []))
+            if primary:
+                target_id = target_word_map.get(primary)
+        if not target_id:
+            target_id = reverse_translation_map.get(normalize_text(lemma))
+        if not target_id:
+            counts["user_missing"] += 1
+            continue
+        if target_id == user_word.word_id:
+            continue
+        resolved_user.append((user_word, target_id))
+
+    user_by_word_id = await load_user_words(session, profile, {target_id for _user_word, target_id in resolved_user})
+    moves: list[tuple[int, int]] = []
+    deletes: list[UserWord] = []
+    event_map: dict[int, int] = {}
+    for user_word, target_id in resolved_user:
+        existing = user_by_word_id.get(target_id)
+        if existing:
+            # A dry run must not touch loaded rows: the next select would autoflush them.
+            if apply and is_better_progress(user_word, existing):
+                copy_progress(existing, user_word)
+            deletes.append(user_word)
+            counts["user_merged"] += 1
+        else:
+            moves.append((user_word.word_id, target_id))
+            user_by_word_id[target_id] = user_word
+            counts["user_moved"] += 1
+        event_map[user_word.word_id] = target_id
+
+    if apply:
+        for old_id, new_id in moves:
+            await session.execute(
+                update(UserWord)
+                .where(UserWord.profile_id == profile.id, UserWord.word_id == old_id)
+                .values(word_id=new_id)
+            )
+        for row in deletes:
+            await session.delete(row)
+        for old_id, new_id in event_map.items():
+            await session.execute(
+                update(ReviewEvent)
+                .where(ReviewEvent.profile_id == profile.id, ReviewEvent.word_id == old_id)
+                .values(word_id=new_id)
+            )
 
+    new_target_lang = profile.native_lang
+    resolved_custom: list[tuple[UserCustomWord, int]] = []
+    for row in custom_rows:
+        custom_word, lemma, word_lang = row.UserCustomWord, row.lemma, row.lang
+        target_word_id = (
+            custom_word.word_id
+            if word_lang == profile.target_lang
+            else target_word_map.get(lemma)
+        )
+        if not target_word_id:
+            primary = pick_primary_translation([custom_word.translation or ""])
+            if primary:
+                target_word_id = target_word_map.get(primary)
+        if not target_word_id:
+            counts["custom_missing"] += 1
+            continue
+        if custom_word.word_id == target_word_id and custom_word.target_lang == new_target_lang:
+            continue
+        resolved_custom.append((custom_word, target_word_id))
+
+    custom_by_key = await load_custom_words(
+        session, profile, {target_word_id for _custom_word, target_word_id in resolved_custom}, new_target_lang
+    )
+    for custom_word, target_word_id in resolved_custom:
+        existing = custom_by_key.get((target_word_id, new_target_lang))
+        if existing and existing.id != custom_word.id:
+            merged_translation = merge_translations(
+                existing.translation or "", custom_word.translation or ""
+            )
+            if apply and merged_translation != existing.translation:
+                existing.translation = merged_translation
             if apply:
-                custom_word.word_id = target_word_id
-                custom_word.target_lang = new_target_lang
-                session.add(custom_word)
-            moved_custom += 1
-            custom_by_key[(target_word_id, new_target_lang)] = custom_word
+                await session.delete(custom_word)
+            counts["custom_merged"] += 1
+            continue
 
         if apply:
-            await session.commit()
-
-        print(
-            "Profile",
-            profile.id,
-            f"{profile.native_lang}->{profile.target_lang}",
-            "| user moved:",
-            moved_user,
-            "merged:",
-            merged_user,
-            "missing:",
-            missing_user,
-            "| custom moved:",
-            moved_custom,
-            "merged:",
-            merged_custom,
-            "missing:",
-            missing_custom,
-        )
-
-
-async def run_migration(profile_id: str | None, apply: bool) -> None:
-    async with AsyncSessionLocal() as session:
-        stmt = select(LearningProfile)
-        if profile_id:
-            stmt = stmt.where(LearningProfile.id == profile_id)
-        profiles_result = await session.execute(stmt)
-        profiles = profiles_result.scalars().all()
-
-    if not profiles:
+            custom_word.word_id = target_word_id
+            custom_word.target_lang = new_target_lang
+            session.add(custom_word)
+        counts["custom_moved"] += 1
+        custom_by_key[(target_word_id, new_target_lang)] = custom_word
+
+    if apply:
+        await session.commit()
+    return counts
+
+
+async def run_migration(
+    profile_ids: list,
+    apply: bool,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = 0.0,
+    checkpoint_path: Path | None = None,
+) -> None:
+    if not profile_ids:
         print("No profiles found.")
         return
-
-    for profile in profiles:
-        await migrate_profile(profile, apply)
-
+    await run_profiles(
+        "migrate_language_direction",
+        migrate_profile,
+        profile_ids,
+        apply,
+        workers=workers,
+        rate=rate,
+        checkpoint_path=checkpoint_path,
+    )
     if not apply:
         print("Dry run. Re-run with --apply to make changes.")
 
 
+async def run(args: argparse.Namespace) -> None:
+    profile_ids = await resolve_profile_ids(args.profile_id, args.email)
+    await run_migration(profile_ids, args.apply, args.workers, args.rate, args.checkpoint)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fix word language direction for user data.")
-    parser.add_argument("--profile-id", default=None, help="Learning profile id to migrate.")
-    parser.add_argument("--apply", action="store_true", help="Apply changes to the database.")
+    add_runner_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    asyncio.run(run_migration(args.profile_id, args.apply))
+    asyncio.run(run(args))
 
 
 if __name__ == "__main__":
@@ -9,18 +9,17 @@ import sys
 from pathlib import Path
 
 from sqlalchemy import select, update
-from sqlalchemy.dialects.postgresql import insert
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
 sys.path.append(str(API_DIR))
 
+from app.core.lang import detect_langs  # noqa: E402
+from app.core.words import ensure_word_ids, find_word_ids, lemma_key  # noqa: E402
 from app.db.session import AsyncSessionLocal  # noqa: E402
 from app.models import LearningProfile, UserCustomWord, Word  # noqa: E402
 
 
-LATIN_RE = re.compile(r"[A-Za-z]")
-CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
 SPLIT_RE = re.compile(r"[;,/]")
 
 
@@ -28,23 +27,6 @@ def normalize_text(value: str) -> str:
     return " ".join(value.strip().split()).lower()
 
 
-def detect_lang(value: str) -> str | None:
-    if not value:
-        return None
-    latin = len(LATIN_RE.findall(value))
-    cyrillic = len(CYRILLIC_RE.findall(value))
-    total = latin + cyrillic
-    if total == 0:
-        return None
-    latin_ratio = latin / total
-    cyrillic_ratio = cyrillic / total
-    if latin_ratio >= 0.8 and cyrillic_ratio <= 0.2:
-        return "en"
-    if cyrillic_ratio >= 0.8 and latin_ratio <= 0.2:
-        return "ru"
-    return None
-
-
 def build_translation_options(text: str) -> list[str]:
     options = []
     for part in SPLIT_RE.split(text or ""):
@@ -98,12 +80,13 @@ async def normalize_custom_words(profile_id: str | None, apply: bool) -> None:
                 )
             )
             rows = rows_result.fetchall()
+            texts = [(normalize_text(lemma), normalize_text(custom_word.translation or "")) for custom_word, lemma in rows]
+            langs = detect_langs([text for pair in texts for text in pair])
 
-            for custom_word, lemma in rows:
-                word_text = normalize_text(lemma)
-                translation_text = normalize_text(custom_word.translation or "")
-                word_lang = detect_lang(word_text)
-                translation_lang = detect_lang(translation_text)
+            for idx, (custom_word, _lemma) in enumerate(rows):
+                word_text, translation_text = texts[idx]
+                word_lang = langs[2 * idx]
+                translation_lang = langs[2 * idx + 1]
                 if word_lang != profile.target_lang or translation_lang != profile.native_lang:
                     continue
 
@@ -111,16 +94,9 @@ async def normalize_custom_words(profile_id: str | None, apply: bool) -> None:
                 new_word = translation_text
                 new_translation = word_text
 
-                if apply:
-                    await session.execute(
-                        insert(Word)
-                        .values(lemma=new_word, lang=profile.native_lang)
-                        .on_conflict_do_nothing(index_elements=["lemma", "lang"])
-                    )
-                new_word_result = await session.execute(
-                    select(Word.id).where(Word.lemma == new_word, Word.lang == profile.native_lang)
-                )
-                new_word_id = new_word_result.scalar_one_or_none()
+                resolve = ensure_word_ids if apply else find_word_ids
+                new_word_ids = await resolve(session, profile.native_lang, [new_word])
+                new_word_id = new_word_ids.get(lemma_key(new_word))
                 if new_word_id is None:
                     if not apply:
                         total_swapped += 1
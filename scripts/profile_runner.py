@@ -0,0 +1,175 @@
+"""Run a maintenance task over learning profiles with bounded workers, checkpoints and a rate limit."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+API_DIR = BASE_DIR / "api"
+sys.path.append(str(API_DIR))
+
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.models import LearningProfile, User, UserProfile  # noqa: E402
+
+DEFAULT_WORKERS = 4
+# Rows per server-side cursor fetch for tasks that stream per-profile tables.
+STREAM_BATCH_SIZE = 1000
+
+# A task gets the worker's session, one profile and the apply flag, and returns its counters.
+# In a dry run the counters are what it would have changed.
+ProfileTask = Callable[[Any, LearningProfile, bool], Awaitable[dict[str, int]]]
+
+
+class RateLimiter:
+    # Spaces profile starts evenly across all workers; 0 turns the limit off.
+    def __init__(self, per_second: float) -> None:
+        self.interval = 1 / per_second if per_second > 0 else 0.0
+        self.next_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ProfileCheckpoint:
+    # Finished profiles with their counters, rewritten after every profile so a stopped run resumes.
+    # A checkpoint only resumes the same task in the same mode: dry-run counters never count as applied.
+    def __init__(self, path: Path | None, task: str, apply: bool) -> None:
+        self.path = path
+        self.state: dict = {"task": task, "apply": apply, "profiles": {}}
+        self.lock = asyncio.Lock()
+        if path and path.exists():
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("task") != task or state.get("apply") != apply:
+                raise SystemExit(
+                    f"Checkpoint {path} belongs to {state.get('task')} (apply={state.get('apply')}), "
+                    f"not {task} (apply={apply})."
+                )
+            self.state = state
+
+    @property
+    def profiles(self) -> dict[str, dict[str, int]]:
+        return self.state["profiles"]
+
+    def is_done(self, profile_id) -> bool:
+        return str(profile_id) in self.profiles
+
+    async def mark(self, profile_id, counts: dict[str, int]) -> None:
+        async with self.lock:
+            self.profiles[str(profile_id)] = counts
+            if self.path:
+                # Written aside and renamed, so an interrupted write never leaves half a file.
+                temp_path = self.path.with_name(self.path.name + ".tmp")
+                temp_path.write_text(json.dumps(self.state), encoding="utf-8")
+                temp_path.replace(self.path)
+
+    def clear(self) -> None:
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+def format_counts(counts: dict[str, int]) -> str:
+    return ", ".join(f"{key}={value}" for key, value in counts.items()) or "nothing to do"
+
+
+async def resolve_profile_ids(profile_id: str | None, email: str | None) -> list[uuid.UUID]:
+    async with AsyncSessionLocal() as session:
+        if profile_id:
+            stmt = select(LearningProfile.id).where(LearningProfile.id == profile_id)
+        elif email:
+            stmt = (
+                select(UserProfile.active_profile_id)
+                .join(User, User.id == UserProfile.user_id)
+                .where(User.email == email, UserProfile.active_profile_id.is_not(None))
+            )
+        else:
+            stmt = select(LearningProfile.id).order_by(LearningProfile.id)
+        result = await session.stream_scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        return [item async for item in result]
+
+
+async def run_profiles(
+    task_name: str,
+    task: ProfileTask,
+    profile_ids: list,
+    apply: bool,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = 0.0,
+    checkpoint_path: Path | None = None,
+) -> dict[str, int]:
+    checkpoint = ProfileCheckpoint(checkpoint_path, task_name, apply)
+    pending = [profile_id for profile_id in profile_ids if not checkpoint.is_done(profile_id)]
+    if len(pending) < len(profile_ids):
+        print(f"{task_name}: resuming, {len(profile_ids) - len(pending)} profiles already done.")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for profile_id in pending:
+        queue.put_nowait(profile_id)
+    limiter = RateLimiter(rate)
+    failures: dict[str, str] = {}
+
+    async def worker() -> None:
+        # One session per worker; its transaction ends and its identity map is emptied after every profile.
+        async with AsyncSessionLocal() as session:
+            while not queue.empty():
+                profile_id = queue.get_nowait()
+                await limiter.wait()
+                try:
+                    profile = await session.get(LearningProfile, uuid.UUID(str(profile_id)))
+                    counts = await task(session, profile, apply) if profile else {}
+                except Exception as exc:
+                    failures[str(profile_id)] = str(exc)
+                    print(f"Profile {profile_id}: failed: {exc}")
+                    continue
+                finally:
+                    # Ends whatever the task left open (dry runs never commit), so no row lock
+                    # outlives its profile; after a commit this is a no-op.
+                    await session.rollback()
+                    session.expunge_all()
+                await checkpoint.mark(profile_id, counts)
+                print(f"Profile {profile_id}: {format_counts(counts)}")
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(pending))))))
+
+    totals: dict[str, int] = {}
+    for counts in checkpoint.profiles.values():
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+    mode = "applied" if apply else "dry run"
+    print(f"{task_name} ({mode}): {len(checkpoint.profiles)} profiles, {format_counts(totals)}")
+    if failures:
+        print(f"{len(failures)} profiles failed; re-run with the same --checkpoint to retry only those.")
+    else:
+        checkpoint.clear()
+    return totals
+
+
+def add_runner_arguments(parser: argparse.ArgumentParser, apply: bool = True) -> None:
+    parser.add_argument("--profile-id", default=None, help="Learning profile id.")
+    parser.add_argument("--email", default=None, help="User email (uses active profile).")
+    if apply:
+        parser.add_argument("--apply", action="store_true", help="Apply changes to the database.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Profiles processed concurrently.")
+    parser.add_argument("--rate", type=float, default=0.0, help="Max profiles started per second (0: no limit).")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="JSON file with finished profiles; an interrupted run resumes from it.",
+    )
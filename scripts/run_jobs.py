@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 from email.message import EmailMessage
 from pathlib import Path
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 API_DIR = BASE_DIR / "api"
@@ -36,7 +36,11 @@ def load_env_file(path: Path) -> None:
 
 load_env_file(BASE_DIR / ".env")
 
+from app.api.custom_words import ingest_custom_words, parse_import  # noqa: E402
 from app.api.dashboard import get_dashboard  # noqa: E402
+from app.api.onboarding import ingest_known_words, parse_known_words  # noqa: E402
+from app.api.reading import refresh_reading_recommendations  # noqa: E402
+from app.api.social import sweep_challenges  # noqa: E402
 from app.api.stats import weak_words  # noqa: E402
 from app.core.config import (  # noqa: E402
     ADMIN_EMAILS,
@@ -155,6 +159,16 @@ async def process_generate_report(session, job: BackgroundJob) -> dict:
     return report
 
 
+async def process_refresh_reading(session, job: BackgroundJob) -> dict:
+    if not job.profile_id:
+        raise ValueError("job profile_id is required")
+    learning_profile = await session.get(LearningProfile, job.profile_id)
+    if not learning_profile:
+        raise ValueError("profile not found")
+    refreshed = await refresh_reading_recommendations(learning_profile, session)
+    return {"reading_refreshed": refreshed}
+
+
 async def process_send_review_notifications(session, job: BackgroundJob) -> dict:
     now = datetime.now(timezone.utc)
     settings_stmt = select(NotificationSettings)
@@ -429,12 +443,66 @@ async def process_send_report_notifications(session, job: BackgroundJob) -> dict
     return {"sent": sent, "errors": errors}
 
 
+async def save_job_result(job_id: int, result: dict) -> None:
+    # A separate session, so progress is visible while the job's own transaction stays open.
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .values(result=result, updated_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+
 async def process_import_words(session, job: BackgroundJob) -> dict:
     payload = job.payload or {}
     sqlite_dir = Path(payload.get("sqlite_dir") or "E:/Code/english_project/database")
     map_path = Path(payload.get("map_path") or "scripts/import_map.json")
-    await import_sqlite.run(sqlite_dir, map_path)
-    return {"imported": True, "sqlite_dir": str(sqlite_dir), "map_path": str(map_path)}
+
+    async def save_progress(state: dict) -> None:
+        await save_job_result(job.id, state)
+
+    # A retried job resumes from the checkpoint the failed attempt left in its result.
+    progress = import_sqlite.ImportProgress(dict(job.result or {}), save_progress)
+    state = await import_sqlite.run(
+        sqlite_dir,
+        map_path,
+        workers=int(payload.get("workers") or import_sqlite.DEFAULT_WORKERS),
+        progress=progress,
+    )
+    return {**state, "imported": True, "sqlite_dir": str(sqlite_dir), "map_path": str(map_path)}
+
+
+async def load_job_profile(session, job: BackgroundJob) -> LearningProfile:
+    if not job.profile_id or not job.user_id:
+        raise ValueError("job user_id and profile_id are required")
+    learning_profile = await session.get(LearningProfile, job.profile_id)
+    if not learning_profile:
+        raise ValueError("profile not found")
+    return learning_profile
+
+
+async def process_import_custom_words(session, job: BackgroundJob) -> dict:
+    learning_profile = await load_job_profile(session, job)
+
+    async def save_progress(state: dict) -> None:
+        await save_job_result(job.id, state)
+
+    # Upserts are idempotent, so a retried job simply runs the whole text again.
+    lines, report = parse_import((job.payload or {}).get("text") or "")
+    await ingest_custom_words(session, learning_profile, job.user_id, lines, report, save_progress)
+    return report.as_dict()
+
+
+async def process_import_known_words(session, job: BackgroundJob) -> dict:
+    learning_profile = await load_job_profile(session, job)
+
+    async def save_progress(state: dict) -> None:
+        await save_job_result(job.id, state)
+
+    lines, report = parse_known_words((job.payload or {}).get("text") or "")
+    await ingest_known_words(session, learning_profile, job.user_id, lines, report, save_progress)
+    return report.as_dict()
 
 
 async def handle_job(session, job: BackgroundJob) -> None:
@@ -442,14 +510,22 @@ async def handle_job(session, job: BackgroundJob) -> None:
     try:
         if job.job_type == "refresh_stats":
             result = await process_refresh_stats(session, job)
+        elif job.job_type == "refresh_reading":
+            result = await process_refresh_reading(session, job)
         elif job.job_type == "send_review_notifications":
             result = await process_send_review_notifications(session, job)
         elif job.job_type == "import_words":
             result = await process_import_words(session, job)
+        elif job.job_type == "import_custom_words":
+            result = await process_import_custom_words(session, job)
+        elif job.job_type == "import_known_words":
+            result = await process_import_known_words(session, job)
         elif job.job_type == "generate_report":
             result = await process_generate_report(session, job)
         elif job.job_type == "send_report_notifications":
             result = await process_send_report_notifications(session, job)
+        elif job.job_type == "sweep_challenges":
+            result = {"challenges_settled": await sweep_challenges(session)}
         else:
             raise ValueError(f"unknown job type: {job.job_type}")
         await mark_done(session, job, result=result)
@@ -465,6 +541,7 @@ async def run_once(limit: int) -> int:
             await handle_job(session, job)
         processed += len(jobs)
         processed += await process_pending_notifications(session, limit)
+        processed += await sweep_challenges(session)
         return processed
 
 
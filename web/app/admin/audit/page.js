@@ -123,7 +123,7 @@ export default function AdminAuditPage() {
     }
     setCookie("is_admin", me.is_admin ? "1" : "0");
     const data = await getJson("/admin/audit?limit=120", token);
-    setLogs(Array.isArray(data) ? data : []);
+    setLogs(Array.isArray(data?.items) ? data.items : []);
   };
 
   useEffect(() => {
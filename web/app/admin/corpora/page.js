@@ -220,6 +220,8 @@ export default function AdminCorporaPage() {
   const [selectedCorpus, setSelectedCorpus] = useState("");
   const [words, setWords] = useState([]);
   const [total, setTotal] = useState(0);
+  const [totalExact, setTotalExact] = useState(true);
+  const [cursors, setCursors] = useState([null]);
   const [loading, setLoading] = useState(true);
   const [loadingWords, setLoadingWords] = useState(false);
   const [error, setError] = useState("");
@@ -265,14 +267,13 @@ export default function AdminCorporaPage() {
     if (!corpusId) {
       setWords([]);
       setTotal(0);
+      setCursors([null]);
       return;
     }
     setLoadingWords(true);
     try {
-      const offset = nextPage * limit;
       const params = new URLSearchParams({
         limit: String(limit),
-        offset: String(offset),
         sort,
         order,
         source_lang: sourceLang
@@ -283,9 +284,16 @@ export default function AdminCorporaPage() {
       if (query) {
         params.set("query", query);
       }
+      if (nextPage > 0 && cursors[nextPage]) {
+        params.set("cursor", cursors[nextPage]);
+      }
       const data = await getJson(`/admin/content/corpora/${corpusId}/words?${params}`, token);
       setWords(Array.isArray(data?.items) ? data.items : []);
       setTotal(Number.isFinite(data?.total) ? data.total : 0);
+      setTotalExact(data?.total_exact !== false);
+      const nextCursors = cursors.slice(0, nextPage + 1);
+      nextCursors[nextPage + 1] = data?.next_cursor || null;
+      setCursors(nextCursors);
     } finally {
       setLoadingWords(false);
     }
@@ -339,7 +347,8 @@ export default function AdminCorporaPage() {
     [corpora, sourceLang, targetLang]
   );
 
-  const totalPages = Math.max(Math.ceil(total / limit), 1);
+  const hasNextPage = Boolean(cursors[page + 1]);
+  const totalLabel = totalExact ? String(total) : `~${total}`;
 
   const handleSearch = () => {
     setPage(0);
@@ -913,7 +922,7 @@ export default function AdminCorporaPage() {
           {total > 0 ? (
             <div className="admin-pagination">
               <span>
-                {t.paging.showing} {words.length} / {total}
+                {t.paging.showing} {words.length} / {totalLabel}
               </span>
               <div className="admin-pagination-actions">
                 <button
@@ -927,8 +936,8 @@ export default function AdminCorporaPage() {
                 <button
                   type="button"
                   className="button-secondary"
-                  onClick={() => setPage((prev) => Math.min(prev + 1, totalPages - 1))}
-                  disabled={page >= totalPages - 1}
+                  onClick={() => setPage((prev) => prev + 1)}
+                  disabled={!hasNextPage}
                 >
                   {t.paging.next}
                 </button>
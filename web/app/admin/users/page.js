@@ -147,8 +147,8 @@ export default function AdminUsersPage() {
     }
     setCookie("is_admin", me.is_admin ? "1" : "0");
     const encoded = encodeURIComponent(searchValue || "");
-    const data = await getJson(`/admin/users?limit=50&offset=0&query=${encoded}`, token);
-    setUsers(Array.isArray(data) ? data : []);
+    const data = await getJson(`/admin/users?limit=50&query=${encoded}`, token);
+    setUsers(Array.isArray(data?.items) ? data.items : []);
   };
 
   useEffect(() => {
@@ -170,13 +170,15 @@ export default function AdminWordsPage() {
   const [error, setError] = useState("");
   const [items, setItems] = useState([]);
   const [total, setTotal] = useState(0);
+  const [totalExact, setTotalExact] = useState(true);
+  const [cursors, setCursors] = useState([null]);
   const [query, setQuery] = useState("");
   const [langFilter, setLangFilter] = useState("");
   const [orphanOnly, setOrphanOnly] = useState(false);
   const [page, setPage] = useState(0);
   const [pageSize, setPageSize] = useState(50);
 
-  const loadWords = async (nextPage = page, nextSize = pageSize) => {
+  const loadWords = async (nextPage = page, nextSize = pageSize, pageCursors = cursors) => {
     const token = getCookie("token");
     if (!token) {
       window.location.href = "/auth";
@@ -196,10 +198,16 @@ export default function AdminWordsPage() {
         params.set("orphan_only", "true");
       }
       params.set("limit", String(nextSize));
-      params.set("offset", String(nextPage * nextSize));
+      if (pageCursors[nextPage]) {
+        params.set("cursor", pageCursors[nextPage]);
+      }
       const data = await getJson(`/admin/content/words?${params.toString()}`, token);
       setItems(Array.isArray(data?.items) ? data.items : []);
       setTotal(Number.isFinite(data?.total) ? data.total : 0);
+      setTotalExact(data?.total_exact !== false);
+      const nextCursors = pageCursors.slice(0, nextPage + 1);
+      nextCursors[nextPage + 1] = data?.next_cursor || null;
+      setCursors(nextCursors);
     } catch (err) {
       const message = err.message || t.error;
       if (message.includes("Forbidden")) {
@@ -230,11 +238,15 @@ export default function AdminWordsPage() {
   );
 
   const totalPages = pageSize > 0 ? Math.max(Math.ceil(total / pageSize), 1) : 1;
-  const currentPage = Math.min(page + 1, totalPages);
+  const currentPage = page + 1;
+  const hasNextPage = Boolean(cursors[page + 1]);
+  const totalLabel = totalExact ? String(total) : `~${total}`;
+  const pagesLabel = totalExact ? String(totalPages) : `~${totalPages}`;
 
   const applyFilters = () => {
+    setCursors([null]);
     setPage(0);
-    loadWords(0, pageSize);
+    loadWords(0, pageSize, [null]);
   };
 
   const handleSave = async (itemId, value) => {
@@ -321,7 +333,11 @@ export default function AdminWordsPage() {
             <label>{t.perPage}</label>
             <select
               value={pageSize}
-              onChange={(event) => setPageSize(Number(event.target.value))}
+              onChange={(event) => {
+                setCursors([null]);
+                setPage(0);
+                setPageSize(Number(event.target.value));
+              }}
             >
               <option value={50}>50</option>
               <option value={100}>100</option>
@@ -336,7 +352,7 @@ export default function AdminWordsPage() {
               {t.refresh}
             </button>
             <div className="muted">
-              {t.total}: {total} · {t.shown}: {items.length}
+              {t.total}: {totalLabel} · {t.shown}: {items.length}
             </div>
           </div>
         </div>
@@ -353,13 +369,13 @@ export default function AdminWordsPage() {
             ◀
           </button>
           <span className="muted">
-            {t.page} {currentPage} / {totalPages}
+            {t.page} {currentPage} / {pagesLabel}
           </span>
           <button
             type="button"
             className="button-secondary"
-            onClick={() => setPage(Math.min(page + 1, totalPages - 1))}
-            disabled={page + 1 >= totalPages}
+            onClick={() => setPage(page + 1)}
+            disabled={!hasNextPage}
           >
             ▶
           </button>
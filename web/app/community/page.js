@@ -871,7 +871,7 @@ export default function CommunityPage() {
     setSearchError("");
     try {
       const data = await getJson(`/social/search?query=${encodeURIComponent(query)}`, token);
-      setSearchResults(Array.isArray(data) ? data : []);
+      setSearchResults(Array.isArray(data?.items) ? data.items : []);
     } catch (err) {
       setSearchError(err.message || t.error);
     } finally {
@@ -7,6 +7,7 @@ import { useUiLang } from "../ui-lang-context";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE || "http://localhost:8000";
 const MAX_CUSTOM_WORDS_PAGE = 200;
+const IMPORT_POLL_MS = 2000;
 
 const TEXT = {
   ru: {
@@ -48,6 +49,11 @@ const TEXT = {
     importAction: "Импортировать",
     importing: "Импорт...",
     importResult: "Результат импорта",
+    importQueued: "Импорт поставлен в очередь и выполняется в фоне...",
+    importProgress: "Обработано слов: {done} из {total}",
+    importFailed: "Импорт не удался",
+    importErrors: "Ошибки в строках",
+    importErrorLine: "Строка {line}: {error}",
     stats: {
       totalLines: "Всего строк",
       parsedLines: "Распознано",
@@ -98,6 +104,11 @@ const TEXT = {
     importAction: "Import",
     importing: "Importing...",
     importResult: "Import result",
+    importQueued: "Import queued, running in the background...",
+    importProgress: "Processed words: {done} of {total}",
+    importFailed: "Import failed",
+    importErrors: "Line errors",
+    importErrorLine: "Line {line}: {error}",
     stats: {
       totalLines: "Total lines",
       parsedLines: "Parsed",
@@ -227,6 +238,7 @@ export default function CustomWordsPage() {
   const [importResult, setImportResult] = useState(null);
   const [importError, setImportError] = useState("");
   const [importing, setImporting] = useState(false);
+  const [importJob, setImportJob] = useState(null);
   const { lang, setLang } = useUiLang();
   const uiLang = lang || "ru";
   const t = TEXT[uiLang] || TEXT.ru;
@@ -287,6 +299,33 @@ export default function CustomWordsPage() {
     setImportError("");
   }, [importText]);
 
+  useEffect(() => {
+    // Large imports run as a background job; poll it until it is done or has failed for good.
+    if (!importJob || importJob.status === "done" || importJob.status === "failed") {
+      return;
+    }
+    const token = getCookie("token");
+    const timerId = setTimeout(async () => {
+      try {
+        const job = await getJson(`/tech/jobs/${importJob.id}`, token);
+        if (job.result) {
+          setImportResult((prev) => ({ ...prev, ...job.result }));
+        }
+        if (job.status === "failed") {
+          setImportError(job.last_error || t.importFailed);
+        }
+        if (job.status === "done") {
+          await loadData();
+        }
+        setImportJob(job);
+      } catch (err) {
+        setImportError(err.message || t.importFailed);
+        setImportJob(null);
+      }
+    }, IMPORT_POLL_MS);
+    return () => clearTimeout(timerId);
+  }, [importJob]);
+
   const addWord = async (event) => {
     event.preventDefault();
     setSaveError("");
@@ -402,6 +441,7 @@ export default function CustomWordsPage() {
   const importList = async () => {
     setImportError("");
     setImportResult(null);
+    setImportJob(null);
     const token = getCookie("token");
     if (!token) {
       window.location.href = "/auth";
@@ -414,7 +454,11 @@ export default function CustomWordsPage() {
     try {
       const data = await postJson("/custom-words/import", { text: importText }, token);
       setImportResult(data);
-      await loadData();
+      if (data.status === "queued" && data.job_id) {
+        setImportJob({ id: data.job_id, status: "pending" });
+      } else {
+        await loadData();
+      }
     } catch (err) {
       setImportError(err.message || t.saveError);
     } finally {
@@ -502,6 +546,15 @@ export default function CustomWordsPage() {
       ? t.listShown.replace("{shown}", String(items.length)).replace("{total}", String(totalCount))
       : "";
 
+  const importRunning = Boolean(importJob && importJob.status !== "done" && importJob.status !== "failed");
+  const importProgress = importRunning
+    ? importResult?.total_words
+      ? t.importProgress
+          .replace("{done}", String(importResult.processed_words || 0))
+          .replace("{total}", String(importResult.total_words))
+      : t.importQueued
+    : "";
+  const importErrors = Array.isArray(importResult?.errors) ? importResult.errors : [];
   const importStats = importResult
     ? [
         { label: t.stats.totalLines, value: importResult.total_lines },
@@ -591,15 +644,16 @@ export default function CustomWordsPage() {
                 <button
                   type="button"
                   onClick={importList}
-                  disabled={importing || !importText.trim()}
+                  disabled={importing || importRunning || !importText.trim()}
                 >
-                  {importing ? t.importing : t.importAction}
+                  {importing || importRunning ? t.importing : t.importAction}
                 </button>
                 {importError ? <span className="error">{importError}</span> : null}
               </div>
               {importStats.length ? (
                 <>
                   <div className="panel-title">{t.importResult}</div>
+                  {importProgress ? <p className="muted">{importProgress}</p> : null}
                   <div className="import-grid">
                     {importStats.map((item) => (
                       <div key={item.label} className="import-card">
@@ -608,6 +662,20 @@ export default function CustomWordsPage() {
                       </div>
                     ))}
                   </div>
+                  {importErrors.length ? (
+                    <div className="import-errors">
+                      <div className="import-sample-title">{t.importErrors}</div>
+                      <ul>
+                        {importErrors.map((item, index) => (
+                          <li key={`${item.line}-${index}`}>
+                            {t.importErrorLine
+                              .replace("{line}", String(item.line))
+                              .replace("{error}", item.error)}
+                          </li>
+                        ))}
+                      </ul>
+                    </div>
+                  ) : null}
                 </>
               ) : null}
             </div>
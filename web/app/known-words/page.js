@@ -6,6 +6,7 @@ import { getCookie } from "../lib/client-cookies";
 import { useUiLang } from "../ui-lang-context";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE || "http://localhost:8000";
+const IMPORT_POLL_MS = 2000;
 
 const TEXT = {
   ru: {
@@ -26,6 +27,11 @@ const TEXT = {
       import: "Импортировать",
       importing: "Импорт...",
       result: "Результат импорта",
+      queued: "Импорт поставлен в очередь и выполняется в фоне...",
+      progress: "Обработано слов: {done} из {total}",
+      failed: "Импорт не удался",
+      errors: "Ошибки в строках",
+      errorLine: "Строка {line}: {error}",
       stats: {
         totalLines: "Всего строк",
         parsedLines: "Распознано",
@@ -55,6 +61,11 @@ const TEXT = {
       import: "Import",
       importing: "Importing...",
       result: "Import result",
+      queued: "Import queued, running in the background...",
+      progress: "Processed words: {done} of {total}",
+      failed: "Import failed",
+      errors: "Line errors",
+      errorLine: "Line {line}: {error}",
       stats: {
         totalLines: "Total lines",
         parsedLines: "Parsed",
@@ -116,6 +127,7 @@ export default function KnownWordsPage() {
   const [knownResult, setKnownResult] = useState(null);
   const [knownError, setKnownError] = useState("");
   const [knownImporting, setKnownImporting] = useState(false);
+  const [knownJob, setKnownJob] = useState(null);
   const { lang } = useUiLang();
   const uiLang = lang || "ru";
 
@@ -148,9 +160,34 @@ export default function KnownWordsPage() {
     setKnownError("");
   }, [knownText]);
 
+  useEffect(() => {
+    // Large imports run as a background job; poll it until it is done or has failed for good.
+    if (!knownJob || knownJob.status === "done" || knownJob.status === "failed") {
+      return;
+    }
+    const token = getCookie("token");
+    const timerId = setTimeout(async () => {
+      try {
+        const job = await getJson(`/tech/jobs/${knownJob.id}`, token);
+        if (job.result) {
+          setKnownResult((prev) => ({ ...prev, ...job.result }));
+        }
+        if (job.status === "failed") {
+          setKnownError(job.last_error || t.known.failed);
+        }
+        setKnownJob(job);
+      } catch (err) {
+        setKnownError(err.message || t.known.failed);
+        setKnownJob(null);
+      }
+    }, IMPORT_POLL_MS);
+    return () => clearTimeout(timerId);
+  }, [knownJob]);
+
   const importKnownWords = async () => {
     setKnownError("");
     setKnownResult(null);
+    setKnownJob(null);
     if (!onboardingReady) {
       setKnownError(t.known.disabled);
       return;
@@ -167,6 +204,9 @@ export default function KnownWordsPage() {
     try {
       const data = await postJson("/onboarding/known-words", { text: knownText }, token);
       setKnownResult(data);
+      if (data.status === "queued" && data.job_id) {
+        setKnownJob({ id: data.job_id, status: "pending" });
+      }
     } catch (err) {
       setKnownError(err.message || t.saveError);
     } finally {
@@ -175,15 +215,25 @@ export default function KnownWordsPage() {
   };
 
   const onboardingReady = Boolean(profile?.onboarding_done);
+  const knownRunning = Boolean(knownJob && knownJob.status !== "done" && knownJob.status !== "failed");
+  const knownProgress = knownRunning
+    ? knownResult?.total_words
+      ? t.known.progress
+          .replace("{done}", String(knownResult.processed_words || 0))
+          .replace("{total}", String(knownResult.total_words))
+      : t.known.queued
+    : "";
+  const knownErrors = Array.isArray(knownResult?.errors) ? knownResult.errors : [];
+  // Job results carry only the shared import counters, so found/skipped are derived the way the API does.
   const knownStats = knownResult
     ? [
         { label: t.known.stats.totalLines, value: knownResult.total_lines },
         { label: t.known.stats.parsedLines, value: knownResult.parsed_lines },
         { label: t.known.stats.invalidLines, value: knownResult.invalid_lines },
-        { label: t.known.stats.wordsFound, value: knownResult.words_found },
+        { label: t.known.stats.wordsFound, value: (knownResult.inserted || 0) + (knownResult.skipped || 0) },
         { label: t.known.stats.wordsMissing, value: knownResult.words_missing },
         { label: t.known.stats.inserted, value: knownResult.inserted },
-        { label: t.known.stats.skipped, value: knownResult.skipped_existing }
+        { label: t.known.stats.skipped, value: knownResult.skipped }
       ]
     : [];
 
@@ -219,9 +269,9 @@ export default function KnownWordsPage() {
               <button
                 type="button"
                 onClick={importKnownWords}
-                disabled={knownImporting || !knownText.trim() || !onboardingReady}
+                disabled={knownImporting || knownRunning || !knownText.trim() || !onboardingReady}
               >
-                {knownImporting ? t.known.importing : t.known.import}
+                {knownImporting || knownRunning ? t.known.importing : t.known.import}
               </button>
               {knownError ? <span className="error">{knownError}</span> : null}
             </div>
@@ -229,6 +279,7 @@ export default function KnownWordsPage() {
 
           <div className="panel">
             <div className="panel-title">{t.known.result}</div>
+            {knownProgress ? <p className="muted">{knownProgress}</p> : null}
             {knownStats.length ? (
               <div className="import-grid">
                 {knownStats.map((item) => (
@@ -241,6 +292,20 @@ export default function KnownWordsPage() {
             ) : (
               <p className="muted">{t.known.format}</p>
             )}
+            {knownErrors.length ? (
+              <div className="import-errors">
+                <div className="import-sample-title">{t.known.errors}</div>
+                <ul>
+                  {knownErrors.map((item, index) => (
+                    <li key={`${item.line}-${index}`}>
+                      {t.known.errorLine
+                        .replace("{line}", String(item.line))
+                        .replace("{error}", item.error)}
+                    </li>
+                  ))}
+                </ul>
+              </div>
+            ) : null}
           </div>
         </div>
       ) : null}